@@ -17,18 +17,28 @@ cd "$(dirname "${BASH_SOURCE[0]}")"
 source ./common/get-hosts.sh
 source ./common/get-dirs.sh
 
+# maximum runs per experiment; stable experiments stop
+# earlier (see CI_TARGET in ./common/get-configs.sh)
+RUNS=10
+
 # start (or restart) Hadoop
 ./hadoop/restart-hadoop.sh
 hadoop dfsadmin -safemode wait > /dev/null
 
+# refuse to benchmark on degraded worker machines (e.g., noisy EC2 neighbours)
+if ! ./common/health-check.sh; then
+    echo "Some worker machines are degraded (see above), not benchmarking."
+    exit -1
+fi
+
 echo "Running Giraph experiments..."
-./giraph/benchall.sh ${NUM_MACHINES} 5
+./giraph/benchall.sh ${NUM_MACHINES} ${RUNS}
 
 echo "Running GPS experiments..."
-./gps/benchall.sh ${NUM_MACHINES} 5
+./gps/benchall.sh ${NUM_MACHINES} ${RUNS}
 
 echo "Running GraphLab experiments..."
-./graphlab/benchall.sh ${NUM_MACHINES} 5
+./graphlab/benchall.sh ${NUM_MACHINES} ${RUNS}
 
 echo "Running Mizan experiments..."
-./mizan/benchall.sh ${NUM_MACHINES} 5
\ No newline at end of file
+./mizan/benchall.sh ${NUM_MACHINES} ${RUNS}
\ No newline at end of file
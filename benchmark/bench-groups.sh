@@ -0,0 +1,231 @@
+#!/bin/bash
+
+# Runs benchmarks concurrently, on disjoint groups of worker machines.
+#
+# Each job is a system's benchall.sh for some number of machines, e.g.
+# "gps:16". Jobs are started in the given order, each on the first
+# free group of consecutive worker machines, waiting for running jobs
+# to finish if there is not enough room. On a 128 machine cluster,
+#
+#   ./bench-groups.sh 10 gps:64 graphlab:32 graphlab:16 gps:16 gps:32 graphlab:64
+#
+# runs gps:64, graphlab:32, graphlab:16 and gps:16 at the same time (on
+# machines 1-64, 65-96, 97-112 and 113-128), gps:32 once 32 consecutive
+# machines free up, and then graphlab:64.
+#
+# A job runs from its group's folder, ./groups/h<first>-<last>/, which
+# links to all the usual scripts but has its own get-hosts.sh (setting
+# HOST_OFFSET and GROUP_SUFFIX), machine files, and logs. GROUP_SUFFIX
+# keeps the group's HDFS config/output folders and GPS master port apart
+# from other groups'. Once a job is done, its logs are moved to the
+# system's usual ./<system>/logs/ folder.
+#
+# Worker machines that fail ./common/health-check.sh are left out, so
+# jobs are run on the remaining groups of consecutive healthy machines.
+# Jobs that no longer fit anywhere are skipped.
+#
+# NOTE: Only GPS and GraphLab can be run this way. Giraph (and Mizan's
+#       prepartitioning) run as Hadoop jobs, which get spread across all
+#       of Hadoop's workers, and Mizan's output folder is fixed. All jobs
+#       share the master, which runs the GPS masters and HDFS namenode.
+#
+# Like bench-all.sh, run this in a "screen".
+
+if [ $# -lt 2 ]; then
+    echo "usage: $0 runs job [job ...]"
+    echo ""
+    echo "runs: maximum number of runs per experiment (see bench-all.sh)"
+    echo "job: system:machines, where system is gps or graphlab (e.g., gps:16)"
+    exit -1
+fi
+
+cd "$(dirname "${BASH_SOURCE[0]}")"
+source ./common/get-hosts.sh
+source ./common/get-dirs.sh
+
+RUNS=$1
+JOBS=("${@:2}")
+
+# how often to check if running jobs are done (in seconds)
+POLL_TIME=30
+
+for job in "${JOBS[@]}"; do
+    system=${job%%:*}
+    machines=${job#*:}
+
+    case ${system} in
+        gps|graphlab) ;;
+        *) echo "Invalid system in ${job} (only gps and graphlab can run concurrently)"; exit -1;;
+    esac
+
+    if ! [[ ${machines} =~ ^[0-9]+$ ]] || [ ${machines} -lt 1 ] || [ ${machines} -gt ${NUM_MACHINES} ]; then
+        echo "Invalid machines in ${job} (must be 1 to ${NUM_MACHINES})"
+        exit -1
+    fi
+done
+
+
+###############
+# Host groups
+###############
+# free[i] is 1 if worker machine i is not used by any job
+free=()
+for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
+    free[$i]=1
+done
+
+# running jobs' groups, by PID
+declare -A job_offset
+declare -A job_machines
+
+# Prints the offset of the first free group of $1 consecutive
+# machines (i.e., machines offset+1 to offset+$1), if there is one.
+find_group() {
+    local count=0
+    for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
+        if [[ ${free[$i]} -eq 1 ]]; then
+            count=$((count + 1))
+        else
+            count=0
+        fi
+
+        if [[ ${count} -eq $1 ]]; then
+            echo $((i - $1))
+            return
+        fi
+    done
+}
+
+# Marks machines $1+1 to $1+$2 as free (1) or used (0).
+mark_group() {
+    for ((i = $1 + 1; i <= $1 + $2; i++)); do
+        free[$i]=$3
+    done
+}
+
+# Waits until at least one running job is done and frees its machines.
+reap_jobs() {
+    while true; do
+        local reaped=0
+        for pid in "${!job_offset[@]}"; do
+            if ! kill -0 ${pid} 2> /dev/null; then
+                mark_group ${job_offset[$pid]} ${job_machines[$pid]} 1
+                unset job_offset[$pid] job_machines[$pid]
+                reaped=1
+            fi
+        done
+
+        [[ ${reaped} -eq 1 ]] && return
+        sleep ${POLL_TIME}
+    done
+}
+
+# Creates the folder of a host group, on the master and its workers.
+#
+# The folder mirrors this one, with links to everything except the
+# group's own get-hosts.sh and system folder (whose machine files and
+# logs are the group's own). The links are relative, so the folder can
+# be copied to the workers as-is.
+make_group() {
+    local system=$1
+    local machines=$2
+    local offset=$3
+    local group=h$((offset + 1))-$((offset + machines))
+    local dir=./groups/${group}
+
+    rm -rf "$dir"
+    mkdir -p "$dir"/common "$dir"/${system}/logs
+
+    for f in *; do
+        case ${f} in
+            groups|common|${system}) ;;
+            *) ln -s ../../${f} "$dir"/;;
+        esac
+    done
+
+    for f in common/*; do
+        [[ $(basename ${f}) != get-hosts.sh ]] && ln -s ../../../${f} "$dir"/common/
+    done
+
+    for f in ${system}/*; do
+        case $(basename ${f}) in
+            logs|slaves|machine.cfg|machines) ;;
+            *) ln -s ../../../${f} "$dir"/${system}/;;
+        esac
+    done
+
+    # NOTE: must escape $ for things that should be evaluated when sourced
+    cat > "$dir"/common/get-hosts.sh <<EOF
+#!/bin/bash
+
+# Host group ${group} (see ../../../bench-groups.sh).
+# Worker machine i is \${CLUSTER_NAME}\$((HOST_OFFSET + i)).
+source "\$(dirname "\${BASH_SOURCE[0]}")"/../../../common/get-hosts.sh
+NUM_MACHINES=${machines}
+HOST_OFFSET=${offset}
+GROUP_SUFFIX=-${group}
+EOF
+
+    for ((i = 1; i <= ${machines}; i++)); do
+        rsync -a "$dir" ${CLUSTER_NAME}$((offset + i)):"$PWD"/groups/ &
+    done
+    wait
+}
+
+# Runs one job in its host group.
+run_job() {
+    local system=$1
+    local machines=$2
+    local offset=$3
+    local dir=./groups/h$((offset + 1))-$((offset + machines))
+
+    make_group ${system} ${machines} ${offset}
+
+    "$dir"/${system}/init.sh
+    "$dir"/${system}/benchall.sh ${machines} ${RUNS}
+
+    mv "$dir"/${system}/logs/* ./${system}/logs/
+}
+
+
+###############
+# Run jobs
+###############
+# start (or restart) Hadoop
+./hadoop/restart-hadoop.sh
+hadoop dfsadmin -safemode wait > /dev/null
+
+mkdir -p ./groups ./gps/logs ./graphlab/logs
+
+# leave out degraded worker machines (e.g., noisy EC2 neighbours)
+./common/health-check.sh --degraded ./groups/degraded.txt
+for name in $(cat ./groups/degraded.txt); do
+    free[${name#${CLUSTER_NAME}}]=0
+done
+
+for job in "${JOBS[@]}"; do
+    system=${job%%:*}
+    machines=${job#*:}
+
+    offset=$(find_group ${machines})
+    while [[ -z "$offset" && ${#job_offset[@]} -gt 0 ]]; do
+        reap_jobs
+        offset=$(find_group ${machines})
+    done
+
+    if [[ -z "$offset" ]]; then
+        echo "Skipping ${job}, as there are not enough consecutive healthy machines."
+        continue
+    fi
+
+    output=./groups/h$((offset + 1))-$((offset + machines))_${system}.txt
+    echo "Running ${job} on machines $((offset + 1))-$((offset + machines)) (output in ${output})..."
+
+    run_job ${system} ${machines} ${offset} >> ${output} 2>&1 &
+    job_offset[$!]=${offset}
+    job_machines[$!]=${machines}
+    mark_group ${offset} ${machines} 0
+done
+
+wait
+echo "All jobs done."
@@ -14,26 +14,33 @@ dir=$PWD
 
 for ((i = 0; i <= ${NUM_MACHINES}; i++)); do
     nbtfile=${logname}_${i}_nbt.txt   # network bytes total
+    pidfile=.${logname}_${i}.pids     # monitors started by bench-init.sh
 
     # special case for master, to make it work for local testing too
     if [ $i -eq  0 ]; then
         name=${HOSTNAME}
     else
-        name=${CLUSTER_NAME}${i}
+        name=${CLUSTER_NAME}$((HOST_OFFSET + i))
     fi
 
     # 1. Change to the same directory as master.
     # 2. Append final network usage.
-    # 3. Kill sar and free to stop tracking.
+    # 3. Kill this run's sar and free to stop tracking.
     #
     # NOTE: - could use `jobs -p` for kill, but difficult b/c we're ssh-ing
     #       - must escape $ for things that should be evaluated remotely
-    ssh ${name} "cd \"$dir\"; cat /proc/net/dev >> ./logs/${nbtfile} & kill \$(pgrep sar) & kill \$(pgrep free)" &
+    ssh ${name} "cd \"$dir\"; cat /proc/net/dev >> ./logs/${nbtfile} & kill \$(cat ./logs/${pidfile}); rm -f ./logs/${pidfile}" &
 done
 wait
 
 # get worker machines' files in parallel, with compression to speed things up
+#
+# Workers first summarize their logs into one compact file (see logsummary.py),
+# which is all that's copied. If that fails, the raw logs are copied instead.
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
-    rsync -az ${CLUSTER_NAME}${i}:"$dir"/logs/${logname}_${i}_*.txt ./logs/ &
+    name=${CLUSTER_NAME}$((HOST_OFFSET + i))
+    (ssh ${name} "cd \"$dir\"; ../common/logsummary.py ./logs/${logname}_${i}" &&
+        rsync -az ${name}:"$dir"/logs/${logname}_${i}_sum.bin ./logs/ ||
+        rsync -az ${name}:"$dir"/logs/${logname}_${i}_*.txt ./logs/) &
 done
-wait
\ No newline at end of file
+wait
@@ -1,36 +1,64 @@
 #!/bin/bash -e
 
 # Initiate data logging/collection at the master and all worker machines.
+#
+# Each machine also records when its monitoring started and its clock's
+# offset from the master's, so the parsers can line up all machines'
+# time series (see ../parsers and logsummary.py's read_clock()).
 
 if [ $# -ne 1 ]; then
     echo "usage: $0 log-name-prefix"
     exit -1
 fi
 
-source "$(dirname "${BASH_SOURCE[0]}")"/get-hosts.sh
+commondir="$(dirname "${BASH_SOURCE[0]}")"
+source "$commondir"/get-hosts.sh
 
 logname=$1
 dir=$PWD
 
+# the master serves its time until all machines have measured their
+# clock offsets (host groups each use their own port, see ../bench-groups.sh)
+clockport=$((47000 - HOST_OFFSET))
+exec 3< <("$commondir"/healthcheck.py serve --port ${clockport} 2> /dev/null)
+read -t 10 -u 3 ready || true
+
 for ((i = 0; i <= ${NUM_MACHINES}; i++)); do
     cpufile=${logname}_${i}_cpu.txt   # cpu usage
     netfile=${logname}_${i}_net.txt   # network usage
     memfile=${logname}_${i}_mem.txt   # memory usage
     nbtfile=${logname}_${i}_nbt.txt   # network bytes total
+    clkfile=${logname}_${i}_clk.txt   # monitoring start time and clock offset
+    pidfile=.${logname}_${i}.pids     # monitors to kill (see bench-finish.sh)
 
     # special case for master, to make it work for local testing too
     if [ $i -eq  0 ]; then
         name=${HOSTNAME}
     else
-        name=${CLUSTER_NAME}${i}
+        name=${CLUSTER_NAME}$((HOST_OFFSET + i))
     fi
 
     # 1. Change to the same directory as master.
     # 2. Start sysstat for cpu and network usage, and free for memory usage (1s intervals).
     # 3. Print initial network bytes.
+    # 4. Record when monitoring started (2.) and the clock offset from the master.
+    #
+    # The PIDs of sar and free are saved, so that bench-finish.sh only stops
+    # this run's monitors (other runs may share the machine, see ../bench-groups.sh).
     #
     # NOTE: - & is like variant of ;, so don't need both
     #       - grep needs stdbuf correction, otherwise nothing shows up
-    ssh ${name} "cd \"$dir\"; sar 1 > ./logs/${cpufile} & free -s 1 | stdbuf -o0 grep + > ./logs/${memfile} & sar -n DEV 1 | stdbuf -o0 grep 'lo\|eth0' > ./logs/${netfile} & cat /proc/net/dev > ./logs/${nbtfile}" &
+    #       - must escape $ for things that should be evaluated remotely
+    ssh ${name} "cd \"$dir\"; echo start \$(date +%s.%N) > ./logs/${clkfile}; sar 1 > ./logs/${cpufile} & echo \$! > ./logs/${pidfile}; { free -s 1 & echo \$! >> ./logs/${pidfile}; wait; } | stdbuf -o0 grep + > ./logs/${memfile} & { sar -n DEV 1 & echo \$! >> ./logs/${pidfile}; wait; } | stdbuf -o0 grep 'lo\|eth0' > ./logs/${netfile} & cat /proc/net/dev > ./logs/${nbtfile}; ../common/healthcheck.py clock ${HOSTNAME} --port ${clockport} >> ./logs/${clkfile}" &
 done
-wait
\ No newline at end of file
+
+# (a plain wait would also wait for the time server, and this one returns
+# the last job's status, which must not abort the run: monitors are already
+# running, and a missing clock offset is fine, see results/plots/parsers.py)
+wait $(jobs -p) || true
+
+"$commondir"/healthcheck.py quit localhost --port ${clockport}
+exec 3<&-
+
+# the run starts now, by the master's clock
+echo "run $(date +%s.%N)" >> ./logs/${logname}_0_clk.txt
\ No newline at end of file
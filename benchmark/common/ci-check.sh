@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Checks if the experiment that was just run needs more runs.
+# Exits with 0 if it does not, so benchall.sh scripts can use
+# "../common/ci-check.sh ... && break" inside their run loops.
+#
+# See ../parsers/ci-checker.py and CI_TARGET in get-configs.sh.
+#
+# NOTE: must be run from the system's folder (i.e., where ./logs/ is).
+
+if [ $# -ne 2 ]; then
+    echo "usage: $0 system campaign-start"
+    echo ""
+    echo "system: 0 for Giraph, 1 for GPS, 2 for Mizan, 3 for GraphLab"
+    echo "campaign-start: only count runs on or after this time (YYYYmmdd-HHMMSS)"
+    exit -1
+fi
+
+commondir="$(dirname "${BASH_SOURCE[0]}")"
+source "$commondir"/get-configs.sh
+
+"$commondir"/../parsers/ci-checker.py $1 ./logs/ --since $2 \
+    --min-runs ${CI_MIN_RUNS} --target-ci ${CI_TARGET}
@@ -6,6 +6,9 @@
 # Alternatively, one can run bench-finish by passing in
 # the correct log name prefix to clean things up and get
 # the worker machines' (incomplete) logs.
+#
+# NOTE: this kills ALL sar and free processes, including those of
+# runs in other host groups (see ../bench-groups.sh) on the master.
 
 source "$(dirname "${BASH_SOURCE[0]}")"/get-hosts.sh
 
@@ -14,7 +17,7 @@ for ((i = 0; i <= ${NUM_MACHINES}; i++)); do
     if [ $i -eq  0 ]; then
         name=${HOSTNAME}
     else
-        name=${CLUSTER_NAME}${i}
+        name=${CLUSTER_NAME}$((HOST_OFFSET + i))
     fi
 
     ssh ${name} "kill \$(pgrep sar) & kill \$(pgrep free)" &
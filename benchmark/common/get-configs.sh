@@ -22,4 +22,11 @@ GIRAPH_THREADS=2
 
 # number of workers per machine (WPM)
 GPS_WPM=2
-MIZAN_WPM=2   # NOTE: re-run premizan if this is changed
\ No newline at end of file
+MIZAN_WPM=2   # NOTE: re-run premizan if this is changed
+
+# Runs of an experiment are repeated until the relative 95% CI of both
+# its setup and computation times are within CI_TARGET (0.05 = 5%),
+# or until the maximum number of runs given to benchall.sh is reached.
+# Set CI_TARGET=0 to always do the maximum number of runs.
+CI_TARGET=0.05
+CI_MIN_RUNS=3
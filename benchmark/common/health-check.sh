@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# Checks that worker machines are healthy enough to benchmark on:
+# free memory and disk space, leftover benchmark processes, CPU usage
+# and steal, clock offsets, and network throughput/latency between
+# pairs of workers. See healthcheck.py for the thresholds.
+#
+# Exits with 0 if all workers are healthy. Any arguments are passed to
+# healthcheck.py, e.g. "--degraded FILE" saves the degraded workers.
+#
+# To only check that workers can be ssh'd to, use ./ssh-check.sh.
+
+commondir="$(dirname "${BASH_SOURCE[0]}")"
+source "$commondir"/get-hosts.sh
+source "$commondir"/get-dirs.sh
+
+hosts=()
+for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
+    hosts+=(${CLUSTER_NAME}$((HOST_OFFSET + i)))
+done
+
+"$commondir"/healthcheck.py check "${hosts[@]}" --disk "$HADOOP_DATA_DIR" "$GPS_LOG_DIR" "$@"
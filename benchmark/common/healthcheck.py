@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+
+"""Checks that worker machines are healthy enough to benchmark on.
+
+Run by health-check.sh on the master, which checks all of the (current
+host group's) workers in parallel:
+
+  - free memory and disk space (e.g., of the HDFS data folder),
+  - leftover benchmark processes (GPS, Giraph tasks, MPI, sar/free),
+  - idle CPU usage and CPU steal, i.e. time taken by other EC2 tenants,
+  - clock offset from the master,
+  - network throughput and latency between pairs of workers, which are
+    a random ring, so every worker both sends to and receives from one
+    other worker. A worker is only blamed if both of its pairs are slow.
+
+This needs no extra packages, as it also runs on the workers: "stats"
+prints a worker's usage, "serve" runs the small socket benchmark server
+that "net" and the master's clock check connect to.
+
+bench-init.sh also uses "serve" on the master, and "clock" on every
+machine, to record each machine's clock offset from the master.
+"""
+
+import os, sys, time, json, random, socket, struct, subprocess
+import argparse
+from multiprocessing.pool import ThreadPool
+
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+###############
+# Parse args
+###############
+def check_positive(val):
+    try:
+        v = float(val)
+        if v <= 0:
+            raise argparse.ArgumentTypeError('Invalid value')
+        return v
+    except:
+        raise argparse.ArgumentTypeError('Invalid value')
+
+def check_fraction(frac):
+    try:
+        f = float(frac)
+        if (f < 0) or (f > 1):
+            raise argparse.ArgumentTypeError('Invalid fraction')
+        return f
+    except:
+        raise argparse.ArgumentTypeError('Invalid fraction')
+
+def check_count(count):
+    try:
+        c = int(count)
+        if c < 1:
+            raise argparse.ArgumentTypeError('Invalid count')
+        return c
+    except:
+        raise argparse.ArgumentTypeError('Invalid count')
+
+parser = argparse.ArgumentParser(description='Checks the memory, disk, leftover processes, CPU steal, clock '
+                                             'offset and network performance of worker machines.')
+parser.add_argument('action', type=str, choices=('check', 'stats', 'serve', 'net', 'clock', 'quit'),
+                    help='check: check the given workers (from the master); '
+                         'stats, serve, net: used by check on the workers; '
+                         'clock: print this machine\'s clock offset from a server\'s; '
+                         'quit: stop a server')
+parser.add_argument('hosts', type=str, nargs='*',
+                    help='workers to check (check), or the server to connect to (net, clock, quit)')
+parser.add_argument('--disk', type=str, nargs='+', default=['/'],
+                    help='folders whose free disk space to check, default=/')
+parser.add_argument('--port', type=int, default=47474,
+                    help='port of the socket benchmark server, default=47474')
+parser.add_argument('--mb', type=check_count, default=32,
+                    help='MB to send when measuring throughput (> 0), default=32')
+
+# thresholds for "check"
+parser.add_argument('--min-mem', type=check_fraction, dest='min_mem', default=0.8,
+                    help='minimum fraction of memory available (0 to 1), default=0.8')
+parser.add_argument('--min-disk', type=check_positive, dest='min_disk', default=2.0,
+                    help='minimum free disk space in GB (> 0), default=2.0')
+parser.add_argument('--max-busy', type=check_positive, dest='max_busy', default=20.0,
+                    help='maximum CPU usage in %% of an idle worker (> 0), default=20')
+parser.add_argument('--max-steal', type=check_positive, dest='max_steal', default=5.0,
+                    help='maximum CPU steal in %% (> 0), default=5')
+parser.add_argument('--max-skew', type=check_positive, dest='max_skew', default=0.5,
+                    help='maximum clock offset from the master in seconds (> 0), default=0.5')
+parser.add_argument('--min-net', type=check_fraction, dest='min_net', default=0.5,
+                    help='minimum throughput of a worker\'s pairs as a fraction of the median pair '
+                         '(and maximum latency as a multiple of 1/fraction) (0 to 1), default=0.5')
+parser.add_argument('--workers', type=check_count, default=32,
+                    help='number of workers to ssh to at the same time (> 0), default=32')
+parser.add_argument('--degraded', type=str, default=None,
+                    help='file to write the names of degraded workers to, one per line')
+
+args = parser.parse_args()
+
+
+###############
+# Constants
+###############
+MB = 1024*1024
+GB = 1024*MB
+
+# seconds to sample CPU usage over
+CPU_INTERVAL = 1.0
+
+# leftover processes of earlier runs, as (name, test of a process' arguments)
+LEFTOVERS = (('gps', lambda argv: any('gps_node_runner' in a for a in argv)),
+             ('giraph', lambda argv: 'org.apache.hadoop.mapred.Child' in argv),
+             ('mpi', lambda argv: os.path.basename(argv[0]) in ('mpiexec', 'mpirun', 'hydra_pmi_proxy')),
+             ('mizan', lambda argv: os.path.basename(argv[0]).startswith('Mizan')),
+             ('graphlab', lambda argv: '/toolkits/' in argv[0]),
+             ('monitor', lambda argv: os.path.basename(argv[0]) in ('sar', 'sadc', 'free')))
+
+# socket benchmark: 1-byte commands, each followed by its payload (if any)
+CMD_PING = b'P'     # replies with CMD_PING
+CMD_TIME = b'T'     # replies with the server's time (TIME)
+CMD_SEND = b'S'     # followed by LENGTH and that many bytes, replies with CMD_PING
+CMD_QUIT = b'Q'     # stops the server
+
+TIME = struct.Struct('<d')
+LENGTH = struct.Struct('<Q')
+
+PINGS = 20          # pings per latency measurement
+CLOCK_SAMPLES = 8   # time requests per clock offset measurement
+SOCKET_TIMEOUT = 10
+
+# seconds the server waits for connections before it stops by itself
+SERVE_IDLE = 60
+
+SSH_OPTS = ['-o', 'BatchMode=yes', '-o', 'ConnectTimeout=5', '-o', 'LogLevel=ERROR']
+DEVNULL = open(os.devnull)
+
+
+###############
+# Stats
+###############
+def mem_stats():
+    """Gets the total and available memory, in MB."""
+
+    info = {}
+    for line in open('/proc/meminfo'):
+        (key, val) = line.split(':', 1)
+        info[key] = int(val.split()[0])/1024.0
+
+    # older kernels don't have MemAvailable
+    if 'MemAvailable' in info:
+        return (info['MemTotal'], info['MemAvailable'])
+    return (info['MemTotal'], info['MemFree'] + info.get('Buffers', 0) + info.get('Cached', 0))
+
+
+def disk_free(path):
+    """Gets the free disk space of a folder (or its closest existing parent), in GB."""
+
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+
+    st = os.statvfs(path)
+    return st.f_bavail*st.f_frsize/float(GB)
+
+
+def cpu_stats(interval):
+    """Gets the CPU usage and steal over an interval, in %."""
+
+    def sample():
+        # cpu user nice system idle iowait irq softirq steal ...
+        vals = [int(v) for v in open('/proc/stat').readline().split()[1:]]
+        return (sum(vals[:8]), vals[3] + vals[4], vals[7] if len(vals) > 7 else 0)
+
+    (total0, idle0, steal0) = sample()
+    time.sleep(interval)
+    (total1, idle1, steal1) = sample()
+
+    total = max(total1 - total0, 1)
+    steal = steal1 - steal0
+    return (100.0*(total - (idle1 - idle0) - steal)/total, 100.0*steal/total)
+
+
+def leftovers():
+    """Gets the names of leftover benchmark processes (see LEFTOVERS), with counts."""
+
+    found = {}
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or int(pid) == os.getpid():
+            continue
+
+        try:
+            argv = open('/proc/' + pid + '/cmdline').read().split('\0')
+        except IOError:
+            continue    # already gone
+        if not argv[0]:
+            continue    # kernel thread
+
+        for (name, test) in LEFTOVERS:
+            if test(argv):
+                found[name] = found.get(name, 0) + 1
+
+    return found
+
+
+def stats():
+    """Gets this machine's stats, as a dictionary."""
+
+    (mem_total, mem_avail) = mem_stats()
+    (busy, steal) = cpu_stats(CPU_INTERVAL)
+
+    return {'host': socket.gethostname(),
+            'mem_total': mem_total, 'mem_avail': mem_avail,
+            'disk': dict((d, disk_free(d)) for d in args.disk),
+            'busy': busy, 'steal': steal,
+            'procs': leftovers()}
+
+
+###############
+# Socket benchmark
+###############
+def recv_exactly(sock, n):
+    """Receives exactly n bytes, or raises IOError if the connection closes."""
+
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(min(n - len(data), MB))
+        if not chunk:
+            raise IOError('connection closed')
+        data += chunk
+    return data
+
+
+def connect(host):
+    """Connects to the socket benchmark server of a host."""
+
+    sock = socket.create_connection((host, args.port), SOCKET_TIMEOUT)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+class BenchHandler(socketserver.BaseRequestHandler):
+    """Handles one connection to the socket benchmark server."""
+
+    def handle(self):
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.last = time.time()
+
+        while True:
+            cmd = sock.recv(1)
+            self.server.last = time.time()
+
+            if cmd == CMD_PING:
+                sock.sendall(CMD_PING)
+            elif cmd == CMD_TIME:
+                sock.sendall(TIME.pack(time.time()))
+            elif cmd == CMD_SEND:
+                (n,) = LENGTH.unpack(recv_exactly(sock, LENGTH.size))
+                while n > 0:
+                    chunk = sock.recv(min(n, MB))
+                    if not chunk:
+                        return
+                    n -= len(chunk)
+                sock.sendall(CMD_PING)
+            else:
+                if cmd == CMD_QUIT:
+                    self.server.quit = True
+                return
+
+
+class BenchServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def serve():
+    """Runs the socket benchmark server until it gets CMD_QUIT or is idle for SERVE_IDLE seconds."""
+
+    server = BenchServer(('', args.port), BenchHandler)
+    server.timeout = 1
+    server.last = time.time()
+    server.quit = False
+
+    # tells the master we're up
+    print('ready')
+    sys.stdout.flush()
+
+    while not server.quit and time.time() - server.last < SERVE_IDLE:
+        server.handle_request()
+    server.server_close()
+
+
+def net(host):
+    """Measures the latency (ms) and throughput (MB/s) to a host's server, as a dictionary."""
+
+    sock = connect(host)
+
+    rtts = []
+    for _ in range(PINGS):
+        t0 = time.time()
+        sock.sendall(CMD_PING)
+        recv_exactly(sock, 1)
+        rtts.append(time.time() - t0)
+
+    data = b'\0'*MB
+    t0 = time.time()
+    sock.sendall(CMD_SEND + LENGTH.pack(args.mb*MB))
+    for _ in range(args.mb):
+        sock.sendall(data)
+    recv_exactly(sock, 1)
+    secs = time.time() - t0
+    sock.close()
+
+    return {'latency': sorted(rtts)[len(rtts)//2]*1000, 'throughput': args.mb/secs}
+
+
+def clock_offset(host):
+    """Measures a host's clock offset from this machine's clock.
+
+    Uses the time request with the shortest round trip, assuming the
+    server's reply was sent halfway through it (like NTP).
+
+    Returns:
+    Tuple (offset, round trip time), in seconds.
+    """
+
+    sock = connect(host)
+    best = None
+    for _ in range(CLOCK_SAMPLES):
+        t0 = time.time()
+        sock.sendall(CMD_TIME)
+        (t,) = TIME.unpack(recv_exactly(sock, TIME.size))
+        t1 = time.time()
+
+        if best is None or t1 - t0 < best[1]:
+            best = (t - (t0 + t1)/2.0, t1 - t0)
+    sock.close()
+
+    return best
+
+
+def try_clock_offset(host):
+    """Same as clock_offset(), but returns None if the host's server can't be reached."""
+
+    try:
+        return clock_offset(host)
+    except (IOError, socket.error):
+        return None
+
+
+def quit_server(host):
+    """Stops a host's socket benchmark server."""
+
+    try:
+        sock = connect(host)
+        sock.sendall(CMD_QUIT)
+        sock.close()
+    except (IOError, socket.error):
+        pass
+
+
+###############
+# Check
+###############
+def run_ssh(host, action, *opts):
+    """Runs this script on a worker.
+
+    Returns:
+    The output's last line, parsed as JSON, or None if it failed.
+    """
+
+    cmd = ' '.join(quote(a) for a in [SCRIPT_DIR + '/healthcheck.py', action] + list(opts))
+    proc = subprocess.Popen(['ssh'] + SSH_OPTS + [host, cmd], stdin=DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.communicate()[0].decode('utf-8', 'replace').strip()
+
+    try:
+        return json.loads(output.splitlines()[-1])
+    except (ValueError, IndexError):
+        sys.stderr.write("%s: %s failed: %s\n" % (host, action, output or 'no output'))
+        return None
+
+
+def start_server(host):
+    """Starts a worker's socket benchmark server over ssh.
+
+    Returns:
+    The ssh process, or None if the server did not start.
+    """
+
+    cmd = ' '.join(quote(a) for a in [SCRIPT_DIR + '/healthcheck.py', 'serve', '--port', str(args.port)])
+    proc = subprocess.Popen(['ssh'] + SSH_OPTS + [host, cmd], stdin=DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    if proc.stdout.readline().strip() != b'ready':
+        proc.kill()
+        return None
+    return proc
+
+
+def median(vals):
+    vals = sorted(vals)
+    return vals[len(vals)//2] if vals else float('nan')
+
+
+def check(hosts):
+    """Checks workers and prints a table of their stats and problems.
+
+    Returns:
+    List of degraded (or unreachable) workers.
+    """
+
+    pool = ThreadPool(min(args.workers, len(hosts)))
+    problems = dict((h, []) for h in hosts)
+
+    ## usage stats
+    sys.stdout.write("Checking %i workers... " % len(hosts))
+    sys.stdout.flush()
+
+    stats = dict(zip(hosts, pool.map(lambda h: run_ssh(h, 'stats', '--disk', *args.disk), hosts)))
+    for h in hosts:
+        s = stats[h]
+        if s is None:
+            problems[h].append('unreachable')
+            continue
+
+        if s['mem_avail'] < args.min_mem*s['mem_total']:
+            problems[h].append('mem')
+        if any(free < args.min_disk for free in s['disk'].values()):
+            problems[h].append('disk')
+        if s['busy'] > args.max_busy:
+            problems[h].append('busy')
+        if s['steal'] > args.max_steal:
+            problems[h].append('steal')
+        problems[h] += ['leftover ' + p for p in sorted(s['procs'])]
+
+    ## clock offsets and network, via each worker's socket benchmark server
+    up = [h for h in hosts if stats[h] is not None]
+    servers = dict(zip(up, pool.map(start_server, up)))
+    up = [h for h in up if servers[h] is not None]
+    for h in hosts:
+        if stats[h] is not None and servers[h] is None:
+            problems[h].append('no server')
+
+    clocks = dict(zip(up, pool.map(try_clock_offset, up)))
+    for h in up:
+        if clocks[h] is None:
+            problems[h].append('no clock')
+        elif abs(clocks[h][0]) > args.max_skew:
+            problems[h].append('clock')
+
+    # random ring of pairs, all measured at the same time
+    ring = list(up)
+    random.shuffle(ring)
+    pairs = [(ring[k], ring[(k + 1) % len(ring)]) for k in range(len(ring))] if len(ring) > 1 else []
+
+    results = pool.map(lambda p: run_ssh(p[0], 'net', p[1], '--port', str(args.port), '--mb', str(args.mb)), pairs)
+    nets = dict((h, []) for h in up)
+    for (a, b), r in zip(pairs, results):
+        if r is not None:
+            nets[a].append(r)
+            nets[b].append(r)
+
+    for h in up:
+        quit_server(h)
+        servers[h].wait()
+
+    # a worker is slow if all of its pairs are slow
+    mid_tput = median([r['throughput'] for r in results if r is not None])
+    mid_lat = median([r['latency'] for r in results if r is not None])
+    for h in up:
+        if not nets[h]:
+            if pairs:
+                problems[h].append('no net')
+        elif all(r['throughput'] < args.min_net*mid_tput for r in nets[h]):
+            problems[h].append('net tput')
+        elif all(r['latency'] > mid_lat/max(args.min_net, 0.01) for r in nets[h]):
+            problems[h].append('net latency')
+
+    pool.close()
+    print("Done.")
+
+    ## output
+    header = (" %-16s | %7s | %7s | %6s | %6s | %10s | %8s | %8s | %s"
+              % ('Host', 'Mem (%)', 'Disk GB', 'Busy %', 'Steal', 'Clock (ms)', 'Net MB/s', 'Lat (ms)', 'Problems'))
+    separator = "=" * len(header)
+
+    print("")
+    print(separator)
+    print(header)
+    print(separator)
+    for h in hosts:
+        s = stats[h]
+        if s is None:
+            print(" %-16s | %s" % (h, ', '.join(problems[h])))
+            continue
+
+        clock = clocks[h][0]*1000 if clocks.get(h) else float('nan')
+        tput = median([r['throughput'] for r in nets.get(h, [])])
+        lat = median([r['latency'] for r in nets.get(h, [])])
+        print(" %-16s | %7.1f | %7.1f | %6.1f | %6.1f | %10.1f | %8.1f | %8.2f | %s"
+              % (h, 100.0*s['mem_avail']/s['mem_total'], min(s['disk'].values()), s['busy'], s['steal'],
+                 clock, tput, lat, ', '.join(problems[h]) or 'ok'))
+    print("")
+    print("Net MB/s and Lat are the medians of the worker's pairs (all pairs: %.1f MB/s, %.2f ms)." % (mid_tput, mid_lat))
+    print("")
+
+    return [h for h in hosts if problems[h]]
+
+
+###############
+# main()
+###############
+if __name__ == '__main__':
+    if args.action == 'stats':
+        print(json.dumps(stats()))
+
+    elif args.action == 'serve':
+        serve()
+
+    elif args.action in ('net', 'clock', 'quit'):
+        if len(args.hosts) != 1:
+            parser.error(args.action + ' needs exactly one host')
+
+        if args.action == 'net':
+            print(json.dumps(net(args.hosts[0])))
+        elif args.action == 'clock':
+            # as read by logsummary.read_clock()
+            (offset, rtt) = clock_offset(args.hosts[0])
+            print('offset %.6f rtt %.6f' % (-offset, rtt))
+        else:
+            quit_server(args.hosts[0])
+
+    else:
+        if not args.hosts:
+            parser.error('check needs at least one host')
+
+        degraded = check(args.hosts)
+        if args.degraded:
+            with open(args.degraded, 'w') as f:
+                f.write(''.join(h + '\n' for h in degraded))
+
+        if degraded:
+            print("Degraded workers: " + ' '.join(degraded))
+        sys.exit(1 if degraded else 0)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+
+"""Summarizes a machine's monitoring logs into one compact binary file.
+
+Used by bench-finish.sh on each worker, so that only the summary has to be
+copied to the master. For a log prefix <prefix> (e.g., ./logs/<logname>_3),
+this reads <prefix>_mem.txt, _cpu.txt, _net.txt and _nbt.txt (as written by
+bench-init.sh and bench-finish.sh) and writes <prefix>_sum.bin.
+
+A summary keeps everything the parsers use: the machine's hostname, its
+total eth0 bytes received/sent, its clock log (<prefix>_clk.txt, if any),
+and the per-second samples of used memory
+(KB), CPU usage (%) and eth0 receive/send rates (kB/s), along with their
+min/max/mean. Samples are stored exactly, as delta-encoded integers in units
+of the logs' precision, and the whole summary is zlib compressed.
+
+The parsers (results/plots/parsers.py, benchmark/parsers/logparsers.py)
+read summaries with read_summary(). This only uses the standard library,
+as it runs on the workers.
+"""
+
+import os, sys, struct, zlib
+import argparse
+
+###############
+# Constants
+###############
+SUMMARY_LOG = '_sum.bin'
+MAGIC = b'UWSUM\x02'
+OLD_MAGIC = b'UWSUM\x01'           # summaries without a clock log
+
+# summarized logs, all of which must exist
+LOGS = ('_mem.txt', '_cpu.txt', '_net.txt', '_nbt.txt')
+
+# clock log written by bench-init.sh, as "key value [key value ...]" lines
+CLOCK_LOG = '_clk.txt'
+CLOCK_KEYS = ('start', 'offset', 'rtt', 'run')
+
+# time series, each stored as round(sample*scale) (i.e., sar's 2 decimals)
+SERIES = ('mem', 'cpu', 'recv', 'sent')
+SCALES = {'mem': 1, 'cpu': 100, 'recv': 100, 'sent': 100}
+
+HEADER = struct.Struct('<H')         # hostname length
+NBT = struct.Struct('<dd')           # total bytes received, sent
+CLOCK = struct.Struct('<dddd')       # CLOCK_KEYS, NaN if missing
+STATS = struct.Struct('<IdddI')      # samples, min, max, mean, encoded bytes
+
+
+###############
+# Parse logs
+###############
+def read_clock(log):
+    """Reads a machine's clock log.
+
+    bench-init.sh records when the machine's monitoring started ('start'),
+    in seconds since the epoch by the machine's own clock, and its clock's
+    offset from the master's ('offset', i.e. its clock minus the master's)
+    with the round trip time of the measurement ('rtt'). The master's log
+    also has when the run started ('run'), by its clock.
+
+    Returns:
+    Dictionary of the values in the log (floats), indexed by CLOCK_KEYS.
+    """
+
+    clock = {}
+    for line in open(log):
+        tokens = line.split()
+        for (key, val) in zip(tokens[::2], tokens[1::2]):
+            if key in CLOCK_KEYS:
+                clock[key] = float(val)
+    return clock
+
+
+def parse_logs(prefix):
+    """Parses a machine's raw monitoring logs.
+
+    Arguments:
+    prefix -- the machine's log prefix, e.g. ./logs/<logname>_3 (str)
+
+    Returns:
+    Tuple (hostname or '', (recv, sent) bytes, clock (see read_clock()),
+    dictionary of samples indexed by SERIES), where samples are integers
+    (see SCALES).
+    """
+
+    samples = {}
+
+    # each line is "-/+ buffers/cache: used free", so take every 4th token
+    tokens = open(prefix + '_mem.txt').read().split()
+    samples['mem'] = [int(t) for t in tokens[2:len(tokens) - len(tokens) % 4:4]]
+
+    # sar's last column is %idle (Average lines are printed if sar exits cleanly)
+    with open(prefix + '_cpu.txt') as f:
+        header = f.readline()
+        samples['cpu'] = [int(round((100.0 - float(line.rsplit(None, 1)[1]))*SCALES['cpu']))
+                          for line in f if ' all ' in line and not line.startswith('Average')]
+
+    host = ''
+    if header.startswith('Linux') and '(' in header:
+        host = header.split('(', 1)[1].split(')', 1)[0]
+
+    # eth0 is followed by rxpck/s, txpck/s, rxkB/s, txkB/s, ...
+    lines = [line.split() for line in open(prefix + '_net.txt')
+             if ' eth0 ' in line and not line.startswith('Average')]
+    col = lines[0].index('eth0') + 3 if lines else 0
+    samples['recv'] = [int(round(float(line[col])*SCALES['recv'])) for line in lines]
+    samples['sent'] = [int(round(float(line[col + 1])*SCALES['sent'])) for line in lines]
+
+    # lines appear as initial followed by final (same as the parsers)
+    recv = sent = 0
+    for line in open(prefix + '_nbt.txt'):
+        if "eth0" in line:
+            recv = float(line.split()[1]) - recv
+            sent = float(line.split()[9]) - sent
+
+    clock = read_clock(prefix + CLOCK_LOG) if os.path.isfile(prefix + CLOCK_LOG) else {}
+
+    return (host, (recv, sent), clock, samples)
+
+
+###############
+# Encoding
+###############
+def encode(values):
+    """Encodes integers as zigzag varints of their differences.
+
+    Returns: encoded bytes (bytes).
+    """
+
+    out = bytearray()
+    prev = 0
+    for v in values:
+        d = v - prev
+        prev = v
+
+        # zigzag, so small negative differences are small too
+        z = d*2 if d >= 0 else -d*2 - 1
+        while z >= 0x80:
+            out.append((z & 0x7f) | 0x80)
+            z >>= 7
+        out.append(z)
+
+    return bytes(out)
+
+
+def decode(data):
+    """Decodes integers encoded by encode().
+
+    Returns: list of integers.
+    """
+
+    values = []
+    prev = shift = z = 0
+    for b in bytearray(data):
+        z |= (b & 0x7f) << shift
+        if b & 0x80:
+            shift += 7
+            continue
+
+        prev += (z >> 1) if not (z & 1) else -((z + 1) >> 1)
+        values.append(prev)
+        shift = z = 0
+
+    return values
+
+
+def write_summary(prefix):
+    """Summarizes a machine's raw monitoring logs into <prefix>_sum.bin.
+
+    Arguments:
+    prefix -- the machine's log prefix, e.g. ./logs/<logname>_3 (str)
+
+    Returns:
+    Size of the summary, in bytes.
+    """
+
+    (host, nbt, clock, samples) = parse_logs(prefix)
+    host = host.encode('utf-8')
+
+    header = (HEADER.pack(len(host)) + host + NBT.pack(*nbt) +
+              CLOCK.pack(*[clock.get(key, float('nan')) for key in CLOCK_KEYS]))
+    data = b''
+    for series in SERIES:
+        s = samples[series]
+        encoded = encode(s)
+        if s:
+            (lo, hi, mean) = (min(s), max(s), sum(s)/float(len(s)))
+        else:
+            lo = hi = mean = float('nan')
+
+        header += STATS.pack(len(s), lo/float(SCALES[series]), hi/float(SCALES[series]),
+                             mean/SCALES[series], len(encoded))
+        data += encoded
+
+    summary = MAGIC + zlib.compress(header + data, 9)
+    with open(prefix + SUMMARY_LOG, 'wb') as f:
+        f.write(summary)
+
+    return len(summary)
+
+
+def read_summary(log, samples=False):
+    """Reads a machine's log summary.
+
+    Arguments:
+    log -- path to the summary, i.e. <prefix>_sum.bin (str)
+    samples -- True to also decode the samples, which is slower (bool)
+
+    Returns:
+    Dictionary with the hostname ('host', None if unknown), total eth0 bytes
+    ('nbt', a (recv, sent) tuple), the clock log ('clock', see read_clock(),
+    empty if there was none), and a dictionary per series in SERIES with
+    its 'count', 'min', 'max', 'mean' and, if requested, 'samples' (list).
+    Values are in the logs' units: KB for mem, % for cpu, kB/s for recv/sent.
+    """
+
+    with open(log, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC) and not data.startswith(OLD_MAGIC):
+        raise ValueError(log + ' is not a log summary')
+    has_clock = data.startswith(MAGIC)
+    data = zlib.decompress(data[len(MAGIC):])
+
+    (n,) = HEADER.unpack_from(data, 0)
+    pos = HEADER.size
+    summary = {'host': data[pos:pos + n].decode('utf-8') or None}
+    pos += n
+
+    summary['nbt'] = NBT.unpack_from(data, pos)
+    pos += NBT.size
+
+    summary['clock'] = {}
+    if has_clock:
+        for (key, val) in zip(CLOCK_KEYS, CLOCK.unpack_from(data, pos)):
+            if val == val:  # i.e., not NaN
+                summary['clock'][key] = val
+        pos += CLOCK.size
+
+    sizes = []
+    for series in SERIES:
+        (count, lo, hi, mean, size) = STATS.unpack_from(data, pos)
+        pos += STATS.size
+        summary[series] = {'count': count, 'min': lo, 'max': hi, 'mean': mean}
+        sizes.append(size)
+
+    if samples:
+        for series, size in zip(SERIES, sizes):
+            summary[series]['samples'] = [v/float(SCALES[series]) for v in decode(data[pos:pos + size])]
+            pos += size
+
+    return summary
+
+
+###############
+# main()
+###############
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Summarizes machines\' mem, cpu, net and nbt logs into compact '
+                                                 '<prefix>' + SUMMARY_LOG + ' files.')
+    parser.add_argument('prefix', type=str, nargs='+',
+                        help='a machine\'s log prefix (e.g. ./logs/pagerank_orkut-adj.txt_16_0_20140101-123050_3)')
+
+    failed = False
+    for prefix in parser.parse_args().prefix:
+        missing = [prefix + log for log in LOGS if not os.path.isfile(prefix + log)]
+        if missing:
+            sys.stderr.write("ERROR: %s missing!\n" % ', '.join(missing))
+            failed = True
+            continue
+
+        try:
+            write_summary(prefix)
+        except (IOError, ValueError, IndexError) as e:
+            sys.stderr.write("ERROR: cannot summarize %s: %s\n" % (prefix, e))
+            failed = True
+
+    # bench-finish.sh copies the raw logs instead if this fails
+    sys.exit(1 if failed else 0)
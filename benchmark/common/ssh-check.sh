@@ -1,6 +1,7 @@
 #!/bin/bash
 
 # Simple script to check if worker machines can be ssh'd to.
+# To also check their resources and performance, use ./health-check.sh.
 
 cd "$(dirname "${BASH_SOURCE[0]}")"
 source ./get-hosts.sh
@@ -0,0 +1,37 @@
+#!/bin/bash -e
+
+# Prints the statistics of each input graph in the dataset folder,
+# one "file vertices edges bytes" line per graph.
+#
+# The output is the dataset index used by ../../results/plots/gen-data.py
+# (mode 3), so save it as datasets.txt in the results folder:
+#   ./dataset-stats.sh > ../../results/datasets.txt
+#
+# Vertices are the lines of the adjacency list (i.e., vertices with
+# at least one out-edge). MST graphs (*-mst-adj.txt) are weighted,
+# so each of their edges is a destination followed by a weight.
+
+commondir=$(dirname "${BASH_SOURCE[0]}")/../common
+source "$commondir"/get-dirs.sh
+
+if [ $# -gt 1 ]; then
+    echo "usage: $0 [dataset-dir]"
+    echo ""
+    echo "dataset-dir: folder with the *-adj.txt graphs, default=${DATASET_DIR}"
+    exit -1
+fi
+
+cd "${1:-$DATASET_DIR}"
+
+echo "# file vertices edges bytes"
+for graph in *-adj.txt; do
+    if [[ "$graph" == *-mst-adj.txt ]]; then
+        tokens=2
+    else
+        tokens=1
+    fi
+
+    # %.0f, as mawk's %i overflows for the larger graphs
+    awk -v graph="$graph" -v tokens=${tokens} -v bytes=$(stat -c %s "$graph") \
+        '{edges += (NF-1)/tokens} END {printf "%s %.0f %.0f %.0f\n", graph, NR, edges, bytes}' "$graph"
+done
@@ -4,6 +4,7 @@ if [ $# -ne 2 ]; then
     echo "usage: $0 machines runs"
     echo ""
     echo "machines: 4, 8, 16, 32, 64, or 128"
+    echo "runs: maximum number of runs per experiment (fewer are done once the CI converges)"
     exit -1
 fi
 
@@ -12,6 +13,10 @@ cd "$(dirname "${BASH_SOURCE[0]}")"
 MACHINES=$1
 RUNS=$2
 
+# runs of each experiment stop early once its CI is small enough
+# (only runs from this campaign are counted, see ../common/ci-check.sh)
+START=$(date +%Y%m%d-%H%M%S)
+
 case ${MACHINES} in
     4)   GRAPHS=(amazon google patents);
          GRAPHS_MST=(amazon google patents);
@@ -47,18 +52,21 @@ esac
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./pagerank.sh "${graph}-adj.txt" ${MACHINES} 0
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./sssp.sh "${GRAPHS[$j]}-adj.txt" ${MACHINES} 0 ${SRC[$j]}
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./wcc.sh "${graph}-adj.txt" ${MACHINES} 0
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
@@ -66,6 +74,7 @@ done
 for graph in "${GRAPHS_MST[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./mst.sh "${graph}-mst-adj.txt" ${MACHINES} 0
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
@@ -82,24 +91,28 @@ done
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./pagerank.sh "${graph}-adj.txt" ${MACHINES} 1
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./sssp.sh "${GRAPHS[$j]}-adj.txt" ${MACHINES} 1 ${SRC[$j]}
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./wcc.sh "${graph}-adj.txt" ${MACHINES} 1
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
 for graph in "${GRAPHS_MST_HASH[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./mst.sh "${graph}-mst-adj.txt" ${MACHINES} 1
+        ../common/ci-check.sh 0 ${START} && break
     done
 done
 
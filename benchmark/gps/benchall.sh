@@ -4,6 +4,7 @@ if [ $# -ne 2 ]; then
     echo "usage: $0 machines runs"
     echo ""
     echo "machines: 4, 8, 16, 32, 64, or 128"
+    echo "runs: maximum number of runs per experiment (fewer are done once the CI converges)"
     exit -1
 fi
 
@@ -12,6 +13,10 @@ cd "$(dirname "${BASH_SOURCE[0]}")"
 MACHINES=$1
 RUNS=$2
 
+# runs of each experiment stop early once its CI is small enough
+# (only runs from this campaign are counted, see ../common/ci-check.sh)
+START=$(date +%Y%m%d-%H%M%S)
+
 case ${MACHINES} in
     4)   GRAPHS=(amazon google patents);
          GRAPHS_MST=(amazon google patents);
@@ -49,6 +54,7 @@ for graph in "${GRAPHS[@]}"; do
         ./pagerank.sh "${graph}-adj.txt" ${MACHINES} 0
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -57,6 +63,7 @@ for j in "${!GRAPHS[@]}"; do
         ./sssp.sh "${GRAPHS[$j]}-adj.txt" ${MACHINES} 0 ${SRC[$j]}
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -65,6 +72,7 @@ for graph in "${GRAPHS[@]}"; do
         ./wcc.sh "${graph}-adj.txt" ${MACHINES} 0
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
 
@@ -73,6 +81,7 @@ for graph in "${GRAPHS_MST[@]}"; do
         ./mst.sh "${graph}-mst-adj.txt" ${MACHINES}
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
 
@@ -94,6 +103,7 @@ for graph in "${GRAPHS[@]}"; do
         ./pagerank.sh "${graph}-adj.txt" ${MACHINES} 1
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -102,6 +112,7 @@ for j in "${!GRAPHS[@]}"; do
         ./sssp.sh "${GRAPHS[$j]}-adj.txt" ${MACHINES} 1 ${SRC[$j]}
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -110,6 +121,7 @@ for graph in "${GRAPHS[@]}"; do
         ./wcc.sh "${graph}-adj.txt" ${MACHINES} 1
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
 
@@ -133,6 +145,7 @@ for graph in "${GRAPHS[@]}"; do
         ./pagerank.sh "${graph}-adj.txt" ${MACHINES} 2
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -141,6 +154,7 @@ for j in "${!GRAPHS[@]}"; do
         ./sssp.sh "${GRAPHS[$j]}-adj.txt" ${MACHINES} 2 ${SRC[$j]}
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
  
@@ -149,6 +163,7 @@ for graph in "${GRAPHS[@]}"; do
         ./wcc.sh "${graph}-adj.txt" ${MACHINES} 2
         ./stop-nodes.sh
         sleep ${SLEEP_TIME}
+        ../common/ci-check.sh 1 ${START} && break
     done
 done
 
@@ -4,6 +4,10 @@
 #
 # NOTE: "slaves" is NOT placed in master-script/, because we use
 # our own scripts for starting/stopping GPS workers.
+#
+# In a host group (see ../bench-groups.sh), the master gets its own
+# port and the machine config file its own HDFS folder, so that
+# groups' GPS runs don't interfere with each other.
 
 cd "$(dirname "${BASH_SOURCE[0]}")"
 source ../common/get-hosts.sh
@@ -16,32 +20,32 @@ rm -f machine.cfg
 # create slaves file
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
     for ((j = 1; j <= ${GPS_WPM}; j++)); do
-        echo "${CLUSTER_NAME}${i}" >> slaves
+        echo "${CLUSTER_NAME}$((HOST_OFFSET + i))" >> slaves
     done
 done
 
 # create machine config file
-echo "-1 ${HOSTNAME} 64000" >> machine.cfg   # master is special
+echo "-1 ${HOSTNAME} $((64000 - HOST_OFFSET))" >> machine.cfg   # master is special
 
 w_id=0    # worker counter (needed if workers per machine > 1)
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
     # to get multiple workers per machine, use the same name
     # but give it a unique id and port
     for ((j = 1; j <= ${GPS_WPM}; j++)); do
-        echo "${w_id} ${CLUSTER_NAME}${i} $((64001 + ${w_id}))" >> machine.cfg
+        echo "${w_id} ${CLUSTER_NAME}$((HOST_OFFSET + i)) $((64001 + ${w_id}))" >> machine.cfg
         w_id=$((w_id+1))
     done
 done
 
 # upload machine config file to HDFS
 hadoop dfsadmin -safemode wait > /dev/null
-hadoop dfs -rmr /user/${USER}/gps-machine-config/ || true
-hadoop dfs -mkdir /user/${USER}/gps-machine-config/
-hadoop dfs -put machine.cfg /user/${USER}/gps-machine-config/
+hadoop dfs -rmr /user/${USER}/gps-machine-config${GROUP_SUFFIX}/ || true
+hadoop dfs -mkdir /user/${USER}/gps-machine-config${GROUP_SUFFIX}/
+hadoop dfs -put machine.cfg /user/${USER}/gps-machine-config${GROUP_SUFFIX}/
 
 # make GPS log directories if needed
 if [[ ! -d "$GPS_LOG_DIR" ]]; then mkdir -p "$GPS_LOG_DIR"; fi
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
-    ssh ${CLUSTER_NAME}${i} "if [[ ! -d \"$GPS_LOG_DIR\" ]]; then mkdir -p \"$GPS_LOG_DIR\"; fi" &
+    ssh ${CLUSTER_NAME}$((HOST_OFFSET + i)) "if [[ ! -d \"$GPS_LOG_DIR\" ]]; then mkdir -p \"$GPS_LOG_DIR\"; fi" &
 done
 wait
\ No newline at end of file
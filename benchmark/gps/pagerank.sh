@@ -10,11 +10,12 @@ if [ $# -ne 3 ]; then
     exit -1
 fi
 
+source ../common/get-hosts.sh
 source ../common/get-dirs.sh
 source ../common/get-configs.sh
 
 # place input in /user/${USER}/input/
-# output is in /user/${USER}/gps/output/
+# output is in /user/${USER}/gps/output${GROUP_SUFFIX}/
 inputgraph=$(basename $1)
 
 # machines should be number of EC2 instances
@@ -45,7 +46,7 @@ logfile=${logname}_time.txt       # GPS statistics (incl running time)
     -ifs /user/${USER}/input/${inputgraph} \
     -hcf "$HADOOP_DIR"/conf/core-site.xml \
     -jc gps.examples.pagerank.PageRankVertex###JobConfiguration \
-    -mcfg /user/${USER}/gps-machine-config/machine.cfg \
+    -mcfg /user/${USER}/gps-machine-config${GROUP_SUFFIX}/machine.cfg \
     -log4jconfig "$GPS_DIR"/conf/log4j.config \
     -other -max###30
 
@@ -53,5 +54,5 @@ logfile=${logname}_time.txt       # GPS statistics (incl running time)
 ../common/bench-finish.sh ${logname}
 
 ## get stats (see debug_site.sh for debug naming convention)
-hadoop dfs -get /user/${USER}/gps/output/quick-start-machine-stats ./logs/${logfile}
-#hadoop dfs -mv /user/${USER}/gps/output/quick-start-machine-stats /user/${USER}/gps/stats-${logname}
\ No newline at end of file
+hadoop dfs -get /user/${USER}/gps/output${GROUP_SUFFIX}/quick-start-machine-stats ./logs/${logfile}
+#hadoop dfs -mv /user/${USER}/gps/output${GROUP_SUFFIX}/quick-start-machine-stats /user/${USER}/gps/stats-${logname}
\ No newline at end of file
@@ -73,11 +73,12 @@ if [ $# -lt 3 ]; then
 fi
 
 commondir=$(dirname "${BASH_SOURCE[0]}")/../common
+source "$commondir"/get-hosts.sh
 source "$commondir"/get-dirs.sh
 source "$commondir"/get-configs.sh
 
 
-OUTPUT_DIR=/user/${USER}/gps/output/
+OUTPUT_DIR=/user/${USER}/gps/output${GROUP_SUFFIX}/
 
 ## start master
 MASTER_GPS_ID=-1
@@ -86,7 +87,7 @@ GPS_MASTER_XMS=50M     # initial heap size (master)
 echo "Using args: ${@:3}"
 
 echo "Starting GPS master -1"
-"$JAVA_DIR"/bin/java -Xincgc -Xms${GPS_MASTER_XMS} -Xmx${GPS_MASTER_XMX} -verbose:gc -jar "$GPS_DIR"/gps_node_runner.jar -machineid ${MASTER_GPS_ID} -ofp "$OUTPUT_DIR"/${2}-machine-stats ${@:3} &> "$GPS_LOG_DIR"/${2}-machine${i}-output.txt &
+"$JAVA_DIR"/bin/java -Xincgc -Xms${GPS_MASTER_XMS} -Xmx${GPS_MASTER_XMX} -verbose:gc -jar "$GPS_DIR"/gps_node_runner.jar -machineid ${MASTER_GPS_ID} -ofp "$OUTPUT_DIR"/${2}-machine-stats ${@:3} &> "$GPS_LOG_DIR"/${2}${GROUP_SUFFIX}-machine${i}-output.txt &
 
 ## start slaves asynchronously (faster this way)
 GPS_WORKER_XMS=256M   # initial heap size (workers)
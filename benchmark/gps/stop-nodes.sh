@@ -2,8 +2,13 @@
 
 # Does the same thing as master-scripts/stop_gps_nodes.sh, but faster.
 # Also removes the need for a separate scripts/stop_nodes.sh.
+#
+# Only this host group's master is killed (see ../bench-groups.sh),
+# as other groups' GPS masters run on the same machine.
 
-kill -9 $(ps aux | grep "[g]ps_node_runner" | awk '{print $2}')
+source "$(dirname "${BASH_SOURCE[0]}")"/../common/get-hosts.sh
+
+kill -9 $(ps aux | grep "[g]ps_node_runner.*gps-machine-config${GROUP_SUFFIX}/" | awk '{print $2}')
 
 # the "|| ..." is a workaround in case the file doesn't end with a newline
 while read slave || [ -n "$slave" ]; do
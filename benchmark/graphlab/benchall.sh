@@ -4,6 +4,7 @@ if [ $# -ne 2 ]; then
     echo "usage: $0 machines runs"
     echo ""
     echo "machines: 4, 8, 16, 32, 64, or 128"
+    echo "runs: maximum number of runs per experiment (fewer are done once the CI converges)"
     exit -1
 fi
 
@@ -12,6 +13,10 @@ cd "$(dirname "${BASH_SOURCE[0]}")"
 MACHINES=$1
 RUNS=$2
 
+# runs of each experiment stop early once its CI is small enough
+# (only runs from this campaign are counted, see ../common/ci-check.sh)
+START=$(date +%Y%m%d-%H%M%S)
+
 case ${MACHINES} in
     4)   GRAPHS=(amazon google patents);
          TOL=(0.408805 2.306985 2.220446E-16);   # for PageRank
@@ -41,18 +46,21 @@ esac
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./pagerank.sh "${GRAPHS[$j]}-adj-split/" ${MACHINES} 0 ${TOL[$j]}
+        ../common/ci-check.sh 3 ${START} && break
     done
 done
  
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./sssp.sh "${GRAPHS[$j]}-adj-split/" ${MACHINES} 0 ${SRC[$j]}
+        ../common/ci-check.sh 3 ${START} && break
     done
 done
  
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./wcc.sh "${graph}-adj-split/" ${MACHINES}
+        ../common/ci-check.sh 3 ${START} && break
     done
 done
 
@@ -68,12 +76,14 @@ done
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./pagerank.sh "${GRAPHS[$j]}-adj-split/" ${MACHINES} 1 ${TOL[$j]}
+        ../common/ci-check.sh 3 ${START} && break
     done
 done
 
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./sssp.sh "${GRAPHS[$j]}-adj-split/" ${MACHINES} 1 ${SRC[$j]}
+        ../common/ci-check.sh 3 ${START} && break
     done
 done
 
@@ -10,5 +10,5 @@ source ../common/get-hosts.sh
 rm -f machines
 
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
-    echo "${CLUSTER_NAME}${i}" >> machines
+    echo "${CLUSTER_NAME}$((HOST_OFFSET + i))" >> machines
 done
\ No newline at end of file
@@ -8,12 +8,13 @@ if [ $# -ne 4 ]; then
     exit -1
 fi
 
+source ../common/get-hosts.sh
 source ../common/get-dirs.sh
 
 # place input in /user/${USER}/input/
-# output is in /user/${USER}/graphlab-output/
+# output is in /user/${USER}/graphlab-output${GROUP_SUFFIX}/
 inputgraph=$(basename $1)
-outputdir=/user/${USER}/graphlab-output/
+outputdir=/user/${USER}/graphlab-output${GROUP_SUFFIX}/
 hadoop dfs -rmr "$outputdir" || true
 
 hdfspath=$(grep hdfs "$HADOOP_DIR"/conf/core-site.xml | sed -e 's/.*<value>//' -e 's@</value>.*@@')
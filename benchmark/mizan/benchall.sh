@@ -4,6 +4,7 @@ if [ $# -ne 2 ]; then
     echo "usage: $0 machines runs"
     echo ""
     echo "machines: 4, 8, 16, 32, 64, or 128"
+    echo "runs: maximum number of runs per experiment (fewer are done once the CI converges)"
     exit -1
 fi
 
@@ -12,6 +13,10 @@ cd "$(dirname "${BASH_SOURCE[0]}")"
 MACHINES=$1
 RUNS=$2
 
+# runs of each experiment stop early once its CI is small enough
+# (only runs from this campaign are counted, see ../common/ci-check.sh)
+START=$(date +%Y%m%d-%H%M%S)
+
 case ${MACHINES} in
     4)   GRAPHS=(amazon google patents);
          SRC=(0 0 6009554);;  # for SSSP
@@ -35,6 +40,7 @@ esac
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./premizan.sh "${graph}.txt" ${MACHINES} 1
+        ../common/ci-check.sh 2 ${START} && break
     done
 done
 
@@ -45,18 +51,21 @@ done
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./pagerank.sh "${graph}.txt" ${MACHINES} 0
+        ../common/ci-check.sh 2 ${START} && break
     done
 done
 
 for j in "${!GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./sssp.sh "${GRAPHS[$j]}.txt" ${MACHINES} 0 ${SRC[$j]}
+        ../common/ci-check.sh 2 ${START} && break
     done
 done
 
 for graph in "${GRAPHS[@]}"; do
     for ((i = 1; i <= RUNS; i++)); do
         ./wcc.sh "${graph}.txt" ${MACHINES} 0
+        ../common/ci-check.sh 2 ${START} && break
     done
 done
 
@@ -11,6 +11,6 @@ rm -f slaves
 
 for ((i = 1; i <= ${NUM_MACHINES}; i++)); do
     for ((j = 1; j <= ${MIZAN_WPM}; j++)); do
-        echo "${CLUSTER_NAME}${i}" >> slaves
+        echo "${CLUSTER_NAME}$((HOST_OFFSET + i))" >> slaves
     done
 done
\ No newline at end of file
@@ -5,23 +5,11 @@
 import os, sys, glob
 import argparse, itertools
 
+from logparsers import *
+
 # do some parallel computing
 #from joblib import Parallel, delayed
 
-###############
-# Constants
-###############
-BYTE_PER_GB = 1024*1024*1024.0
-KB_PER_GB = 1024*1024.0
-
-MS_PER_SEC = 1000.0
-
-ALG_PREMIZAN = 'premizan'
-
-SYSTEMS = ('giraph', 'gps', 'mizan', 'graphlab')
-SYS_GIRAPH, SYS_GPS, SYS_MIZAN, SYS_GRAPHLAB = SYSTEMS
-
-
 ###############
 # Parse args
 ###############
@@ -61,198 +49,6 @@ do_master = parser.parse_args().master
 logs = [f for re in logs_re for f in glob.glob(re)]
 
 
-###############
-# Main parsers
-###############
-def time_parser(log_prefix, system, alg):
-    """Parses running and IO times for a single run.
-
-    Arguments:
-    log_prefix -- the prefix of one experiment run's log files (str)
-    system -- the system tested (str)
-    alg -- the algorithm tested (str)
-
-    Returns:
-    A tuple (running time, IO time) or (0,0) if logs files are
-    missing.
-    """
-
-    log_files = glob.glob(log_prefix + '_time.txt')
-    if len(log_files) != 1:
-        return (0,0)
-
-    log_file = log_files[0]
-
-    io = run = total = 0
-
-    if system == SYS_GIRAPH:
-        io = 0
-        for line in open(log_file):
-            if "Setup " in line:
-                io = io + float(line.split()[5].split('=')[1])
-            elif "Input superstep " in line:
-                io = io + float(line.split()[6].split('=')[1])
-            elif "Shutdown " in line:
-                io = io + float(line.split()[5].split('=')[1])
-            elif "Total (mil" in line:
-                total = float(line.split()[5].split('=')[1])
-
-        return ((total - io)/(MS_PER_SEC), io/(MS_PER_SEC))
-
-    elif system == SYS_GPS:
-        start = computestart = end = 0
-        for line in open(log_file):
-            if "SYSTEM_START_TIME " in line:
-                start = float(line.split()[1])
-            elif "START_TIME " in line:
-                computestart = float(line.split()[1])
-            elif "-1-LATEST_STATUS_TIMESTAMP " in line:
-                end = float(line.split()[1])
-
-        return ((end - computestart)/(MS_PER_SEC),
-                (computestart - start)/(MS_PER_SEC))
-
-    elif system == SYS_GRAPHLAB:
-        for line in open(log_file):
-            if "TOTAL TIME (sec)" in line:
-                total = float(line.split()[3])
-            elif "Finished Running engine" in line:
-                run = float(line.split()[4])
-
-        return (run, (total - run))
-
-    elif system == SYS_MIZAN:
-        if alg == ALG_PREMIZAN:
-            for line in open(log_file):
-                if "TOTAL TIME (sec)" in line:
-                    io = float(line.split()[3])
-
-            return (0.0, io)
-        else:
-            for line in open(log_file):
-                if "TIME: Total Running Time without IO =" in line:
-                    run = float(line.split()[7])
-                elif "TIME: Total Running Time =" in line:
-                    total = float(line.split()[5])
-
-            return (run, (total - run))
-
-
-def mem_parser(log_prefix, machines):
-    """Parses memory usage of a single run.
-
-    Arguments:
-    log_prefix -- the prefix of one experiment run's log files (str)
-    machines -- number of machines tested (int)
-
-    Returns:
-    A tuple (minimum mem, avg mem, maximum mem), where "mem" corresponds to
-    the max memory used at each machine (GB), or (0,0,0) if logs are missing.
-    """
-
-    if do_master:
-        log_files = glob.glob(log_prefix + '_0_mem.txt')
-        if len(log_files) != 1:
-            return (0,0,0)
-    else:
-        log_files = [f for f in glob.glob(log_prefix + '_*_mem.txt') if "_0_mem.txt" not in f]
-        if len(log_files) < machines:
-            return (0,0,0)
-
-    def parse(log):
-        """Parses a single log file for mem stats.
-
-        Returns: the max memory usage in GB.
-        """
-        # note that this "mems" is the memory usage (per second) of a SINGLE machine
-        mems = [float(line.split()[2]) for line in open(log).readlines()]
-        return (max(mems) - min(mems))/KB_PER_GB
-
-    # list of each machine's maximum memory usage
-    mems = [parse(log) for log in log_files]
-
-    return (min(mems), sum(mems)/len(mems), max(mems))
-
-
-def net_parser(log_prefix, machines):
-    """Parses network usage of a single run.
-
-    Arguments:
-    log_prefix -- the prefix of one experiment run's log files (str)
-    machines -- number of machines tested (int)
-
-    Returns:
-    A tuple (eth recv, eth sent), where eth recv/sent is the total network data
-    received/sent across all worker machines (GB), or (0,0) if logs are missing.
-    """
-
-    if do_master:
-        log_files = glob.glob(log_prefix + '_0_nbt.txt')
-        if len(log_files) != 1:
-            return (0,0)
-    else:
-        log_files = [f for f in glob.glob(log_prefix + '_*_nbt.txt') if "_0_nbt.txt" not in f]
-        if len(log_files) < machines:
-            return (0,0)
-
-    def parse(log):
-        """Parses a single log file for net stats.
-
-        Returns: (recv, sent) tuple in GB.
-        """
-
-        # bash equivalent:
-        # recv=$((-$(cat "$log" | grep "eth0" | awk '{print $2}' | tr '\n' '+')0))
-        # sent=$((-$(cat "$log" | grep "eth0" | awk '{print $10}' | tr '\n' '+')0))
-        recv = 0
-        sent = 0
-
-        for line in open(log).readlines():
-            # lines appear as initial followed by final, so this does the correct computation
-            if "eth0" in line:
-                recv = float(line.split()[1]) - recv
-                sent = float(line.split()[9]) - sent
-
-        return (recv/BYTE_PER_GB, sent/BYTE_PER_GB)
-
-    eth = [parse(log) for log in log_files]
-    eth = zip(*eth)
-    return (sum(eth[0]), sum(eth[1]))
-
-
-def check_files(log_prefix, machines):
-    """Ensures all log files are present.
-
-    Arguments:
-    log_prefix -- the prefix of one experiment run's log files (str)
-    machines -- number of machines tested (int)
-
-    Returns:
-    A tuple of a boolean and a string. The booleand is False if there
-    is a critical missing log, and True otherwise. The string gives the
-    source of the error, or a warning for missing CPU/net logs.
-    """
-    
-    logname = os.path.basename(log_prefix)
-
-    if len(glob.glob(log_prefix + '_time.txt')) == 0:
-        return (False, "\n  ERROR: " + logname + "_time.txt missing!")
-
-    stats = ['nbt', 'mem', 'cpu', 'net']
-
-    if do_master:
-        for stat in stats:            
-            if len(glob.glob(log_prefix + '_0_' + stat + '.txt')) == 0:
-                return (False, "\n  ERROR: " + logname + "_0_" + stat + ".txt missing!")
-    else:
-        for stat in stats:            
-            # machines+1, as the master has those log files too
-            if len(glob.glob(log_prefix + '_*_' + stat + '.txt')) < machines+1:
-                return (False, "\n  ERROR: " + logname + "_*_" + stat + ".txt missing!")
-
-    return (True, "")
-
-
 ###############
 # Output data
 ###############
@@ -281,12 +77,12 @@ def single_iteration(log):
 
     log_prefix = log[:-len('_time.txt')]
 
-    is_ok, err_str = check_files(log_prefix, int(machines))
+    is_ok, err_str = check_files(log_prefix, int(machines), do_master)
 
     if is_ok:
         time_run, time_io = time_parser(log_prefix, system, alg)
-        mem_min, mem_avg, mem_max = mem_parser(log_prefix, int(machines))
-        eth_recv, eth_sent = net_parser(log_prefix, int(machines))
+        mem_min, mem_avg, mem_max = mem_parser(log_prefix, int(machines), do_master)
+        eth_recv, eth_sent = net_parser(log_prefix, int(machines), do_master)
          
         stats = (time_run+time_io, time_io, time_run, mem_min, mem_avg, mem_max, eth_recv, eth_sent)
         separator = "------------+------------+------------+--------------------------------+---------------------------"
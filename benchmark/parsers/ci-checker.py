@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""Checks if the most recently finished experiment has enough runs.
+
+An experiment has enough runs once the relative 95% confidence interval
+of both its computation and setup times are within a target, or once
+it has failed repeatedly. The exit status is 0 if no more runs are
+needed and 1 otherwise, so that the benchall.sh scripts can do
+"... && break" after each run.
+"""
+
+import os, sys, glob
+import argparse, math
+
+from logparsers import *
+
+###############
+# Parse args
+###############
+def check_system(system):
+    try:
+        s = int(system)
+        if (s < 0) or (s >= len(SYSTEMS)):
+            raise argparse.ArgumentTypeError('Invalid system')
+        return s
+    except:
+        raise argparse.ArgumentTypeError('Invalid system')
+
+def check_runs(runs):
+    try:
+        r = int(runs)
+        if r < 2:
+            raise argparse.ArgumentTypeError('Invalid run count')
+        return r
+    except:
+        raise argparse.ArgumentTypeError('Invalid run count')
+
+parser = argparse.ArgumentParser(description='Checks if the most recent experiment in a log folder needs more runs.')
+parser.add_argument('system', type=check_system,
+                    help='system: 0 for Giraph, 1 for GPS, 2 for Mizan, 3 for GraphLab')
+parser.add_argument('logdir', type=str,
+                    help='folder containing the experiment logs (e.g. ./logs/)')
+parser.add_argument('--since', type=str, default='',
+                    help='ignore runs with timestamps before this (format: YYYYmmdd-HHMMSS), e.g. the start of a campaign')
+parser.add_argument('--min-runs', type=check_runs, dest='min_runs', default=3,
+                    help='minimum number of successful runs before the CI is checked (>= 2), default=3')
+parser.add_argument('--target-ci', type=float, dest='target_ci', default=0.05,
+                    help='relative CI (CI/mean) at which to stop, default=0.05; 0 disables early stopping')
+
+system = SYSTEMS[parser.parse_args().system]
+logdir = parser.parse_args().logdir
+since = parser.parse_args().since
+min_runs = parser.parse_args().min_runs
+target_ci = parser.parse_args().target_ci
+
+
+###############
+# Helpers
+###############
+def run_prefixes(pattern):
+    """Finds all runs that match a log name pattern.
+
+    Arguments:
+    pattern -- glob pattern for run prefixes, without the _0_mem.txt suffix (str)
+
+    Returns:
+    List of run prefixes with timestamps >= since, oldest first.
+    """
+
+    # bench-init creates the master's mem log before the run starts,
+    # so this also picks up runs whose time log is missing
+    prefixes = [f[:-len('_0_mem.txt')] for f in glob.glob(pattern + '_0_mem.txt')]
+    prefixes = [p for p in prefixes if p.split('_')[-1] >= since]
+    return sorted(prefixes, key=lambda p: p.split('_')[-1])
+
+
+def rel_ci(vals):
+    """Computes the relative 95% CI of a list of values.
+
+    This uses the same CI as gen-data.py (i.e., std*1.96/sqrt(n)).
+
+    Returns: CI/mean, or 0 if the mean is 0.
+    """
+
+    mean = sum(vals)/len(vals)
+    if mean == 0:
+        return 0.0
+
+    std = math.sqrt(sum((v - mean)**2 for v in vals)/len(vals))
+    return std*(1.96/math.sqrt(len(vals)))/mean
+
+
+###############
+# Main
+###############
+runs = run_prefixes(os.path.join(logdir, '*'))
+
+if len(runs) == 0:
+    sys.exit(1)
+
+# NOTE: the difference between "experiment" and "run" is whether or not
+# the prefix name has a timestamp (see gen-data.py)
+exp_prefix = runs[-1].rsplit('_', 1)[0]
+alg = os.path.basename(exp_prefix).split('_')[0]
+
+times = [time_parser(run, system, alg) for run in run_prefixes(exp_prefix + '_*')]
+ok_times = [t for t in times if sum(t) != 0]
+num_failed = len(times) - len(ok_times)
+
+status = "%s: %i runs (%i failed)" % (os.path.basename(exp_prefix), len(times), num_failed)
+
+# don't bother repeating experiments that fail every time
+if num_failed >= min_runs and len(ok_times) == 0:
+    print(status + ", stopping (failed every run)")
+    sys.exit(0)
+
+if target_ci <= 0 or len(ok_times) < min_runs:
+    sys.exit(1)
+
+run_ci = rel_ci([t[0] for t in ok_times])
+io_ci = rel_ci([t[1] for t in ok_times])
+status += ", comp. time CI %.1f%%, setup time CI %.1f%%" % (run_ci*100, io_ci*100)
+
+if max(run_ci, io_ci) <= target_ci:
+    print(status + ", stopping (target %.1f%%)" % (target_ci*100))
+    sys.exit(0)
+
+print(status)
+sys.exit(1)
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+
+"""Generates synthetic experiment logs, for testing the parsers and plotting scripts.
+
+Logs follow the formats of a real campaign: each run has a _time.txt log in
+the system's own format (as read by time_parser) and _mem.txt, _cpu.txt,
+_net.txt, _nbt.txt, and _clk.txt logs for the master (machine 0) and every
+worker, as produced by bench-init.sh and bench-finish.sh. Each worker's
+clock is off from the master's, and its monitoring starts a little later. Logs are placed in
+<output-dir>/<system>/<machines>/, which mirrors the results/ folder.
+"""
+
+import os, sys, random, datetime
+import argparse, itertools
+
+# do some parallel computing
+from joblib import Parallel, delayed
+
+from logparsers import *
+
+###############
+# Constants
+###############
+ALGS = ('pagerank', 'sssp', 'wcc', 'mst')
+ALG_PR, ALG_SSSP, ALG_WCC, ALG_MST = ALGS
+
+GRAPHS = ('livejournal', 'orkut', 'arabic', 'twitter', 'uk0705')
+
+# number of edges relative to livejournal
+GRAPH_SCALE = {'livejournal': 1.0, 'orkut': 1.7, 'arabic': 9.3, 'twitter': 21.3, 'uk0705': 54.3}
+
+# computation time and network I/O relative to PageRank
+ALG_SCALE = {ALG_PR: 1.0, ALG_SSSP: 0.15, ALG_WCC: 0.3, ALG_MST: 4.0, ALG_PREMIZAN: 0.0}
+
+# experiments run by each system's benchall.sh, as (alg, sysmodes)
+SYS_EXPS = {SYS_GIRAPH: ((ALG_PR, ('0','1')), (ALG_SSSP, ('0','1')), (ALG_WCC, ('0','1')), (ALG_MST, ('0','1'))),
+            SYS_GPS: ((ALG_PR, ('0','1','2')), (ALG_SSSP, ('0','1','2')), (ALG_WCC, ('0','1','2')), (ALG_MST, ('0',))),
+            SYS_MIZAN: ((ALG_PREMIZAN, ('1',)), (ALG_PR, ('0',)), (ALG_SSSP, ('0',)), (ALG_WCC, ('0',))),
+            SYS_GRAPHLAB: ((ALG_PR, ('0','1')), (ALG_SSSP, ('0','1')), (ALG_WCC, ('0',)))}
+
+# simulated failures (see --fail-rate)
+FAILURES = ('no-time-log', 'truncated-time-log', 'missing-worker')
+
+# m1.xlarge has 15GB of memory
+TOTAL_MEM_KB = 15*KB_PER_GB
+
+# same as uw-ec2.py
+EXP_NAMES = {4: 'cloud', 8: 'cld', 16: 'cw', 32: 'cx', 64: 'cy', 128: 'cz'}
+
+
+###############
+# Parse args
+###############
+def check_system(system):
+    try:
+        s = int(system)
+        if (s < 0) or (s >= len(SYSTEMS)):
+            raise argparse.ArgumentTypeError('Invalid system')
+        return s
+    except:
+        raise argparse.ArgumentTypeError('Invalid system')
+
+def check_positive(num):
+    try:
+        n = int(num)
+        if n < 1:
+            raise argparse.ArgumentTypeError('Invalid value')
+        return n
+    except:
+        raise argparse.ArgumentTypeError('Invalid value')
+
+def check_fraction(frac):
+    try:
+        f = float(frac)
+        if (f < 0) or (f > 1):
+            raise argparse.ArgumentTypeError('Invalid fraction')
+        return f
+    except:
+        raise argparse.ArgumentTypeError('Invalid fraction')
+
+parser = argparse.ArgumentParser(description='Generates synthetic experiment logs for all systems.')
+parser.add_argument('outdir', type=str,
+                    help='output folder; logs are placed in <outdir>/<system>/<machines>/')
+parser.add_argument('--systems', type=check_system, nargs='+', default=range(len(SYSTEMS)),
+                    help='systems to generate: 0 for Giraph, 1 for GPS, 2 for Mizan, 3 for GraphLab (default: all)')
+parser.add_argument('--machines', type=check_positive, nargs='+', default=[16, 32, 64, 128],
+                    help='numbers of worker machines, up to 512 (default: 16 32 64 128)')
+parser.add_argument('--algs', type=str, nargs='+', choices=ALGS + (ALG_PREMIZAN,), default=ALGS + (ALG_PREMIZAN,),
+                    help='algorithms to generate (default: all)')
+parser.add_argument('--graphs', type=str, nargs='+', choices=GRAPHS, default=GRAPHS,
+                    help='graphs to generate (default: all)')
+parser.add_argument('--runs', type=check_positive, default=5,
+                    help='runs per experiment, default=5')
+parser.add_argument('--duration', type=check_positive, default=60,
+                    help='computation time (sec) of PageRank on livejournal with 16 machines; '
+                         'other experiments scale from this, default=60')
+parser.add_argument('--noise', type=check_fraction, default=0.05,
+                    help='relative std of times and usages between runs and machines, default=0.05')
+parser.add_argument('--stragglers', type=int, default=0,
+                    help='number of workers that always have 50%% more load than the others, default=0')
+parser.add_argument('--fail-rate', type=check_fraction, dest='fail_rate', default=0.0,
+                    help='fraction of runs with missing or truncated logs, default=0')
+parser.add_argument('--seed', type=int, default=0,
+                    help='random seed, default=0')
+parser.add_argument('--cores', type=check_positive, dest='n_cores', default=4,
+                    help='number of cores to use (> 0), default=4')
+
+args = parser.parse_args()
+
+if max(args.machines) > 512:
+    parser.error('at most 512 machines are supported')
+
+
+###############
+# Run models
+###############
+def graph_file(system, alg, graph):
+    """Gets the input file name used by a system's scripts (see benchall.sh)."""
+
+    if system == SYS_GRAPHLAB:
+        return graph + '-adj-split'
+    elif system == SYS_MIZAN:
+        return graph + ('-mst.txt' if alg == ALG_MST else '.txt')
+    else:
+        return graph + ('-mst-adj.txt' if alg == ALG_MST else '-adj.txt')
+
+
+def run_times(alg, graph, machines, rng):
+    """Picks the setup and computation times (sec) of one run.
+
+    Returns: tuple (setup time, computation time).
+    """
+
+    size = GRAPH_SCALE[graph]
+    noise = rng.lognormvariate(0, args.noise)
+
+    if alg == ALG_PREMIZAN:
+        return (max(1.0, args.duration*(0.5 + 0.4*size*(16.0/machines)**0.5)*noise), 0.0)
+
+    io = args.duration*(0.2 + 0.05*size*(16.0/machines)**0.5)*rng.lognormvariate(0, args.noise)
+    run = args.duration*(0.8 + ALG_SCALE[alg]*size*(16.0/machines)**0.7)*noise
+    return (max(1.0, io), max(1.0, run))
+
+
+def worker_skew(machines, rng):
+    """Picks per-machine load multipliers (CPU, memory, network) for one run.
+
+    Stragglers are always the same (lowest numbered) workers, so that
+    they are persistent across runs.
+
+    Returns: list of multipliers, indexed by machine id (0 is the master).
+    """
+
+    skew = [1.0] + [rng.lognormvariate(0, args.noise) for i in range(machines)]
+    for i in range(1, min(args.stragglers, machines) + 1):
+        skew[i] *= 1.5
+    return skew
+
+
+###############
+# Log formats
+###############
+def sar_time(t):
+    """Formats a datetime like sar does (e.g., 01:30:50 PM)."""
+    return t.strftime('%I:%M:%S %p')
+
+
+def time_log(system, alg, machines, start, io, run, truncated, rng):
+    """Generates a _time.txt log in the format of the system's output.
+
+    Arguments:
+    system -- the system (str)
+    alg -- the algorithm (str)
+    machines -- number of worker machines (int)
+    start -- start time of the run (datetime)
+    io -- setup time (float)
+    run -- computation time (float)
+    truncated -- True to drop the final timing lines, as if the run died (bool)
+    rng -- random number generator (random.Random)
+
+    Returns: contents of the log (str).
+    """
+
+    lines = []
+
+    if system == SYS_GIRAPH:
+        stamp = lambda sec: (start + datetime.timedelta(seconds=sec)).strftime('%y/%m/%d %H:%M:%S')
+        job = 'job_%s_%04i' % (start.strftime('%Y%m%d%H%M'), rng.randint(1, 9999))
+
+        lines.append('%s INFO mapred.JobClient: Running job: %s' % (stamp(0), job))
+        for pct in range(0, 101, 25):
+            lines.append('%s INFO mapred.JobClient:  map %i%% reduce 0%%' % (stamp((io + run)*pct/100.0), pct))
+        if truncated:
+            return '\n'.join(lines) + '\n'
+
+        # io is split into setup, input superstep, and shutdown
+        setup, shutdown = io*0.1, io*0.05
+        supersteps = 30 if alg == ALG_PR else rng.randint(5, 60)
+
+        lines.append('%s INFO mapred.JobClient: Job complete: %s' % (stamp(io + run), job))
+        lines.append('%s INFO mapred.JobClient: Counters: %i' % (stamp(io + run), supersteps + 20))
+        lines.append('%s INFO mapred.JobClient:   Giraph Timers' % stamp(io + run))
+        lines.append('%s INFO mapred.JobClient:     Input superstep (milliseconds)=%i'
+                     % (stamp(io + run), (io - setup - shutdown)*MS_PER_SEC))
+        lines += ['%s INFO mapred.JobClient:     Superstep %i (milliseconds)=%i'
+                  % (stamp(io + run), i, run*MS_PER_SEC/supersteps) for i in range(supersteps)]
+        lines.append('%s INFO mapred.JobClient:     Setup (milliseconds)=%i' % (stamp(io + run), setup*MS_PER_SEC))
+        lines.append('%s INFO mapred.JobClient:     Shutdown (milliseconds)=%i' % (stamp(io + run), shutdown*MS_PER_SEC))
+        lines.append('%s INFO mapred.JobClient:     Total (milliseconds)=%i' % (stamp(io + run), (io + run)*MS_PER_SEC))
+
+    elif system == SYS_GPS:
+        epoch = (start - datetime.datetime(1970, 1, 1)).total_seconds()*MS_PER_SEC
+        lines.append('SYSTEM_START_TIME %i' % epoch)
+        lines.append('START_TIME %i' % (epoch + io*MS_PER_SEC))
+        lines += ['%i-LATEST_STATUS_TIMESTAMP %i' % (w, epoch + (io + run*rng.uniform(0.95, 1.0))*MS_PER_SEC)
+                  for w in range(machines*2)]
+        if not truncated:
+            lines.append('-1-LATEST_STATUS_TIMESTAMP %i' % (epoch + (io + run)*MS_PER_SEC))
+
+    elif system == SYS_GRAPHLAB:
+        lines.append('Loading graph in format: adjgps')
+        lines.append('INFO:     distributed_graph.hpp(finalize:702): Distributed graph: enter finalize')
+        if truncated:
+            return '\n'.join(lines) + '\n'
+        lines.append('Finished Running engine in %g seconds.' % run)
+        lines.append('TOTAL TIME (sec): %g' % (io + run))
+
+    elif system == SYS_MIZAN:
+        if alg == ALG_PREMIZAN:
+            lines.append('Warning: $HADOOP_HOME is deprecated.')
+            if truncated:
+                return '\n'.join(lines) + '\n'
+            lines.append('')
+            lines.append('TOTAL TIME (ns): %i - 0' % (io*1e9))
+            lines.append('TOTAL TIME (sec): %.9f' % io)
+        else:
+            # Mizan only reports whole seconds
+            lines.append('-----TIME: Loading graph...')
+            if truncated:
+                return '\n'.join(lines) + '\n'
+            lines.append('-----TIME: Total Running Time without IO = %i' % run)
+            lines.append('-----TIME: Total Running Time = %i' % round(io + run))
+
+    return '\n'.join(lines) + '\n'
+
+
+def machine_logs(hostname, start, lag, io, run, mem_gb, net_gb, load, rng):
+    """Generates the mem, cpu, net, and nbt logs of one machine.
+
+    Arguments:
+    hostname -- name of the machine (str)
+    start -- start time of the machine's monitoring, by its clock (datetime)
+    lag -- seconds from the start of monitoring to the start of the run (float)
+    io -- setup time (float)
+    run -- computation time (float)
+    mem_gb -- peak memory usage (float)
+    net_gb -- total network data received (float)
+    load -- CPU load relative to a typical worker (float)
+    rng -- random number generator (random.Random)
+
+    Returns: dictionary of log type ('mem', 'cpu', 'net', 'nbt') to contents (str).
+    """
+
+    # monitoring starts before and stops after the run
+    secs = int(lag + io + run) + 2
+    times = [sar_time(start + datetime.timedelta(seconds=s)) for s in range(secs + 1)]
+
+    ## memory: ramps up during setup, then stays around the peak
+    base_kb = rng.uniform(0.3, 0.5)*KB_PER_GB
+    peak_kb = max(base_kb, mem_gb*KB_PER_GB)
+    mem = []
+    for s in range(secs):
+        if s <= lag + io:
+            used = base_kb + (peak_kb - base_kb)*max(0.0, s - lag)/max(io, 1.0)
+        else:
+            used = peak_kb*rng.uniform(0.97, 1.0)
+        mem.append('-/+ buffers/cache:   %9i  %9i' % (used, TOTAL_MEM_KB - used))
+
+    ## cpu: sar header + one line per second
+    busy = 60.0*load
+    cpu = ['Linux 3.2.0-58-virtual (%s) \t%s \t_x86_64_\t(4 CPU)' % (hostname, start.strftime('%m/%d/%Y')), '',
+           '%s     CPU     %%user     %%nice   %%system   %%iowait    %%steal     %%idle' % times[0]]
+    for s in range(1, secs + 1):
+        user = min(99.0, busy*rng.uniform(0.5, 1.5)) if s > 1 else 0.5
+        system, iowait, steal = user*0.1, rng.uniform(0, 2), rng.uniform(0, 0.5)
+        cpu.append('%s     all  %8.2f  %8.2f  %8.2f  %8.2f  %8.2f  %8.2f'
+                   % (times[s], user, 0.0, system, iowait, steal, max(0.0, 100 - user - system - iowait - steal)))
+
+    ## net: sar -n DEV, grep'd for lo and eth0 (header is kept if the hostname matches!)
+    rx_kbs = [0.0]*(secs + 1)
+    per_sec = net_gb*KB_PER_GB/max(run, 1.0)
+    for s in range(int(lag + io) + 1, min(secs, int(lag + io + run) + 1)):
+        rx_kbs[s] = per_sec*rng.uniform(0.8, 1.2)
+
+    net = []
+    if 'lo' in hostname or 'eth0' in hostname:
+        net.append(cpu[0])
+    for s in range(1, secs + 1):
+        net.append('%s        lo      %.2f      %.2f      %.2f      %.2f      0.00      0.00      0.00'
+                   % (times[s], 2.0, 2.0, 0.3, 0.3))
+        net.append('%s      eth0  %8.2f  %8.2f  %8.2f  %8.2f      0.00      0.00      0.00'
+                   % (times[s], rx_kbs[s]/1.4, rx_kbs[s]/1.4, rx_kbs[s], rx_kbs[s]))
+
+    ## nbt: /proc/net/dev before and after the run
+    def proc_net_dev(rx, tx):
+        return ('Inter-|   Receive                                                |  Transmit\n'
+                ' face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n'
+                '    lo: %7i %7i    0    0    0     0          0         0 %8i %7i    0    0    0     0       0          0\n'
+                '  eth0: %7i %7i    0    0    0     0          0         0 %8i %7i    0    0    0     0       0          0\n'
+                % (12345678, 123456, 12345678, 123456, rx, rx/1400, tx, tx/1400))
+
+    rx0, tx0 = rng.randint(10**8, 10**10), rng.randint(10**8, 10**10)
+    rx_bytes = int(sum(rx_kbs)*BYTE_PER_GB/KB_PER_GB)
+    nbt = proc_net_dev(rx0, tx0) + proc_net_dev(rx0 + rx_bytes, tx0 + rx_bytes)
+
+    return {'mem': '\n'.join(mem) + '\n',
+            'cpu': '\n'.join(cpu) + '\n',
+            'net': '\n'.join(net) + '\n',
+            'nbt': nbt}
+
+
+###############
+# Output logs
+###############
+def single_run(system, alg, graph, machines, mode, start, io, run, failure, seed):
+    """Writes all log files for one run of an experiment.
+
+    Returns: number of files written (int).
+    """
+
+    rng = random.Random(seed)
+
+    outdir = os.path.join(args.outdir, system, str(machines))
+    logname = '_'.join((alg, graph_file(system, alg, graph), str(machines), mode, start.strftime('%Y%m%d-%H%M%S')))
+    prefix = os.path.join(outdir, logname)
+    cluster = EXP_NAMES.get(machines, 'c%ix' % machines)
+
+    num_files = 0
+
+    if failure != 'no-time-log':
+        with open(prefix + '_time.txt', 'w') as f:
+            f.write(time_log(system, alg, machines, start, io, run, failure == 'truncated-time-log', rng))
+        num_files += 1
+
+    size = GRAPH_SCALE[graph]
+    skew = worker_skew(machines, rng)
+
+    # workers' peak memory and total network I/O (see data_mem.py and data_net.py)
+    mem_gb = 1.5 + 1.3*size**0.6*(16.0/machines)**0.3
+    net_gb = 2.0*size*max(ALG_SCALE[alg], 0.1)*16.0/machines
+
+    epoch = lambda t: (t - datetime.datetime(1970, 1, 1)).total_seconds()
+
+    # the last worker is the one that goes missing
+    for i in range(machines + (0 if failure == 'missing-worker' else 1)):
+        # monitoring starts up to 1s before the run (later on workers, via ssh),
+        # and workers' clocks are off from the master's (see bench-init.sh)
+        lag = 1.0 if i == 0 else rng.uniform(0.2, 0.9)
+        offset = 0.0 if i == 0 else rng.gauss(0, 1.0)
+        mon_start = start + datetime.timedelta(seconds=offset - lag)
+
+        if i == 0:
+            logs = machine_logs(cluster + '0', mon_start, lag, io, run, 0.3, 0.001, 0.1, rng)
+            logs['clk'] = 'start %.6f\noffset %.6f rtt %.6f\nrun %.6f\n' % (epoch(mon_start), 0.0, 0.0001, epoch(start))
+        else:
+            logs = machine_logs(cluster + str(i), mon_start, lag, io, run,
+                                min(14.0, mem_gb*skew[i]), net_gb*skew[i], skew[i], rng)
+            logs['clk'] = 'start %.6f\noffset %.6f rtt %.6f\n' % (epoch(mon_start), offset, rng.uniform(0.0002, 0.002))
+
+        for stat, contents in logs.items():
+            with open('%s_%i_%s.txt' % (prefix, i, stat), 'w') as f:
+                f.write(contents)
+            num_files += 1
+
+    return num_files
+
+
+# build list of runs serially, so timestamps and seeds don't depend on # of cores
+rng = random.Random(args.seed)
+runs = []
+
+for system in [SYSTEMS[s] for s in args.systems]:
+    for machines in args.machines:
+        start = datetime.datetime(2014, 1, 1)
+
+        for (alg, modes), graph in itertools.product(SYS_EXPS[system], args.graphs):
+            if not alg in args.algs:
+                continue
+
+            for mode, i in itertools.product(modes, range(args.runs)):
+                io, run = run_times(alg, graph, machines, rng)
+                failure = rng.choice(FAILURES) if rng.random() < args.fail_rate else None
+
+                runs.append((system, alg, graph, machines, mode, start, io, run, failure, rng.randint(0, 2**31)))
+                start += datetime.timedelta(seconds=int(io + run) + 60)
+
+        outdir = os.path.join(args.outdir, system, str(machines))
+        if not os.path.exists(outdir):
+            os.makedirs(outdir)
+
+out = Parallel(n_jobs=args.n_cores)(delayed(single_run)(*r) for r in runs)
+
+print("Generated %i runs (%i files) in %s" % (len(runs), sum(out), args.outdir))
@@ -39,6 +39,11 @@ for file in "${FILES[@]}"; do
     machines=$(echo "$logname" | sed 's/_/ /g' | awk '{print $3}')
 
     for (( i = 0; i <= ${machines}; i++ )); do
+        # a log summary replaces all of a worker's logs (see bench-finish.sh)
+        if [[ -f "${logname}_${i}_sum.bin" ]]; then
+            continue
+        fi
+
         if [[ ! -f "${logname}_${i}_mem.txt" ]]; then
             err="$err  ERROR: ${logname}_${i}_mem.txt missing!\n"
             iserr=1
@@ -14,9 +14,15 @@
 import os, sys
 import argparse
 import time
+import json
+import random
+import hashlib
+import socket
 import boto.ec2
 import subprocess
+import threading
 import xml.dom.minidom
+from multiprocessing.pool import ThreadPool
 
 
 ####################
@@ -49,6 +55,37 @@ DEFAULT_AZ = 'us-west-2c'
 # for non-Ubuntu images (e.g., Fedora), this would be ec2-user
 EC2_USER = 'ubuntu'
 EC2_DRY_RUN_SUCCESS = 412   # status code (see AWS API)
+EC2_MAX_FILTER_VALUES = 200 # max values per describe filter (see AWS API)
+
+# cached cluster inventories are reused for this many seconds
+INVENTORY_TTL = 60
+
+# polling intervals grow from POLL_MIN to POLL_MAX seconds (with jitter)
+POLL_MIN = 1
+POLL_MAX = 10
+POLL_BACKOFF = 1.5
+POLL_TIMEOUT = 120  # for things that should exist almost immediately
+SSH_WAIT_TIMEOUT = 900  # for instances to finish booting (see wait_for_ssh)
+
+# SSH reachability probes (see wait_for_ssh)
+SSH_PORT = 22
+SSH_TIMEOUT = 3
+SSH_PROBES = 32     # number of hosts probed in parallel
+
+# SSH commands ran by init (see run_ssh_all)
+SSH_OPTS = ['-o', 'UserKnownHostsFile=/dev/null', '-o', 'StrictHostKeyChecking=no',
+            '-o', 'LogLevel=ERROR', '-o', 'ConnectTimeout=%i' % SSH_TIMEOUT]
+SSH_WORKERS = 32    # number of hosts initialized in parallel
+SSH_RETRIES = 2     # retries per host
+SSH_CMD_TIMEOUT = 60
+
+# log tarballs fetched by get-logs (see get_logs)
+LOG_SYSTEMS = ('giraph', 'gps', 'graphlab', 'mizan')
+LOG_MANIFEST = '.fetched'   # per results folder, lists fetched tarballs
+FETCH_STREAMS = 4           # number of tarballs downloaded in parallel
+FETCH_RETRIES = 3           # retries per tarball, resuming partial downloads
+FETCH_SSH_OPTS = SSH_OPTS + ['-o', 'ServerAliveInterval=15', '-o', 'ServerAliveCountMax=4']  # drop stalled downloads
+INGEST = SCRIPT_DIR + '../results/plots/ingest.py'
 
 ####################
 # Helper functions
@@ -81,7 +118,7 @@ def get_args():
                              "init      - initialize a cluster\n"
                              "create-sg - create a new security group\n"
                              "create-kp - create a new EC2 key pair (saved in " + SCRIPT_DIR + ")\n"
-                             "get-logs  - grab ~/benchmark/<system>/logs/*.tar.gz to\n"
+                             "get-logs  - grab new ~/benchmark/<system>/logs/*.tar.gz to\n"
                              "            " + SCRIPT_DIR + "../results/<system>/<num-slaves>/\n"
                              "            for all systems (giraph, gps, graphlab, mizan)")
 
@@ -126,6 +163,41 @@ def get_args():
 
     parser.add_argument('--persist-master-vol', action='store_true', default=False,
                         help="Do not delete the master's EBS volume on termination")
+    def check_count(count):
+        try:
+            c = int(count)
+            if c < 0:
+                raise argparse.ArgumentTypeError('Invalid count')
+            return c
+        except:
+            raise argparse.ArgumentTypeError('Invalid count')
+
+    def check_positive(count):
+        try:
+            c = int(count)
+            if c < 1:
+                raise argparse.ArgumentTypeError('Invalid count')
+            return c
+        except:
+            raise argparse.ArgumentTypeError('Invalid count')
+
+    parser.add_argument('--hosts', metavar="NAME", nargs='+', default=None,
+                        help="R|Only update these machines (e.g., cw3 cw7), used by 'init'\n"
+                             "to retry failed machines (default: all machines)")
+    parser.add_argument('--ssh-workers', metavar="N", type=check_positive, default=SSH_WORKERS,
+                        help="Number of machines to SSH to in parallel (default: %i)" % SSH_WORKERS)
+    parser.add_argument('--ssh-retries', metavar="N", type=check_count, default=SSH_RETRIES,
+                        help="Number of retries per machine for failed SSH commands (default: %i)" % SSH_RETRIES)
+    parser.add_argument('--ssh-timeout', metavar="SECS", type=check_positive, default=SSH_CMD_TIMEOUT,
+                        help="Timeout for each SSH command, in seconds (default: %i)" % SSH_CMD_TIMEOUT)
+    parser.add_argument('--streams', metavar="N", type=check_positive, default=FETCH_STREAMS,
+                        help="Number of tarballs 'get-logs' downloads in parallel (default: %i)" % FETCH_STREAMS)
+    parser.add_argument('--ingest', action='store_true', default=False,
+                        help="R|Also extract and parse tarballs into the results store as\n"
+                             "they are fetched by 'get-logs' (see %s)" % os.path.relpath(INGEST, SCRIPT_DIR))
+    parser.add_argument('--refresh', action='store_true', default=False,
+                        help="R|Ignore the cached cluster inventory, used by 'connect'\n"
+                             "and 'get-logs' (default: reuse it for %is)" % INVENTORY_TTL)
 
     args = parser.parse_args()
 
@@ -172,11 +244,28 @@ def exists(instance):
     return not (instance.state in  ['shutting-down', 'terminated'])
 
 
+def poll_delays():
+    '''Generate polling intervals with exponential backoff and jitter.
+
+    Intervals start at POLL_MIN seconds and grow by POLL_BACKOFF up to POLL_MAX
+    seconds. Each is randomly shortened by up to half, so many clients (or
+    many polls of the same API) do not end up in lockstep.
+
+    Returns:
+    Generator of intervals, in seconds (float).
+    '''
+
+    delay = POLL_MIN
+    while True:
+        yield random.uniform(delay/2.0, delay)
+        delay = min(POLL_MAX, delay*POLL_BACKOFF)
+
+
 def wait_for_status_exit(conn, instance_ids, state, message):
     '''Wait for instances to exit a particular state.
 
-    Prints 'message' together with a timer for every 5 seconds waited.
-    Uses 5 second polling intervals.
+    Prints 'message' together with a timer of the time waited.
+    Uses polling intervals with backoff (see poll_delays()).
 
     Arguments:
     conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
@@ -185,21 +274,228 @@ def wait_for_status_exit(conn, instance_ids, state, message):
     message -- message to print out (string)
     '''
 
-    sec = 0
-    while True:
-        sys.stdout.write("\r%s(waited %is)" % (message, sec))
+    start = time.time()
+    for delay in poll_delays():
+        sys.stdout.write("\r%s(waited %is)" % (message, time.time() - start))
         sys.stdout.flush()
 
         remaining_instances = conn.get_only_instances(instance_ids, filters={'instance-state-name': state})
         if len(remaining_instances) == 0:
             break
 
-        time.sleep(5)
-        sec += 5
+        time.sleep(delay)
 
     print("\nDone.")
 
 
+def probe_ssh(ip):
+    '''Check if a host's SSH server is up, i.e., if it sends its banner.
+
+    Arguments:
+    ip -- IP address or hostname (string)
+
+    Returns:
+    True if the SSH server is reachable, False otherwise (including
+    when there is no IP, as None would resolve to localhost).
+    '''
+
+    if ip is None:
+        return False
+
+    try:
+        sock = socket.create_connection((ip, SSH_PORT), SSH_TIMEOUT)
+        try:
+            sock.settimeout(SSH_TIMEOUT)
+            return sock.recv(4) == 'SSH-'
+        finally:
+            sock.close()
+    except (socket.error, socket.timeout):
+        return False
+
+
+def wait_for_ssh(ips, message):
+    '''Wait for the SSH servers of all hosts to be reachable.
+
+    Instances are 'running' well before they finish booting, so this
+    probes port 22 of all unreachable hosts in parallel (SSH_PROBES at a
+    time), using polling intervals with backoff (see poll_delays()). Gives
+    up after SSH_WAIT_TIMEOUT seconds, so one instance that never boots
+    does not block the others.
+
+    Prints 'message' together with a count of reachable hosts.
+
+    Arguments:
+    ips -- list of public IP addresses, None for instances without one (list)
+    message -- message to print out (string)
+
+    Returns:
+    List of unreachable IP addresses (empty if all are reachable).
+    '''
+
+    pool = ThreadPool(min(SSH_PROBES, max(1, len(ips))))
+    remaining = list(ips)
+
+    start = time.time()
+    try:
+        for delay in poll_delays():
+            sys.stdout.write("\r%s(%i of %i reachable, waited %is)"
+                             % (message, len(ips) - len(remaining), len(ips), time.time() - start))
+            sys.stdout.flush()
+
+            if len(remaining) == 0 or time.time() - start > SSH_WAIT_TIMEOUT:
+                break
+
+            remaining = [ip for ip, up in zip(remaining, pool.map(probe_ssh, remaining)) if not up]
+            if len(remaining) > 0:
+                time.sleep(delay)
+    finally:
+        pool.close()
+
+    if len(remaining) > 0:
+        print("\nWARNING: %i machine(s) still unreachable after %is: %s"
+              % (len(remaining), SSH_WAIT_TIMEOUT, ' '.join(ip or '(no public IP)' for ip in remaining)))
+    else:
+        print("\nDone.")
+
+    return remaining
+
+
+def retry_not_found(func, *args):
+    '''Call an EC2 function until the resources it uses exist.
+
+    Newly created resources (e.g., spot requests) can take a moment to
+    become visible to the API. This retries while EC2 returns a
+    "*.NotFound" error, with backoff (see poll_delays()), for up to
+    POLL_TIMEOUT seconds.
+
+    Arguments:
+    func -- EC2 connection method (function)
+    args -- its arguments
+
+    Returns:
+    func's return value.
+    '''
+
+    start = time.time()
+    for delay in poll_delays():
+        try:
+            return func(*args)
+        except boto.exception.EC2ResponseError as e:
+            if not (e.error_code or '').endswith('NotFound') or time.time() - start > POLL_TIMEOUT:
+                raise
+        time.sleep(delay)
+
+
+def run_ssh(args, ip, cmd):
+    '''Run a command on a host via SSH, with retries and a timeout.
+
+    Each attempt is killed after args.ssh_timeout seconds, and failed
+    attempts are retried args.ssh_retries times (see poll_delays()).
+
+    Arguments:
+    args -- Command-line arguments (argparse.Namespace)
+    ip -- IP address or hostname (string)
+    cmd -- command to run on the host, by its login shell (string)
+
+    Returns:
+    Dictionary with the results of the last attempt:
+    {'ip': ip, 'ok': True/False, 'status': exit-status, 'output': stdout-and-stderr,
+     'attempts': number-of-attempts, 'time': total-secs}
+    '''
+
+    ssh = (['ssh'] + SSH_OPTS + ['-i', args.identity_file, '%s@%s' % (EC2_USER, ip), cmd])
+
+    start = time.time()
+    delays = poll_delays()
+    for attempt in range(1, args.ssh_retries + 2):
+        with open(os.devnull) as devnull:
+            proc = subprocess.Popen(ssh, stdin=devnull, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+            # Python 2's subprocess has no timeouts
+            timer = threading.Timer(args.ssh_timeout, proc.kill)
+            timer.start()
+            try:
+                output = proc.communicate()[0]
+            finally:
+                timer.cancel()
+
+        if proc.returncode < 0:
+            output += "Timed out after %is.\n" % args.ssh_timeout
+
+        if proc.returncode == 0 or attempt > args.ssh_retries:
+            break
+        time.sleep(next(delays))
+
+    return {'ip': ip, 'ok': proc.returncode == 0, 'status': proc.returncode,
+            'output': output, 'attempts': attempt, 'time': time.time() - start}
+
+
+def run_ssh_all(args, cmds, message):
+    '''Run commands on many hosts via SSH in parallel.
+
+    Uses args.ssh_workers threads, each running one host's command at a
+    time (see run_ssh()). Prints 'message' together with the progress.
+
+    Arguments:
+    args -- Command-line arguments (argparse.Namespace)
+    cmds -- list of (name, IP address, command) for each host (list)
+    message -- message to print out (string)
+
+    Returns:
+    Dictionary mapping each host's name to its results from run_ssh().
+    '''
+
+    def run(host):
+        (name, ip, cmd) = host
+        return (name, run_ssh(args, ip, cmd))
+
+    results = {}
+    failed = 0
+
+    sys.stdout.write("%s(0 of %i done)" % (message, len(cmds)))
+    sys.stdout.flush()
+
+    pool = ThreadPool(max(1, min(args.ssh_workers, len(cmds))))
+    try:
+        for (name, result) in pool.imap_unordered(run, cmds):
+            results[name] = result
+            failed += 0 if result['ok'] else 1
+
+            sys.stdout.write("\r%s(%i of %i done%s)"
+                             % (message, len(results), len(cmds), (", %i failed" % failed) if failed else ""))
+            sys.stdout.flush()
+    finally:
+        pool.close()
+
+    print("")
+    return results
+
+
+def get_volumes(conn, instance_ids):
+    '''Get the EBS volumes attached to a list of instances.
+
+    Uses one describe call per EC2_MAX_FILTER_VALUES instances (i.e., a
+    multi-value filter), rather than one call per instance.
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    instance_ids -- list of instance IDs (list)
+
+    Returns:
+    Dictionary mapping each instance ID to a list of its volume IDs:
+    {instance-id: [volume-id, volume-id, ...]}. Lists may be empty.
+    '''
+
+    volumes = dict((iid, []) for iid in instance_ids)
+
+    for i in range(0, len(instance_ids), EC2_MAX_FILTER_VALUES):
+        ids = instance_ids[i:i+EC2_MAX_FILTER_VALUES]
+        for v in conn.get_all_volumes(filters={'attachment.instance-id': ids}):
+            volumes[v.attach_data.instance_id].append(v.id)
+
+    return volumes
+
+
 def launch_instances(conn, args, num_slaves, launch_master):
     '''Create/launch a specific number of properly tagged instances.
 
@@ -336,20 +632,19 @@ def launch_instances(conn, args, num_slaves, launch_master):
 
             return ([],[])
 
-        # tag spot requests
-        time.sleep(5)         # wait for requests to actually exist
+        # tag spot requests (retry until they actually exist)
         sys.stdout.write("  Tagging spot requests... ")
         sys.stdout.flush()
         if launch_master:
-            conn.create_tags(master_req_ids, master_tag)
-        conn.create_tags(slave_req_ids, slave_tag)
+            retry_not_found(conn.create_tags, master_req_ids, master_tag)
+        retry_not_found(conn.create_tags, slave_req_ids, slave_tag)
         print("Done.")
 
         print("  Waiting for spot instances to be granted...")
 
         # wait for all requests to become active/fulfilled
-        sec = 0
-        while True:
+        start = time.time()
+        for delay in poll_delays():
             # get remaining open requests (this is needed to get updated info)
             if launch_master:
                 pending_master_reqs = conn.get_all_spot_instance_requests(master_req_ids, filters={'state': 'open'})
@@ -383,15 +678,14 @@ def launch_instances(conn, args, num_slaves, launch_master):
                 break
 
             elif len(pending_slave_reqs) == 0 and launch_master:
-                sys.stdout.write("\r  Master not granted yet... (waited %is)" % sec)
+                sys.stdout.write("\r  Master not granted yet... (waited %is)" % (time.time() - start))
                 sys.stdout.flush()
             else:
                 sys.stdout.write("\r  %i of %i slaves granted... (waited %is)" %
-                                 (num_slaves - len(pending_slave_reqs), num_slaves, sec))
+                                 (num_slaves - len(pending_slave_reqs), num_slaves, time.time() - start))
                 sys.stdout.flush()
 
-            time.sleep(5)
-            sec += 5
+            time.sleep(delay)
 
         # get instance ids from requests
         # NOTE: must retreive them again to get updated request info
@@ -405,12 +699,12 @@ def launch_instances(conn, args, num_slaves, launch_master):
         slave_instance_ids = [r.instance_id for r in slave_reqs]
 
 
-    ## Tag instances
+    ## Tag instances (retry, as new instances may not be visible yet)
     sys.stdout.write("Tagging instances... ")
     sys.stdout.flush()
     if launch_master:
-        conn.create_tags(master_instance_ids, master_tag)
-    conn.create_tags(slave_instance_ids, slave_tag)
+        retry_not_found(conn.create_tags, master_instance_ids, master_tag)
+    retry_not_found(conn.create_tags, slave_instance_ids, slave_tag)
     print("Done.")
 
     ## Wait for instances to become 'running'
@@ -421,14 +715,11 @@ def launch_instances(conn, args, num_slaves, launch_master):
     sys.stdout.write("Tagging EBS volumes... ")
     sys.stdout.flush()
 
-    if launch_master:
-        conn.create_tags([v.id for mid in master_instance_ids
-                          for v in conn.get_all_volumes(filters={'attachment.instance-id': mid})],
-                         master_tag)
+    volumes = get_volumes(conn, master_instance_ids + slave_instance_ids)
 
-    conn.create_tags([v.id for sid in slave_instance_ids
-                      for v in conn.get_all_volumes(filters={'attachment.instance-id': sid})],
-                     slave_tag)
+    if launch_master:
+        conn.create_tags([vid for mid in master_instance_ids for vid in volumes[mid]], master_tag)
+    conn.create_tags([vid for sid in slave_instance_ids for vid in volumes[sid]], slave_tag)
     print("Done.")
 
     ## Persist master's EBS volume if needed
@@ -436,9 +727,131 @@ def launch_instances(conn, args, num_slaves, launch_master):
         # really bizarre way of setting delete_on_termination to false
         conn.modify_instance_attribute(master_instance_ids[0], 'BlockDeviceMapping', ['/dev/sda1=false'])
 
+    ## Wait for instances to finish booting
+    wait_for_ssh([i.ip_address for i in conn.get_only_instances(master_instance_ids + slave_instance_ids)],
+                 "Waiting for SSH on all machines... ")
+
     return (master_instance_ids, slave_instance_ids)
 
 
+def inventory_file(conn, cluster_name):
+    '''Get the path of a cluster's cached inventory.
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    cluster_name -- Name of the cluster (string)
+
+    Returns:
+    Path of the cache file (string).
+    '''
+
+    return '%s.inventory-%s-%s.json' % (SCRIPT_DIR, conn.region.name, cluster_name)
+
+
+def fetch_inventory(conn, cluster_name):
+    '''Fetch the inventory of a tagged cluster from EC2 and cache it.
+
+    This uses one describe call for all instances and one for all of their
+    EBS volumes, regardless of the number of slaves.
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    cluster_name -- Name of the cluster (string)
+
+    Returns:
+    The cluster's inventory (dict), see get_inventory().
+    '''
+
+    # match only non-terminating/non-terminated instances
+    instances = [i for i in conn.get_only_instances(filters={'tag:cluster': cluster_name}) if exists(i)]
+    volumes = get_volumes(conn, [i.id for i in instances])
+
+    inventory = {'time': time.time(),
+                 'instances': [{'id': i.id,
+                                'state': i.state,
+                                'ip': i.ip_address,
+                                'private_ip': i.private_ip_address,
+                                'launch_time': i.launch_time,
+                                'tags': dict(i.tags),
+                                'volumes': volumes[i.id]} for i in instances]}
+
+    with open(inventory_file(conn, cluster_name), 'w') as f:
+        json.dump(inventory, f)
+
+    return inventory
+
+
+def get_inventory(conn, cluster_name, refresh=False):
+    '''Get the inventory of a tagged cluster, from the local cache if possible.
+
+    The cache is used only if it is less than INVENTORY_TTL seconds old.
+    Actions that change the cluster's instances fetch a fresh inventory
+    (see get_cluster()) or clear the cache (see clear_inventory()).
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    cluster_name -- Name of the cluster (string)
+    refresh -- True to ignore the cache, False otherwise (bool)
+
+    Returns:
+    A dictionary with the time it was fetched at and the cluster's instances:
+    {'time': secs-since-epoch, 'cached': True/False,
+     'instances': [{'id': ..., 'state': ..., 'ip': ..., 'private_ip': ...,
+                    'launch_time': ..., 'tags': {...}, 'volumes': [volume-id, ...]}, ...]}
+    '''
+
+    if not refresh:
+        try:
+            with open(inventory_file(conn, cluster_name)) as f:
+                inventory = json.load(f)
+
+            if 0 <= time.time() - inventory['time'] < INVENTORY_TTL:
+                inventory['cached'] = True
+                return inventory
+        except (IOError, ValueError, KeyError):
+            pass
+
+    inventory = fetch_inventory(conn, cluster_name)
+    inventory['cached'] = False
+    return inventory
+
+
+def clear_inventory(conn, cluster_name):
+    '''Delete the cached inventory of a tagged cluster, if there is one.
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    cluster_name -- Name of the cluster (string)
+    '''
+
+    if os.path.exists(inventory_file(conn, cluster_name)):
+        os.remove(inventory_file(conn, cluster_name))
+
+
+def split_inventory(inventory):
+    '''Split a cluster's inventory into master and slave instances.
+
+    Slaves are ordered by their "name" tag (i.e., cw1, cw2, ..., cw16).
+    Slaves without one (e.g., replacements not yet initialized) come last,
+    in the order they were launched.
+
+    Arguments:
+    inventory -- The cluster's inventory (dict), see get_inventory()
+
+    Returns:
+    Tuple of master and slave instances: ([master, ...], [slave, slave, ...]),
+    where each instance is a dictionary as in the inventory.
+    '''
+
+    def slave_order(instance):
+        suffix = instance['tags'].get('name', '')[len(instance['tags']['cluster']):]
+        return (int(suffix) if suffix.isdigit() else sys.maxint, instance['launch_time'], instance['id'])
+
+    masters = [i for i in inventory['instances'] if i['tags'].get('master') == 'True']
+    slaves = [i for i in inventory['instances'] if i['tags'].get('master') == 'False']
+    return (masters, sorted(slaves, key=slave_order))
+
+
 def get_cluster(conn, cluster_name):
     '''Get all non-terminating/non-terminated EC2 instances for a tagged cluster.
 
@@ -446,6 +859,9 @@ def get_cluster(conn, cluster_name):
     one master, we cannot guarantee the user won't do something manually. So the
     number of returned master instances can be > 1.
 
+    This always fetches a fresh inventory (and caches it), so it is safe to
+    use before changing the cluster.
+
     Arguments:
     conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
     cluster_name -- Name of the cluster (string)
@@ -453,23 +869,55 @@ def get_cluster(conn, cluster_name):
     Returns:
     Tuple of master and slave instance ids: ([master-id, master-id, ...], [slave-id, slave-id, ...]).
     One or both lists may be empty if machines are missing (e.g., ([], [])).
+    Slaves are ordered as in split_inventory().
     '''
 
-    # If instances were launched together, they belong to a single reservation.
-    #
-    # get_all_instances() returns a list of reservations, and each reservation contains a list of instances
-    # get_only_instances() just returns list of instances
-    master_instances = conn.get_only_instances(filters={'tag:cluster': cluster_name, 'tag:master': 'True'})
-    slave_instances = conn.get_only_instances(filters={'tag:cluster': cluster_name, 'tag:master': 'False'})
+    # (no additional error handling---the caller deals with that)
+    (masters, slaves) = split_inventory(fetch_inventory(conn, cluster_name))
+    return ([i['id'] for i in masters], [i['id'] for i in slaves])
 
-    # (example for using res: [i.id for res in slave_res for i in res.instances])
 
-    # match only non-terminating/non-terminated instances
-    # (no additional error handling---the caller deals with that)
-    master_instance_ids = [i.id for i in master_instances if exists(i)]
-    slave_instance_ids = [i.id for i in slave_instances if exists(i)]
+def get_running_master(conn, args):
+    '''Get the master instance of a cluster, waiting for it if it is starting.
 
-    return (master_instance_ids, slave_instance_ids)
+    Uses the cached inventory if possible (see get_inventory()), but
+    double checks with EC2 if the cached master is not running.
+
+    Arguments:
+    conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
+    args -- Command-line arguments (argparse.Namespace)
+
+    Returns:
+    The master instance (dict), as in the inventory, or None if it is not running.
+    '''
+
+    inventory = get_inventory(conn, args.cluster_name, args.refresh)
+    (masters, _) = split_inventory(inventory)
+
+    # cache could be out of date, e.g., if the cluster was started from elsewhere
+    if inventory['cached'] and (len(masters) != 1 or masters[0]['state'] != 'running'):
+        (masters, _) = split_inventory(fetch_inventory(conn, args.cluster_name))
+
+    if len(masters) == 0:
+        print("ERROR: No master machine found!")
+        return None
+    if len(masters) > 1:
+        print("ERROR: Multiple master machines found!")
+        return None
+
+    if masters[0]['state'] == 'pending':
+        wait_for_status_exit(conn, [masters[0]['id']],
+                             'pending', "Waiting for master machine to start... ")
+        (masters, _) = split_inventory(fetch_inventory(conn, args.cluster_name))
+
+        if len(masters) == 1 and masters[0]['state'] == 'running':
+            wait_for_ssh([masters[0]['ip']], "Waiting for SSH on master machine... ")
+
+    if len(masters) != 1 or masters[0]['state'] != 'running':
+        print("ERROR: Master machine is not running!")
+        return None
+
+    return masters[0]
 
 
 ####################
@@ -572,6 +1020,10 @@ def start_cluster(conn, args):
     wait_for_status_exit(conn, master_instance_ids + slave_instance_ids,
                          'pending', "Starting cluster " + args.cluster_name + "... ")
 
+    # public IPs change on every start
+    wait_for_ssh([i.ip_address for i in conn.get_only_instances(master_instance_ids + slave_instance_ids)],
+                 "Waiting for SSH on all machines... ")
+
 
 def stop_cluster(conn, args):
     '''Stop a cluster of tagged instances.
@@ -695,6 +1147,9 @@ def launch_cluster(conn, args):
                 conn.start_instances(master_instance_ids + slave_instance_ids)
                 wait_for_status_exit(conn, master_instance_ids + slave_instance_ids,
                                      'pending', "Starting existing instances... ")
+                wait_for_ssh([i.ip_address for i in conn.get_only_instances(master_instance_ids +
+                                                                            slave_instance_ids)],
+                             "Waiting for SSH on existing machines... ")
             return ret
 
         else:
@@ -735,23 +1190,32 @@ def init_cluster(conn, args):
     ## Assign proper 'name' tags to instances and EBS volumes
     sys.stdout.write("Assigning 'name' tags... ")
     sys.stdout.flush()
-    conn.create_tags(master_instance_ids, {'name': '%s0' % args.cluster_name})
-    conn.create_tags([v.id for mid in master_instance_ids
-                      for v in conn.get_all_volumes(filters={'attachment.instance-id': mid})],
+
+    # get_cluster() just fetched the inventory, so it has the volumes too
+    inventory = get_inventory(conn, args.cluster_name)
+    volumes = dict((i['id'], i['volumes']) for i in inventory['instances'])
+
+    # names differ per instance, so tag each instance together with its volumes
+    conn.create_tags(master_instance_ids + [vid for mid in master_instance_ids for vid in volumes[mid]],
                      {'name': '%s0' % args.cluster_name})
 
-    for i,slave in enumerate(conn.get_only_instances(slave_instance_ids)):
-        slave.add_tag('name', '%s%i' % (args.cluster_name, i+1))
-        conn.create_tags([v.id for v in conn.get_all_volumes(filters={'attachment.instance-id': slave.id})],
-                         {'name': '%s%i' % (args.cluster_name, i+1)})
+    for i,sid in enumerate(slave_instance_ids):
+        conn.create_tags([sid] + volumes[sid], {'name': '%s%i' % (args.cluster_name, i+1)})
     print("Done.")
 
+    # refresh inventory to pick up the new names
+    (masters, slaves) = split_inventory(fetch_inventory(conn, args.cluster_name))
+    master_instance = masters[0]
+
     ## Check that all instances are running
-    for i in conn.get_only_instances(master_instance_ids + slave_instance_ids):
-        if i.state != 'running':
-            print("\nInstance %s not running! Try again once it's running." % i.tags['name'])
+    for i in masters + slaves:
+        if i['state'] != 'running':
+            print("\nInstance %s not running! Try again once it's running." % i['tags']['name'])
             return
 
+    # returns right away if the machines are already up
+    wait_for_ssh([i['ip'] for i in masters + slaves], "Waiting for SSH on all machines... ")
+
     ## Update hostnames and /etc/hosts
     hosts = ("127.0.0.1 localhost\n\n"
              "# The following lines are desirable for IPv6 capable hosts\n"
@@ -762,48 +1226,31 @@ def init_cluster(conn, args):
              "ff02::2 ip6-allrouters\n"
              "ff02::3 ip6-allhosts\n\n")
 
-    master_instance = conn.get_only_instances(master_instance_ids)[0]
-    hosts += "%s %s\n" % (master_instance.private_ip_address,
-                          master_instance.tags['name'])
-    hosts += ''.join(["%s %s\n" % (i.private_ip_address, i.tags['name'])
-                      for i in conn.get_only_instances(slave_instance_ids)])
-
-    # perform multiple SSH commands in the background
-    sys.stdout.write("Updating hostname and /etc/hosts... (0 of %i done)" % (args.num_slaves+1))
-    sys.stdout.flush()
-
-    cmd = ""
-    for i,instance in enumerate(conn.get_only_instances(master_instance_ids + slave_instance_ids)):
-        # build up command (to be ran in bg)
-        # NOTE: subprocess.call(...,shell=True) uses /bin/sh, so escapes in echo are always interpreted
-        cmd += ("ssh -o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no -i \"%s\" %s@%s \""
-                % (args.identity_file, EC2_USER, instance.ip_address))
-        cmd += ("sudo hostname " + instance.tags['name'] + "; "           # update hostname
-                "sudo chown " + EC2_USER + " /etc/hostname /etc/hosts; "  # chown so we can write
-                "echo '" + instance.tags['name'] + "' > /etc/hostname; "  # update /etc/hostname
-                "echo '" + hosts + "' > /etc/hosts; "                     # update /etc/hosts
-                "sudo chown root /etc/hostname /etc/hosts")               # restore to root for security
-
-        cmd += "\" 2>&1 | grep -v 'Warning: Permanently added'"           # suppress specific warnings
-        cmd += " | grep -v 'sudo: unable to resolve host' & "             # suppress hostname-changed warnings
-
-        # Execute command once in a while, so it doesn't become too large.
-        # Also execute remaining commands if this is the last iteration.
-        if (i+1) % 32 == 0 or i == args.num_slaves:
-            cmd += "wait"
-            output = subprocess.check_output(cmd, shell=True)
-            cmd = ""
-
-            if len(output) != 0:
-                print "\n" + output
-                print "Initialization failed!"
-                return
-
-            sys.stdout.write("\rUpdating hostname and /etc/hosts... (%i of %i done)"
-                             % (i+1, args.num_slaves+1))
-            sys.stdout.flush()
+    hosts += ''.join(["%s %s\n" % (i['private_ip'], i['tags']['name']) for i in masters + slaves])
+
+    # run SSH commands on all machines in parallel
+    cmds = [(i['tags']['name'], i['ip'],
+             "sudo hostname " + i['tags']['name'] + "; "                  # update hostname
+             "sudo chown " + EC2_USER + " /etc/hostname /etc/hosts && "   # chown so we can write
+             "echo '" + i['tags']['name'] + "' > /etc/hostname && "       # update /etc/hostname
+             "echo '" + hosts + "' > /etc/hosts; "                        # update /etc/hosts
+             "status=$?; sudo chown root /etc/hostname /etc/hosts; "      # restore to root for security
+             "exit $status")
+            for i in masters + slaves if args.hosts is None or i['tags']['name'] in args.hosts]
+
+    results = run_ssh_all(args, cmds, "Updating hostname and /etc/hosts... ")
+
+    failed = sorted([name for name in results if not results[name]['ok']],
+                    key=lambda name: int(name[len(args.cluster_name):]))
+    if len(failed) > 0:
+        for name in failed:
+            print("\n%s (%s), %i attempt(s):\n%s" % (name, results[name]['ip'],
+                                                      results[name]['attempts'], results[name]['output']))
+        print("Initialization failed for %i of %i machines! Retry them with: --hosts %s"
+              % (len(failed), len(cmds), ' '.join(failed)))
+        return
 
-    print("\nDone.")
+    print("Done.")
 
     ## Generate ~/benchmark/common/get-hosts.sh on master
     sys.stdout.write("Generating get-hosts.sh... ")
@@ -812,21 +1259,16 @@ def init_cluster(conn, args):
     get_hosts = ("#!/bin/bash\n\n"
                  "# Set the prefix name and number of slaves/worker machines.\n#\n"
                  "# NOTE: This file is automatically generated by uw-ec2.py init!\n\n"
-                 "HOSTNAME=\$(hostname)\n"
+                 "HOSTNAME=$(hostname)\n"
                  "CLUSTER_NAME=%s\n"
                  "NUM_MACHINES=%d") % (args.cluster_name, args.num_slaves)
 
-    master_instance = conn.get_only_instances(master_instance_ids)[0]
-
-    cmd = ("ssh -o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no -i \"%s\" %s@%s \""
-            % (args.identity_file, EC2_USER, master_instance.ip_address))
-    cmd += ("echo '" + get_hosts + "' > ~/benchmark/common/get-hosts.sh; "
-            "chmod +x ~/benchmark/common/get-hosts.sh")
-    cmd += "\" 2>&1 | grep -v 'Warning: Permanently added' || true"   # "|| true" is hack to get exit status 0
-    output = subprocess.check_output(cmd, shell=True)
+    result = run_ssh(args, master_instance['ip'],
+                     "echo '" + get_hosts + "' > ~/benchmark/common/get-hosts.sh && "
+                     "chmod +x ~/benchmark/common/get-hosts.sh")
 
-    if len(output) != 0:
-        print "\n" + output
+    if not result['ok']:
+        print "\n" + result['output']
         print "Initialization failed!"
         return
 
@@ -850,82 +1292,346 @@ def ssh_master(conn, args):
     args -- Command-line arguments (argparse.Namespace)
     '''
 
-    (master_instance_ids, slave_instance_ids) = get_cluster(conn, args.cluster_name)
-
-    if len(master_instance_ids) == 0:
-        print("ERROR: No master machine found!")
-        return
-    if len(master_instance_ids) > 1:
-        print("ERROR: Multiple master machines found!")
+    master_instance = get_running_master(conn, args)
+    if master_instance is None:
         return
 
-    master_instance = conn.get_only_instances(master_instance_ids)[0]
+    pub_ip = master_instance['ip']
+    subprocess.call("ssh -o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no -i \"%s\" %s@%s" %
+                    (args.identity_file, EC2_USER, pub_ip), shell=True)
 
-    if master_instance.state == 'pending':
-        wait_for_status_exit(conn, master_instance_ids,
-                             'pending', "Waiting for master machine to start... ")
-        master_instance.update()
 
-    if master_instance.state != 'running':
-        print("ERROR: Master machine is not running!")
-        return
+def md5sum(path):
+    '''Compute the MD5 checksum of a local file.
+
+    Arguments:
+    path -- path to the file (string)
+
+    Returns:
+    Hex digest of the file's contents (string).
+    '''
+
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def read_manifest(results_dir):
+    '''Read the list of tarballs already fetched to a results folder.
+
+    Arguments:
+    results_dir -- local results folder, e.g. ../results/giraph/16/ (string)
+
+    Returns:
+    Dictionary mapping tarball names to their (size, mtime, md5) on the master.
+    '''
+
+    manifest = {}
+    try:
+        with open(results_dir + LOG_MANIFEST) as f:
+            for line in f:
+                (name, size, mtime, md5) = line.split()
+                manifest[name] = (int(size), mtime, md5)
+    except IOError:
+        pass
+    return manifest
+
+
+def write_manifest(results_dir, manifest):
+    '''Write the list of tarballs fetched to a results folder.
+
+    Arguments:
+    results_dir -- local results folder, e.g. ../results/giraph/16/ (string)
+    manifest -- tarball names mapped to (size, mtime, md5) (dict)
+    '''
+
+    with open(results_dir + LOG_MANIFEST + '.tmp', 'w') as f:
+        for name in sorted(manifest):
+            f.write("%s %i %s %s\n" % ((name,) + manifest[name]))
+    os.rename(results_dir + LOG_MANIFEST + '.tmp', results_dir + LOG_MANIFEST)
+
+
+def list_remote_logs(args, ip):
+    '''List the tarballs in each system's log folder on the master.
+
+    Arguments:
+    args -- Command-line arguments (argparse.Namespace)
+    ip -- master's IP address (string)
+
+    Returns:
+    List of (system, name, size, mtime) of each tarball, or None on failure.
+    '''
+
+    result = run_ssh(args, ip, "cd ~/benchmark && find " + ' '.join(s + '/logs' for s in LOG_SYSTEMS) +
+                     " -maxdepth 1 -name '*.tar.gz' -printf '%p %s %T@\\n' 2>/dev/null; true")
+    if not result['ok']:
+        print(result['output'])
+        return None
+
+    logs = []
+    for line in result['output'].splitlines():
+        (path, size, mtime) = line.split()
+        logs.append((path.split('/')[0], path.split('/')[-1], int(size), mtime))
+    return logs
 
-    pub_ip = master_instance.ip_address
-    subprocess.call("ssh -o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no -i \"%s\" %s@%s" %
-                    (args.identity_file, EC2_USER, pub_ip), shell=True)
+
+def remote_checksums(args, ip, paths):
+    '''Compute the MD5 checksums of files on the master.
+
+    Arguments:
+    args -- Command-line arguments (argparse.Namespace)
+    ip -- master's IP address (string)
+    paths -- paths relative to ~/benchmark/ (list)
+
+    Returns:
+    Dictionary mapping paths to their checksums, or None on failure.
+    '''
+
+    md5s = {}
+    # (batched, so the command line doesn't get too long)
+    for i in range(0, len(paths), 256):
+        result = run_ssh(args, ip, "cd ~/benchmark && md5sum " + ' '.join(paths[i:i+256]))
+        if not result['ok']:
+            print(result['output'])
+            return None
+
+        for line in result['output'].splitlines():
+            (md5, path) = line.split()
+            md5s[path] = md5
+    return md5s
+
+
+def fetch_log(args, ip, path, local, size, md5):
+    '''Download a file from the master, resuming partial downloads.
+
+    The file is downloaded to <local>.part, which is continued from where
+    it stopped (by later attempts or runs) and renamed to <local> only once
+    its checksum is verified. Corrupt downloads are restarted from scratch.
+
+    Arguments:
+    args -- Command-line arguments (argparse.Namespace)
+    ip -- master's IP address (string)
+    path -- path relative to ~/benchmark/ (string)
+    local -- local path to save to (string)
+    size -- file's size on the master, in bytes (int)
+    md5 -- file's checksum on the master (string)
+
+    Returns:
+    Tuple (True if the download succeeded, error message or None).
+    '''
+
+    part = local + '.part'
+    delays = poll_delays()
+    error = None
+
+    for attempt in range(FETCH_RETRIES + 1):
+        if attempt > 0:
+            time.sleep(next(delays))
+
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if offset > size:
+            os.remove(part)
+            offset = 0
+
+        if offset < size:
+            # (with keepalives, so a stalled connection fails and is resumed)
+            ssh = (['ssh'] + FETCH_SSH_OPTS + ['-i', args.identity_file, '%s@%s' % (EC2_USER, ip),
+                                               "tail -c +%i ~/benchmark/%s" % (offset + 1, path)])
+            with open(part, 'ab') as f, open(os.devnull) as devnull:
+                proc = subprocess.Popen(ssh, stdin=devnull, stdout=f, stderr=subprocess.PIPE)
+                error = proc.communicate()[1]
+
+            if proc.returncode != 0:
+                continue
+
+        if os.path.getsize(part) == size and md5sum(part) == md5:
+            os.rename(part, local)
+            return (True, None)
+
+        os.remove(part)
+        error = "Checksum mismatch, download restarted."
+
+    return (False, error)
+
+
+def start_ingest():
+    '''Start ingesting tarballs into the results store, in the background.
+
+    Tarballs are handed to INGEST (one path per line on its stdin) with
+    feed_ingest(), which parses each one while later ones are downloaded.
+
+    Returns:
+    Tuple (ingest process, list its output is collected in, output reader thread).
+    '''
+
+    proc = subprocess.Popen([INGEST], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = []
+
+    # drain output as it comes, so the process never blocks on a full pipe
+    reader = threading.Thread(target=lambda: output.extend(iter(proc.stdout.readline, '')))
+    reader.daemon = True
+    reader.start()
+
+    return (proc, output, reader)
+
+
+def feed_ingest(ingest, tarball):
+    '''Queue a tarball for ingestion.
+
+    Arguments:
+    ingest -- ingestion started by start_ingest() (tuple)
+    tarball -- path to the tarball (string)
+    '''
+
+    ingest[0].stdin.write(tarball + '\n')
+    ingest[0].stdin.flush()
+
+
+def finish_ingest(ingest):
+    '''Wait for all queued tarballs to be ingested and print the results.
+
+    Arguments:
+    ingest -- ingestion started by start_ingest() (tuple)
+    '''
+
+    (proc, output, reader) = ingest
+
+    sys.stdout.write("Waiting for ingestion to finish... ")
+    sys.stdout.flush()
+    proc.stdin.close()
+    proc.wait()
+    reader.join()
+    print("Done.")
+
+    print(''.join(output).rstrip())
+    if proc.returncode != 0:
+        print("Ingestion failed for some tarballs! Run get-logs --ingest again to retry them.")
+    else:
+        print("Ingestion complete!")
 
 
 def get_logs(conn, args):
-    '''Grab tarballs from each system's log folder (~/benchmark/<system>/logs/*.tar.gz).
+    '''Grab new tarballs from each system's log folder (~/benchmark/<system>/logs/*.tar.gz).
 
-    Specifically, remote files from ~/benchmark/<system>/logs/*.tar.gz are scp'd
+    Specifically, remote files from ~/benchmark/<system>/logs/*.tar.gz are copied
     to ../results/<system>/<num-slaves>/, relative to the location of this script.
     Here, <num-slaves> is the number of slaves in the cluster.
 
+    Only tarballs that are new or changed since they were last fetched are
+    copied, args.streams at a time. Partial downloads are resumed and every
+    download is verified against its checksum on the master. Fetched
+    tarballs are listed in LOG_MANIFEST in each results folder.
+
+    With args.ingest, fetched tarballs are also ingested into the results
+    store, each while later ones are still being downloaded (see start_ingest()).
+    Tarballs fetched earlier are ingested too, if they have not been already.
+
     Arguments:
     conn -- EC2 connection instance (boto.ec2.connection.EC2Connection)
     args -- Command-line arguments (argparse.Namespace)
     '''
 
-    (master_instance_ids, slave_instance_ids) = get_cluster(conn, args.cluster_name)
-
-    if len(master_instance_ids) == 0:
-        print("ERROR: No master machine found!")
+    master_instance = get_running_master(conn, args)
+    if master_instance is None:
         return
-    if len(master_instance_ids) > 1:
-        print("ERROR: Multiple master machines found!")
+
+    pub_ip = master_instance['ip']
+
+    ## Find new or changed tarballs
+    sys.stdout.write("Listing tarballs on master... ")
+    sys.stdout.flush()
+
+    logs = list_remote_logs(args, pub_ip)
+    if logs is None:
+        print("Listing tarballs failed!")
         return
 
-    master_instance = conn.get_only_instances(master_instance_ids)[0]
+    results_dirs = dict((system, os.path.normpath('%s../results/%s/%i' % (SCRIPT_DIR, system, args.num_slaves)) + '/')
+                        for system in LOG_SYSTEMS)
+    manifests = dict((system, read_manifest(results_dirs[system])) for system in LOG_SYSTEMS)
 
-    if master_instance.state == 'pending':
-        wait_for_status_exit(conn, master_instance_ids,
-                             'pending', "Waiting for master machine to start... ")
-        master_instance.update()
+    # unchanged tarballs have the same size and modification time as when fetched
+    # (tarballs from before manifests existed are compared by checksum below)
+    todo = [(system, name, size, mtime) for (system, name, size, mtime) in logs
+            if not (manifests[system].get(name, (None, None))[0:2] == (size, mtime) and
+                    os.path.exists(results_dirs[system] + name))]
+    print("Done.")
 
-    if master_instance.state != 'running':
-        print("ERROR: Master machine is not running!")
+    ingest = start_ingest() if args.ingest else None
+    if ingest:
+        # (INGEST skips the ones it already ingested)
+        for (system, name, size, mtime) in logs:
+            if (system, name, size, mtime) not in todo:
+                feed_ingest(ingest, results_dirs[system] + name)
+
+    if len(todo) == 0:
+        print("All %i tarballs are up to date." % len(logs))
+        if ingest:
+            finish_ingest(ingest)
         return
 
-    pub_ip = master_instance.ip_address
+    sys.stdout.write("Computing checksums of %i new or changed tarballs... " % len(todo))
+    sys.stdout.flush()
+    md5s = remote_checksums(args, pub_ip, ['%s/logs/%s' % (system, name) for (system, name, _, _) in todo])
+    if md5s is None:
+        print("Computing checksums failed!")
+        if ingest:
+            finish_ingest(ingest)
+        return
+    print("Done.")
+
+    ## Download them in parallel
+    for system in LOG_SYSTEMS:
+        if not os.path.exists(results_dirs[system]):
+            os.makedirs(results_dirs[system])
 
-    # build SCP command and create result directories (if they don't exist)
-    scp_cmd = ""
-    for system in ['giraph', 'gps', 'graphlab', 'mizan']:
-        scp_cmd += ("scp -o UserKnownHostsFile=/dev/null -o StrictHostKeyChecking=no -i \"%s\" "
-                    "%s@%s:~/benchmark/%s/logs/*.tar.gz %s/../results/%s/%i/ & "
-                    % (args.identity_file, EC2_USER, pub_ip, system, SCRIPT_DIR, system, args.num_slaves))
+    def fetch(log):
+        (system, name, size, mtime) = log
+        path = '%s/logs/%s' % (system, name)
+        local = results_dirs[system] + name
 
-        target_dir = '%s/../results/%s/%i/' % (SCRIPT_DIR, system, args.num_slaves)
-        if not os.path.exists(target_dir):
-            os.makedirs(target_dir)
+        if os.path.exists(local) and os.path.getsize(local) == size and md5sum(local) == md5s[path]:
+            return (log, (True, None))
+        return (log, fetch_log(args, pub_ip, path, local, size, md5s[path]))
 
-    # basically a hacky way to spawn shell processes & wait on them
-    scp_cmd += "wait"
+    sys.stdout.write("Fetching tarballs... (0 of %i done)" % len(todo))
+    sys.stdout.flush()
+
+    failed = []
+    done = 0
+    pool = ThreadPool(min(args.streams, len(todo)))
+    try:
+        for ((system, name, size, mtime), (ok, error)) in pool.imap_unordered(fetch, todo):
+            done += 1
+            if ok:
+                # update the manifest as we go, so interrupted runs don't fetch again
+                manifests[system][name] = (size, mtime, md5s['%s/logs/%s' % (system, name)])
+                write_manifest(results_dirs[system], manifests[system])
+
+                if ingest:
+                    feed_ingest(ingest, results_dirs[system] + name)
+            else:
+                failed.append((system, name, error))
+
+            sys.stdout.write("\rFetching tarballs... (%i of %i done%s)"
+                             % (done, len(todo), (", %i failed" % len(failed)) if failed else ""))
+            sys.stdout.flush()
+    finally:
+        pool.close()
+    print("")
+
+    for (system, name, error) in failed:
+        print("\n%s/logs/%s:\n%s" % (system, name, error))
 
-    print("Grabbing tarballs from all systems in parallel...")
-    subprocess.call(scp_cmd, shell=True)
-    print("Complete!")
+    if len(failed) > 0:
+        print("Failed to fetch %i of %i tarballs! Run get-logs again to resume them." % (len(failed), len(todo)))
+    else:
+        print("Complete!")
+
+    if ingest:
+        finish_ingest(ingest)
 
 
 ####################
@@ -964,5 +1670,9 @@ def main():
 
     ACTION_FUNCS[ACTIONS.index(args.action)](conn, args)
 
+    # instances (or their IPs) have changed, so cached inventory is out of date
+    if args.action in ('launch', 'terminate', 'start', 'stop'):
+        clear_inventory(conn, args.cluster_name)
+
 if __name__ == "__main__":
     main()
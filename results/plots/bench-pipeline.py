@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+
+"""Benchmarks the analysis pipeline on synthetic logs.
+
+Synthetic logs are generated by gen-logs.py at increasing scales and
+then parsed by the parsers (in-process), gen-data.py, and plot.py. Each
+stage is timed in its own child process, so its peak RSS is not hidden
+by earlier stages. Results are appended to a history file and compared
+with the last results from the same host, to catch pipeline regressions.
+
+Scales are swept in two ways:
+ - machines: mem/net parsers on one experiment with 16 to 512 machines
+ - runs: time parser, experiment parser, gen-data.py and plot.py on a
+   16 machine campaign with 5 to 50 runs per experiment
+"""
+
+import os, sys, glob, json, time, socket, datetime
+import argparse, itertools, subprocess, traceback
+import numpy as np
+
+from constants import *
+from parsers import *
+
+SCRIPT_DIR=sys.path[0]
+
+GEN_LOGS = SCRIPT_DIR + '/../../benchmark/parsers/gen-logs.py'
+
+###############
+# Parse args
+###############
+def check_positive(num):
+    try:
+        n = int(num)
+        if n < 1:
+            raise argparse.ArgumentTypeError('Invalid value')
+        return n
+    except:
+        raise argparse.ArgumentTypeError('Invalid value')
+
+def check_threshold(threshold):
+    try:
+        t = float(threshold)
+        if t < 0:
+            raise argparse.ArgumentTypeError('Invalid threshold')
+        return t
+    except:
+        raise argparse.ArgumentTypeError('Invalid threshold')
+
+parser = argparse.ArgumentParser(description='Benchmarks the parsers, gen-data.py, and plot.py on synthetic logs.')
+parser.add_argument('--workdir', type=str, default='/tmp/bench-pipeline',
+                    help='folder for synthetic logs, which are reused by later benchmarks, default=/tmp/bench-pipeline')
+parser.add_argument('--machines', type=check_positive, nargs='+', default=[16, 64, 256, 512],
+                    help='machine counts for the mem/net parsers, up to 512 (default: 16 64 256 512)')
+parser.add_argument('--runs', type=check_positive, nargs='+', default=[5, 10, 25, 50],
+                    help='runs per experiment for the time/experiment parsers, gen-data.py and plot.py '
+                         '(default: 5 10 25 50)')
+parser.add_argument('--repeat', type=check_positive, default=3,
+                    help='times to repeat each stage (the fastest is reported), default=3')
+parser.add_argument('--no-plot', action='store_true', dest='no_plot', default=False,
+                    help='skip plot.py, which is the slowest stage')
+parser.add_argument('--history', type=str, default=SCRIPT_DIR + '/bench-pipeline.json',
+                    help='file that results are appended to, default=' + SCRIPT_DIR + '/bench-pipeline.json')
+parser.add_argument('--no-save', action='store_true', dest='no_save', default=False,
+                    help='compare with the history file, but do not append results to it')
+parser.add_argument('--threshold', type=check_threshold, default=0.2,
+                    help='exit with non-zero status if a stage is slower than its last result by more than '
+                         'this relative change, default=0.2')
+parser.add_argument('--cores', type=check_positive, dest='n_cores', default=4,
+                    help='number of cores for gen-logs.py and gen-data.py (> 0), default=4')
+
+workdir = parser.parse_args().workdir
+machines_scales = parser.parse_args().machines
+runs_scales = parser.parse_args().runs
+repeat = parser.parse_args().repeat
+no_plot = parser.parse_args().no_plot
+history_file = parser.parse_args().history
+no_save = parser.parse_args().no_save
+threshold = parser.parse_args().threshold
+n_cores = parser.parse_args().n_cores
+
+
+###############
+# Constants
+###############
+# runs per experiment for the machines sweep
+MACHINES_RUNS = 3
+
+# data file written by gen-data.py for each mode (as in gen-all.sh)
+DATA_FILES = ('data_time.py', 'data_mem.py', 'data_net.py')
+
+# log files read in each mode (for workers only, except for time)
+MODE_LOGS = ('_time.txt', '_mem.txt', '_nbt.txt')
+
+# modes benchmarked (MODE_TPUT just combines their parsers, and needs a dataset index)
+BENCH_MODES = (MODE_TIME, MODE_MEM, MODE_NET)
+
+# slowdowns smaller than this (sec) are timer noise, not regressions
+MIN_SLOWDOWN = 0.05
+
+
+###############
+# Synthetic logs
+###############
+def gen_logs(name, machines, runs, systems):
+    """Generates a synthetic result tree, unless it was already generated.
+
+    Arguments:
+    name -- name of the tree's folder in workdir (str)
+    machines -- number of worker machines (int)
+    runs -- runs per experiment (int)
+    systems -- systems to generate, as indices into SYSTEMS (list)
+
+    Returns: path to the tree (str).
+    """
+
+    tree = os.path.join(workdir, name)
+    done = os.path.join(tree, '.done')
+
+    if not os.path.exists(done):
+        print("Generating %s..." % tree)
+        subprocess.check_call([sys.executable, GEN_LOGS, tree,
+                               '--systems'] + [str(s) for s in systems] +
+                              ['--machines', str(machines),
+                               '--algs', ALG_PR, '--graphs', GRAPH_LJ,
+                               '--runs', str(runs), '--seed', '0',
+                               '--cores', str(n_cores)],
+                              stdout=open(os.devnull, 'w'))
+        open(done, 'w').close()
+
+    return tree
+
+
+def run_prefixes(tree):
+    """Finds all runs in a result tree.
+
+    Returns: list of tuples (run prefix, system, alg).
+    """
+
+    runs = []
+    for log in sorted(glob.glob(tree + '/*/*/*_time.txt')):
+        system = log.split('/')[-3]
+        alg = os.path.basename(log).split('_')[0]
+        runs.append((log[:-len('_time.txt')], system, alg))
+    return runs
+
+
+def log_files(tree, suffix):
+    """Finds all log files of one type (excluding the master's, except for time logs)."""
+    return [f for f in glob.glob(tree + '/*/*/*' + suffix) if not ('_0' + suffix) in f]
+
+
+###############
+# Measurements
+###############
+def measure_func(func, *args):
+    """Runs a function in a child process and measures it.
+
+    Returns: tuple (wall time (sec), CPU time (sec), peak RSS (MB)).
+    """
+
+    rfd, wfd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(rfd)
+        status = 1
+        try:
+            start = time.time()
+            func(*args)
+            os.write(wfd, repr(time.time() - start).encode())
+            status = 0
+        except:
+            traceback.print_exc()
+        finally:
+            os._exit(status)
+
+    os.close(wfd)
+    wall = os.read(rfd, 64)
+    os.close(rfd)
+
+    (_, status, usage) = os.wait4(pid, 0)
+    if status != 0:
+        raise RuntimeError('%s failed' % func.__name__)
+
+    return (float(wall), usage.ru_utime + usage.ru_stime, usage.ru_maxrss/1024.0)
+
+
+def measure_cmd(cmd, out_file=os.devnull):
+    """Runs a command and measures it (including its child processes).
+
+    Arguments:
+    cmd -- the command (list)
+    out_file -- file to write the command's output to (str)
+
+    Returns: tuple (wall time (sec), CPU time (sec), peak RSS (MB)).
+    """
+
+    with open(out_file, 'w') as out, open(os.devnull, 'w') as err:
+        start = time.time()
+        proc = subprocess.Popen(cmd, stdout=out, stderr=err)
+
+        # wait4 gives the rusage of this command only, unlike RUSAGE_CHILDREN
+        (_, status, usage) = os.wait4(proc.pid, 0)
+        wall = time.time() - start
+        proc.returncode = 0    # stop Popen from reaping it again
+
+    if status != 0:
+        raise RuntimeError('%s failed' % ' '.join(cmd))
+
+    return (wall, usage.ru_utime + usage.ru_stime, usage.ru_maxrss/1024.0)
+
+
+def benchmark(stage, machines, runs, files, measure):
+    """Repeats one stage and summarizes its measurements.
+
+    Arguments:
+    stage -- name of the stage (str)
+    machines -- number of worker machines (int)
+    runs -- runs per experiment (int)
+    files -- files read (or, for plot.py, written) by the stage (list)
+    measure -- function that runs the stage once and returns (wall, cpu, rss)
+
+    Returns: dictionary of results.
+    """
+
+    results = [measure() for i in range(repeat)]
+    best = min(results, key=lambda r: r[0])
+    mb = sum(os.path.getsize(f) for f in files)/(1024*1024.0)
+
+    result = {'stage': stage, 'machines': machines, 'runs': runs,
+              'files': len(files), 'mb': mb,
+              'wall': best[0], 'wall_median': float(np.median([r[0] for r in results])),
+              'cpu': best[1], 'rss': max(r[2] for r in results),
+              'files_per_sec': len(files)/best[0], 'mb_per_sec': mb/best[0]}
+
+    print(format_result(result))
+    return result
+
+
+###############
+# Stages
+###############
+def parse_mem(runs, machines):
+    for (prefix, system, alg) in runs:
+        mem_parser(prefix, machines)
+
+def parse_net(runs, machines):
+    for (prefix, system, alg) in runs:
+        net_parser(prefix, machines)
+
+def parse_time(runs):
+    for (prefix, system, alg) in runs:
+        time_parser(prefix, system, alg)
+
+def parse_experiments(runs, machines, mode):
+    # NOTE: experiment = run prefix without the timestamp (see gen-data.py)
+    for (exp_prefix, system, alg) in set((p.rsplit('_', 1)[0], s, a) for (p, s, a) in runs):
+        experiment_parser(exp_prefix, machines, system, alg, mode)
+
+
+def machines_sweep(machines):
+    """Benchmarks the mem/net parsers on one experiment (Giraph)."""
+
+    tree = gen_logs('machines-%i' % machines, machines, MACHINES_RUNS, [SYSTEMS.index(SYS_GIRAPH)])
+    runs = run_prefixes(tree)
+
+    return [benchmark('mem_parser', machines, MACHINES_RUNS, log_files(tree, '_mem.txt'),
+                      lambda: measure_func(parse_mem, runs, machines)),
+            benchmark('net_parser', machines, MACHINES_RUNS, log_files(tree, '_nbt.txt'),
+                      lambda: measure_func(parse_net, runs, machines))]
+
+
+def runs_sweep(num_runs, do_plot):
+    """Benchmarks the time/experiment parsers, gen-data.py and plot.py on a 16 machine campaign."""
+
+    machines = 16
+    tree = gen_logs('runs-%i' % num_runs, machines, num_runs, range(len(SYSTEMS)))
+    runs = run_prefixes(tree)
+
+    results = [benchmark('time_parser', machines, num_runs, log_files(tree, '_time.txt'),
+                         lambda: measure_func(parse_time, runs))]
+
+    for mode in BENCH_MODES:
+        results.append(benchmark('experiment_parser_%i' % mode, machines, num_runs, log_files(tree, MODE_LOGS[mode]),
+                                 lambda: measure_func(parse_experiments, runs, str(machines), mode)))
+
+    for mode in BENCH_MODES:
+        cmd = [sys.executable, SCRIPT_DIR + '/gen-data.py', str(mode),
+               '--results-dir', tree, '--cores', str(n_cores)]
+        data_file = os.path.join(tree, DATA_FILES[mode])
+        results.append(benchmark('gen-data_%i' % mode, machines, num_runs, log_files(tree, MODE_LOGS[mode]),
+                                 lambda: measure_cmd(cmd, data_file)))
+
+    if not do_plot:
+        return results
+
+    # plots don't depend on the number of runs, so files are the figures written
+    figs_dir = os.path.join(tree, 'figs')
+    if not os.path.exists(figs_dir):
+        os.makedirs(figs_dir)
+
+    for mode in BENCH_MODES:
+        # (--force, as otherwise every timed run would find the figures up to date)
+        cmd = [sys.executable, SCRIPT_DIR + '/plot.py', str(mode), '--save-eps', '--force',
+               '--data-dir', tree, '--figs-dir', figs_dir]
+
+        # warm-up run, which also creates the figures counted below
+        for f in glob.glob(figs_dir + '/*.eps'):
+            os.remove(f)
+        measure_cmd(cmd)
+
+        results.append(benchmark('plot_%i' % mode, machines, num_runs, glob.glob(figs_dir + '/*.eps'),
+                                 lambda: measure_cmd(cmd)))
+
+    return results
+
+
+###############
+# Output data
+###############
+def format_result(r):
+    """Formats one stage's results as an output friendly string."""
+
+    return (" %-20s | %8i | %4i | %6i | %8.1f | %8.2f | %8.2f | %8.1f | %6.1f | %8.1f"
+            % (r['stage'], r['machines'], r['runs'], r['files'], r['mb'],
+               r['wall'], r['cpu'], r['files_per_sec'], r['mb_per_sec'], r['rss']))
+
+header = (" %-20s | %-8s | %-4s | %-6s | %-8s | %-8s | %-8s | %-8s | %-6s | %s"
+          % ('Stage', 'Machines', 'Runs', 'Files', 'MB', 'Wall (s)', 'CPU (s)', 'Files/s', 'MB/s', 'Peak RSS (MB)'))
+separator = "=" * len(header)
+
+
+def last_results(history, host):
+    """Gets the most recent result of every stage and scale from one host.
+
+    Returns: dictionary of (stage, machines, runs) to results.
+    """
+
+    last = {}
+    for entry in history:
+        if entry['host'] == host:
+            last.update(((r['stage'], r['machines'], r['runs']), r) for r in entry['results'])
+    return last
+
+
+print(separator)
+print(header)
+print(separator)
+
+results = []
+for machines in machines_scales:
+    results += machines_sweep(machines)
+for i, num_runs in enumerate(runs_scales):
+    # plotting cost is the same at every scale, so only do it once
+    results += runs_sweep(num_runs, not no_plot and i == len(runs_scales)-1)
+
+print(separator)
+
+# one JSON object per line, so that the file can just be appended to
+history = []
+if os.path.isfile(history_file):
+    history = [json.loads(line) for line in open(history_file) if line.strip()]
+
+host = socket.gethostname()
+last = last_results(history, host)
+
+regressions = []
+for r in results:
+    key = (r['stage'], r['machines'], r['runs'])
+    if (key in last and r['wall'] > last[key]['wall']*(1 + threshold)
+            and r['wall'] - last[key]['wall'] > MIN_SLOWDOWN):
+        regressions.append((r, last[key]))
+
+if not no_save:
+    entry = {'date': datetime.datetime.now().strftime('%Y%m%d-%H%M%S'), 'host': host,
+             'python': sys.version.split()[0], 'repeat': repeat, 'results': results}
+    with open(history_file, 'a') as f:
+        f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+if len(regressions) > 0:
+    print("")
+    print("FAILED: %i stage(s) slower than their last results by more than %.0f%%:"
+          % (len(regressions), threshold*100))
+    for r, prev in regressions:
+        print("  %s (%i machines, %i runs): %.2fs -> %.2fs"
+              % (r['stage'], r['machines'], r['runs'], prev['wall'], r['wall']))
+    sys.exit(1)
@@ -35,11 +35,14 @@ ALL_SYS = [(system, sysmode)
 
 
 # conversion modes
-MODES = (0, 1, 2)
-MODE_TIME, MODE_MEM, MODE_NET = MODES
+MODES = (0, 1, 2, 3)
+MODE_TIME, MODE_MEM, MODE_NET, MODE_TPUT = MODES
+MODE_NAMES = ('time', 'mem', 'net', 'tput')
 
 # names for relevant statistics (indexed by "mode")
 STATS = (('run', 'io', 'tot'),                  # time
          ('mem_min', 'mem_max', 'mem_avg'),     # memory
          ('recv_min', 'recv_max', 'recv_avg',   # net
-          'sent_min', 'sent_max', 'sent_avg'))
+          'sent_min', 'sent_max', 'sent_avg'),
+         ('eps',                                # throughput (per graph edge)
+          'mem_bpe', 'recv_bpe', 'sent_bpe'))
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+import os, sys
+import argparse, itertools
+import numpy as np
+from scipy import stats
+
+from constants import *
+
+###############
+# Parse args
+###############
+def check_fraction(frac):
+    try:
+        f = float(frac)
+        if (f < 0) or (f > 1):
+            raise argparse.ArgumentTypeError('Invalid fraction')
+        return f
+    except:
+        raise argparse.ArgumentTypeError('Invalid fraction')
+
+def check_runs(runs):
+    try:
+        r = int(runs)
+        if r < 2:
+            raise argparse.ArgumentTypeError('Invalid run count')
+        return r
+    except:
+        raise argparse.ArgumentTypeError('Invalid run count')
+
+parser = argparse.ArgumentParser(description='Compares the parsed experimental data of two campaigns and reports '
+                                             'statistically significant regressions and improvements.')
+parser.add_argument('baseline', type=str,
+                    help='folder with the baseline campaign\'s data_time.py, data_mem.py, and data_net.py')
+parser.add_argument('candidate', type=str,
+                    help='folder with the candidate campaign\'s data_time.py, data_mem.py, and data_net.py')
+parser.add_argument('--master', action='store_true', default=False,
+                    help='compare mem/net statistics for the master (data_*_master.py) rather than the worker machines')
+parser.add_argument('--alpha', type=check_fraction, default=0.05,
+                    help='false discovery rate for the significance tests (0 to 1), default=0.05')
+parser.add_argument('--threshold', type=check_fraction, default=0.1,
+                    help='exit with non-zero status if a significant regression is larger than this '
+                         'relative change (0 to 1), default=0.1')
+parser.add_argument('--runs', type=check_runs, default=5,
+                    help='number of runs per experiment, for data files without _runs values (>= 2), default=5')
+
+baseline_dir = parser.parse_args().baseline
+candidate_dir = parser.parse_args().candidate
+do_master = parser.parse_args().master
+alpha = parser.parse_args().alpha
+threshold = parser.parse_args().threshold
+default_runs = parser.parse_args().runs
+
+
+###############
+# Constants
+###############
+# data files indexed by mode
+DATA_FILES = ('data_time.py',
+              'data_mem_master.py' if do_master else 'data_mem.py',
+              'data_net_master.py' if do_master else 'data_net.py')
+
+# statistics compared for each mode (smaller is always better)
+# NOTE: throughputs (MODE_TPUT) are derived from these, so aren't compared
+TESTED_STATS = (('run', 'io'),
+                ('mem_max',),
+                ('recv_avg', 'sent_avg'))
+
+
+###############
+# Load data
+###############
+def load_data(data_file):
+    """Loads a data file generated by gen-data.py.
+
+    Arguments:
+    data_file -- path to the data file (str)
+
+    Returns:
+    Dictionary of variable names to values, or None if the file is missing.
+    """
+
+    if not os.path.isfile(data_file):
+        return None
+
+    # faster and safer than importing/eval'ing a few thousand globals
+    data = {}
+    for line in open(data_file):
+        if ' = ' in line:
+            name, val = line.split(' = ')
+            data[name] = float(val)
+    return data
+
+
+def experiments():
+    """Generates the variable name prefix of every experiment (see gen-data.py)."""
+
+    for ((system,sysmode), machines, alg, graph) in itertools.product(ALL_SYS, MACHINES, ALGS, GRAPHS):
+        yield system + '_' + sysmode + '_' + machines + '_' + alg + '_' + graph
+
+    for machines, graph in itertools.product(MACHINES, GRAPHS):
+        yield SYS_MIZAN + '_' + SYSMODE_HASH + '_' + machines + '_' + ALG_PREMIZAN + '_' + graph
+
+
+###############
+# Compare data
+###############
+def summary(data, exp, stat):
+    """Gets the mean, sample standard deviation, and number of runs of one statistic.
+
+    gen-data.py gives the 95% CI as std*1.96/sqrt(n), where std has n
+    degrees of freedom, so the sample std is recovered from the CI.
+
+    Arguments:
+    data -- dictionary of a loaded data file (dict)
+    exp -- experiment's variable name prefix (str)
+    stat -- name of the statistic (str)
+
+    Returns:
+    Tuple (mean, std, n), or None if the statistic is missing.
+    """
+
+    if not (exp + '_' + stat + '_avg') in data:
+        return None
+
+    n = int(data.get(exp + '_runs', default_runs))
+    mean = data[exp + '_' + stat + '_avg']
+    std = data[exp + '_' + stat + '_ci']*np.sqrt(n)/1.96
+
+    if n > 1:
+        std = std*np.sqrt(n/(n - 1.0))
+
+    return (mean, std, n)
+
+
+def compare(base, cand):
+    """Runs Welch's t-test on one statistic of two campaigns.
+
+    Arguments:
+    base -- (mean, std, n) of the baseline (tuple)
+    cand -- (mean, std, n) of the candidate (tuple)
+
+    Returns:
+    Tuple (relative change, effect size (Hedges' g), p-value).
+    A failed run has a relative change of +/-inf and a p-value of 0.
+    The effect size and p-value are NaN (untestable) if either campaign
+    has fewer than 2 runs, as there is no variance to test against.
+    """
+
+    (base_mean, base_std, base_n) = base
+    (cand_mean, cand_std, cand_n) = cand
+
+    # a mean of 0 means the experiment failed (or logs are missing)
+    if base_mean == 0 or cand_mean == 0:
+        return (np.inf if base_mean > 0 else -np.inf, np.nan, 0.0)
+
+    rel = (cand_mean - base_mean)/base_mean
+
+    if base_n < 2 or cand_n < 2:
+        return (rel, np.nan, np.nan)
+
+    pooled_std = np.sqrt(((base_n - 1)*base_std**2 + (cand_n - 1)*cand_std**2)/(base_n + cand_n - 2.0))
+    if pooled_std == 0:
+        # identical runs: any change is significant
+        return (rel, np.copysign(np.inf, rel), 0.0 if rel != 0 else 1.0)
+
+    # Hedges' g corrects Cohen's d for small sample sizes
+    g = (cand_mean - base_mean)/pooled_std * (1 - 3.0/(4*(base_n + cand_n) - 9))
+
+    p = stats.ttest_ind_from_stats(cand_mean, cand_std, cand_n,
+                                   base_mean, base_std, base_n, equal_var=False)[1]
+    return (rel, g, p)
+
+
+results = []   # tuples of (experiment, stat, base, cand, rel, g, p)
+
+for mode in (MODE_TIME, MODE_MEM, MODE_NET):
+    base_data = load_data(os.path.join(baseline_dir, DATA_FILES[mode]))
+    cand_data = load_data(os.path.join(candidate_dir, DATA_FILES[mode]))
+
+    if base_data is None or cand_data is None:
+        sys.stderr.write("WARNING: %s missing, skipping.\n" % DATA_FILES[mode])
+        continue
+
+    for exp, stat in itertools.product(experiments(), TESTED_STATS[mode]):
+        base = summary(base_data, exp, stat)
+        cand = summary(cand_data, exp, stat)
+
+        # skip experiments that were never run in either campaign
+        if base is None or cand is None or (base[0] == 0 and cand[0] == 0):
+            continue
+
+        results.append((exp, stat, base, cand) + compare(base, cand))
+
+if len(results) == 0:
+    print("No experiments to compare!")
+    sys.exit(0)
+
+# Benjamini-Hochberg: with hundreds of tests, a plain alpha would
+# report many regressions that are purely due to noise
+pvals = np.array([r[6] for r in results])
+untestable = [r for r in results if np.isnan(r[6])]
+pvals[np.isnan(pvals)] = 1.0
+order = np.argsort(pvals)
+passed = pvals[order] <= alpha*np.arange(1, len(pvals)+1)/len(pvals)
+significant = np.zeros(len(pvals), dtype=bool)
+if np.any(passed):
+    significant[order[:np.max(np.nonzero(passed)[0])+1]] = True
+
+regressions = sorted([r for r,sig in zip(results, significant) if sig and r[4] > 0],
+                     key=lambda r: -r[4])
+improvements = sorted([r for r,sig in zip(results, significant) if sig and r[4] < 0],
+                      key=lambda r: r[4])
+
+
+###############
+# Output data
+###############
+def format_result(r):
+    """Formats one compared statistic as an output friendly string."""
+
+    (exp, stat, base, cand, rel, g, p) = r
+
+    if np.isinf(rel):
+        change = ' failed' if rel > 0 else ' fixed'
+    else:
+        change = '%+8.1f%%' % (rel*100)
+
+    return (" %-40s %-8s | %10.3f (%3i) | %10.3f (%3i) | %-9s | %7.2f | %.2g"
+            % (exp, stat, base[0], base[2], cand[0], cand[2], change, g, p))
+
+header = (" %-40s %-8s | %-16s | %-16s | %-9s | %-7s | %s"
+          % ('Experiment', 'Stat', 'Baseline (n)', 'Candidate (n)', 'Change', "Hedges'", 'p-value'))
+separator = "=" * len(header)
+
+for title, rs in (("Regressions", regressions), ("Improvements", improvements)):
+    print("")
+    print("%s (%i of %i compared, FDR %.2f)" % (title, len(rs), len(results), alpha))
+    print(separator)
+    print(header)
+    print(separator)
+    for r in rs:
+        print(format_result(r))
+    print("")
+
+if len(untestable) > 0:
+    print("Untestable (fewer than 2 runs in either campaign): %i of %i compared" % (len(untestable), len(results)))
+    for r in untestable:
+        print(" %-40s %-8s | %3i vs %3i runs" % (r[0], r[1], r[2][2], r[3][2]))
+    print("")
+
+# exit status is used by scripts, so the largest regression decides it
+if len(regressions) > 0 and regressions[0][4] > threshold:
+    print("FAILED: %i significant regression(s) above %.0f%%."
+          % (len([r for r in regressions if r[4] > threshold]), threshold*100))
+    sys.exit(1)
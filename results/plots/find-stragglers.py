@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+import os, sys, glob
+import argparse, itertools, collections
+import numpy as np
+from scipy import stats
+
+# do some parallel computing
+from joblib import Parallel, delayed
+
+from constants import *
+from parsers import *
+
+# store script dir (so we know where logs are)
+SCRIPT_DIR=sys.path[0]
+
+###############
+# Parse args
+###############
+def check_positive(val):
+    try:
+        v = float(val)
+        if v <= 0:
+            raise argparse.ArgumentTypeError('Invalid value')
+        return v
+    except:
+        raise argparse.ArgumentTypeError('Invalid value')
+
+def check_fraction(frac):
+    try:
+        f = float(frac)
+        if (f < 0) or (f > 1):
+            raise argparse.ArgumentTypeError('Invalid fraction')
+        return f
+    except:
+        raise argparse.ArgumentTypeError('Invalid fraction')
+
+def check_count(count):
+    try:
+        c = int(count)
+        if c < 1:
+            raise argparse.ArgumentTypeError('Invalid count')
+        return c
+    except:
+        raise argparse.ArgumentTypeError('Invalid count')
+
+parser = argparse.ArgumentParser(description='Finds skewed runs and persistent straggler machines from the per-machine '
+                                             'memory, network and CPU usage in the log files, and correlates them '
+                                             'with computation time.')
+parser.add_argument('--system', type=str, choices=SYSTEMS, default=None,
+                    help='analyze only this system\'s runs')
+parser.add_argument('--alg', type=str, choices=ALGS, default=None,
+                    help='analyze only this algorithm\'s runs')
+parser.add_argument('--graph', type=str, choices=GRAPHS, default=None,
+                    help='analyze only this graph\'s runs')
+parser.add_argument('--machines', type=str, choices=MACHINES, default=None,
+                    help='analyze only runs with this number of machines')
+parser.add_argument('--z-threshold', type=check_positive, dest='z_threshold', default=2.0,
+                    help='flag machines whose usage is this many standard deviations above their run\'s mean (> 0), default=2.0')
+parser.add_argument('--min-runs', type=check_count, dest='min_runs', default=3,
+                    help='hosts flagged in at least this many runs are persistent stragglers (> 0), default=3')
+parser.add_argument('--min-fraction', type=check_fraction, dest='min_fraction', default=0.5,
+                    help='...and in at least this fraction of the runs they took part in (0 to 1), default=0.5')
+parser.add_argument('--top', type=check_count, default=20,
+                    help='number of most skewed runs to list (> 0), default=20')
+parser.add_argument('--cores', type=check_count, dest='n_cores', default=4,
+                    help='number of cores to use (> 0), default=4')
+parser.add_argument('--results-dir', type=str, dest='results_dir', default=SCRIPT_DIR + '/../',
+                    help='folder with the <system>/<machines>/ log folders, default=' + SCRIPT_DIR + '/../')
+
+args = parser.parse_args()
+z_threshold = args.z_threshold
+
+
+###############
+# Constants
+###############
+# per-machine statistics compared within each run
+SKEW_STATS = ('mem', 'recv', 'sent', 'cpu')
+
+
+###############
+# Parse logs
+###############
+def run_logs():
+    """Gets the time log of every selected run, as tuples (system, log)."""
+
+    for system, machines in itertools.product(SYSTEMS, MACHINES):
+        if (args.system and system != args.system) or (args.machines and machines != args.machines):
+            continue
+
+        for log in sorted(glob.glob(args.results_dir + '/' + system + '/' + machines + '/*_time.txt')):
+            alg, graph = os.path.basename(log).split('_')[0:2]
+            if alg in ALGS and (not args.alg or alg == args.alg) and (not args.graph or graph.startswith(args.graph + '-')):
+                yield (system, log)
+
+
+def run_usage(system, log):
+    """Parses the per-machine usage of one run.
+
+    Arguments:
+    system -- the system tested (str)
+    log -- the run's time log file (str)
+
+    Returns:
+    Dictionary with the run's name, its experiment's name (as in gen-data.py),
+    its computation time (mins), its workers' hostnames, and their usage as an
+    array indexed by [SKEW_STATS index, machine - 1], with NaNs for missing logs.
+    """
+
+    # cut via range, in case somebody decides to put _time.txt in the path
+    logname = os.path.basename(log)[:-len('_time.txt')]
+    log_prefix = log[:-len('_time.txt')]
+    alg, graph, machines, sysmode, _ = logname.split('_')
+    machines = int(machines)
+
+    run = time_parser(log_prefix, system, alg)[0]
+    (start, end) = phase_parser(log_prefix, system, alg)
+
+    hosts = []
+    usage = np.full((len(SKEW_STATS), machines), np.nan)
+
+    # (on the same timeline as the phases, if the run has clock logs)
+    cpus = machine_series(log_prefix, machines, 'cpu')
+
+    for i in range(machines):
+        prefix = log_prefix + '_' + str(i + 1)
+        hosts.append(None)
+
+        # (raw logs or the worker's log summary)
+        (mem, nbt, cpu) = [machine_log(prefix, suffix) for suffix in ('_mem.txt', '_nbt.txt', '_cpu.txt')]
+
+        if mem and os.path.getsize(mem) > 0:
+            usage[0,i] = machine_mem_parser(mem)
+        if nbt:
+            usage[1:3,i] = machine_net_parser(nbt)
+
+        # average CPU usage over the computation phase (stragglers keep working while others wait)
+        if cpu:
+            hosts[i] = hostname_parser(cpu)
+            cpu = cpus[i]
+            if end > start:
+                cpu = cpu[max(0, int(start)):int(np.ceil(end))]
+            cpu = cpu[~np.isnan(cpu)]
+            if len(cpu) > 0:
+                usage[3,i] = np.mean(cpu)
+
+        # fall back to the worker's number, which is the same host within a cluster
+        if hosts[i] is None:
+            hosts[i] = 'worker' + str(i + 1)
+
+    return {'log': logname,
+            'exp': '_'.join((system, sysmode, str(machines), alg, graph.split('-')[0])),
+            'run': run, 'hosts': hosts, 'usage': usage}
+
+
+runs = Parallel(n_jobs=args.n_cores)(delayed(run_usage)(system, log) for (system, log) in run_logs())
+
+if len(runs) == 0:
+    print("No runs to analyze!")
+    sys.exit(0)
+
+
+###############
+# Compute skew
+###############
+def skew(usage):
+    """Computes the z-scores and max/median ratio of each statistic of one run.
+
+    Arguments:
+    usage -- usage indexed by [statistic, machine] (np.array)
+
+    Returns:
+    Tuple (z-scores indexed by [statistic, machine], max/median ratio of each statistic),
+    where z-scores are 0 if all machines are the same and NaN for missing machines.
+    """
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        valid = ~np.isnan(usage)
+        n = valid.sum(axis=1)
+        mean = np.where(valid, usage, 0).sum(axis=1)/n
+        std = np.sqrt(np.where(valid, (usage - mean[:,None])**2, 0).sum(axis=1)/n)
+
+        z = (usage - mean[:,None])/std[:,None]
+        z[std == 0,:] = 0
+
+        # nan-aware max/median, as some machines' logs may be missing
+        med = np.array([np.median(u[~np.isnan(u)]) if np.any(~np.isnan(u)) else np.nan for u in usage])
+        ratio = np.array([np.max(u[~np.isnan(u)]) if np.any(~np.isnan(u)) else np.nan for u in usage])/med
+
+    return (np.where(valid, z, np.nan), ratio)
+
+
+skews = [skew(r['usage']) for r in runs]
+
+# computation time relative to the median of the experiment's successful runs
+exp_times = collections.defaultdict(list)
+for r in runs:
+    if r['run'] > 0:
+        exp_times[r['exp']].append(r['run'])
+
+rel_times = np.array([r['run']/np.median(exp_times[r['exp']]) if r['run'] > 0 else np.nan for r in runs])
+
+# per host: runs taken part in, runs flagged (any stat), flags per stat, and relative times
+hosts = collections.defaultdict(lambda: {'runs': 0, 'flagged': 0, 'stats': np.zeros(len(SKEW_STATS), dtype=int),
+                                         'flagged_times': [], 'other_times': []})
+
+for r, (z, ratio), rel in zip(runs, skews, rel_times):
+    with np.errstate(invalid='ignore'):
+        flags = z >= z_threshold
+
+    for i, host in enumerate(r['hosts']):
+        h = hosts[host]
+        h['runs'] += 1
+        h['stats'] += flags[:,i]
+
+        if np.any(flags[:,i]):
+            h['flagged'] += 1
+            h['flagged_times'].append(rel)
+        else:
+            h['other_times'].append(rel)
+
+stragglers = sorted([(host, h) for host, h in hosts.items()
+                     if h['flagged'] >= args.min_runs and h['flagged'] >= args.min_fraction*h['runs']],
+                    key=lambda hh: (-hh[1]['flagged']/float(hh[1]['runs']), -hh[1]['flagged'], hh[0]))
+
+
+###############
+# Output data
+###############
+def mean_time(times):
+    """Gets the mean of the non-NaN relative times, or NaN if there are none."""
+    times = np.array(times)
+    times = times[~np.isnan(times)]
+    return np.mean(times) if len(times) > 0 else np.nan
+
+## most skewed runs
+skewed = sorted([(ri, si) for ri, si in itertools.product(range(len(runs)), range(len(SKEW_STATS)))
+                 if not np.isnan(skews[ri][1][si])],
+                key=lambda rs: -skews[rs[0]][1][rs[1]])[:args.top]
+
+header = (" %-58s %-4s | %10s | %6s | %-12s | %8s"
+          % ('Run', 'Stat', 'Max/median', 'Max z', 'Max host', 'Rel time'))
+separator = "=" * len(header)
+
+print("")
+print("Most skewed runs (%i runs, %i stat(s) each)" % (len(runs), len(SKEW_STATS)))
+print(separator)
+print(header)
+print(separator)
+for ri, si in skewed:
+    z = skews[ri][0][si]
+    mi = np.nanargmax(z) if np.any(~np.isnan(z)) else 0
+    print(" %-58s %-4s | %10.2f | %6.2f | %-12s | %8.2f"
+          % (runs[ri]['log'], SKEW_STATS[si], skews[ri][1][si], z[mi], runs[ri]['hosts'][mi], rel_times[ri]))
+print("")
+
+## persistent stragglers
+header = (" %-20s | %5s | %7s | %s | %-15s"
+          % ('Host', 'Runs', 'Flagged', ' | '.join('%5s' % s for s in SKEW_STATS), 'Rel time (F/ok)'))
+separator = "=" * len(header)
+
+print("Persistent stragglers (z >= %.1f in >= %i runs and >= %.0f%% of their runs)"
+      % (z_threshold, args.min_runs, args.min_fraction*100))
+print(separator)
+print(header)
+print(separator)
+for host, h in stragglers:
+    print(" %-20s | %5i | %7i | %s | %6.2f / %6.2f"
+          % (host, h['runs'], h['flagged'], ' | '.join('%5i' % c for c in h['stats']),
+             mean_time(h['flagged_times']), mean_time(h['other_times'])))
+print("")
+
+## correlation of skew with computation time
+header = (" %-4s | %5s | %10s | %8s | %s" % ('Stat', 'Runs', 'Max/median', 'Spearman', 'p-value'))
+separator = "=" * len(header)
+
+print("Skew vs. relative computation time")
+print(separator)
+print(header)
+print(separator)
+for si, stat in enumerate(SKEW_STATS):
+    ratios = np.array([ratio[si] for (z, ratio) in skews])
+    ok = ~np.isnan(ratios) & ~np.isnan(rel_times)
+    if np.sum(ok) < 3:
+        continue
+
+    (rho, p) = stats.spearmanr(ratios[ok], rel_times[ok])
+    print(" %-4s | %5i | %10.2f | %8.3f | %.2g" % (stat, np.sum(ok), np.median(ratios[ok]), rho, p))
+print("")
+
+print("Rel time is a run's computation time relative to the median of its experiment's runs.")
+print("Max/median is the median over all runs, and F/ok are the mean rel times of runs where the host was flagged or not.")
+print("")
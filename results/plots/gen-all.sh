@@ -5,4 +5,10 @@
 ./gen-data.py 2 > data_net.py
 
 ./gen-data.py 1 --master > data_mem_master.py
-./gen-data.py 2 --master > data_net_master.py
\ No newline at end of file
+./gen-data.py 2 --master > data_net_master.py
+
+# throughput needs the dataset index (see benchmark/datasets/dataset-stats.sh)
+if [[ -f ../datasets.txt ]]; then
+    ./gen-data.py 3 > data_tput.py
+    ./gen-data.py 3 --master > data_tput_master.py
+fi
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+import os, sys
+import argparse
+import numpy as np
+
+from constants import *
+from parsers import machine_series, phase_parser, SERIES_UNITS
+
+SCRIPT_DIR=sys.path[0]
+
+###############
+# Parse args
+###############
+def check_system(system):
+    try:
+        s = int(system)
+        if (s < 0) or (s >= len(SYSTEMS)):
+            raise argparse.ArgumentTypeError('Invalid system')
+        return s
+    except:
+        raise argparse.ArgumentTypeError('Invalid system')
+
+def check_cols(cols):
+    try:
+        c = int(cols)
+        if c < 1:
+            raise argparse.ArgumentTypeError('Invalid column count')
+        return c
+    except:
+        raise argparse.ArgumentTypeError('Invalid column count')
+
+parser = argparse.ArgumentParser(description='Plots the memory, CPU and network usage of every worker machine '
+                                             'in a run as heatmaps (machines x time), to spot stragglers and skew.')
+parser.add_argument('system', type=check_system,
+                    help='system: 0 for Giraph, 1 for GPS, 2 for Mizan, 3 for GraphLab')
+parser.add_argument('log', type=str,
+                    help='the run\'s time log file (e.g. pagerank_orkut-adj.txt_16_0_20140101-123050_time.txt)')
+parser.add_argument('--series', type=str, nargs='+', choices=('mem', 'cpu', 'recv', 'sent'),
+                    default=['mem', 'cpu', 'recv', 'sent'],
+                    help='time series to plot, default=mem cpu recv sent')
+parser.add_argument('--max-cols', type=check_cols, dest='max_cols', default=2000,
+                    help='average seconds together so heatmaps have at most this many columns (> 0), default=2000')
+
+# save related items
+parser.add_argument('--save-png', action='store_true', default=False,
+                    help='save plot as a PNG file (200 DPI) instead of displaying it')
+parser.add_argument('--save-eps', action='store_true', default=False,
+                    help='save plot as an EPS file instead of displaying it')
+parser.add_argument('--figs-dir', type=str, dest='figs_dir', default=SCRIPT_DIR + '/figs',
+                    help='folder to save plots to, default=' + SCRIPT_DIR + '/figs')
+
+args = parser.parse_args()
+system = SYSTEMS[args.system]
+save_file = args.save_png or args.save_eps
+
+# cut via range, in case somebody decides to put _time.txt in the path
+logname = os.path.basename(args.log)[:-len('_time.txt')]
+log_prefix = args.log[:-len('_time.txt')]
+alg, _, machines, _, _ = logname.split('_')
+machines = int(machines)
+
+
+###############
+# Parse data
+###############
+def downsample(matrix, max_cols):
+    """Averages consecutive seconds of each machine, ignoring NaNs.
+
+    Arguments:
+    matrix -- time series indexed by [machine, second] (np.array)
+    max_cols -- maximum number of columns to output (int)
+
+    Returns:
+    Tuple (matrix indexed by [machine, column], seconds per column).
+    """
+
+    (rows, cols) = matrix.shape
+    secs = max(1, int(np.ceil(cols/float(max_cols))))
+    if secs == 1:
+        return (matrix, secs)
+
+    # pad to a multiple of secs, so each column is one block
+    padded = np.full((rows, int(np.ceil(cols/float(secs)))*secs), np.nan)
+    padded[:,:cols] = matrix
+    blocks = padded.reshape(rows, -1, secs)
+
+    valid = ~np.isnan(blocks)
+    with np.errstate(invalid='ignore'):
+        return (np.where(valid, blocks, 0).sum(axis=2)/valid.sum(axis=2), secs)
+
+
+data = [downsample(machine_series(log_prefix, machines, series), args.max_cols) for series in args.series]
+(start, end) = phase_parser(log_prefix, system, alg)
+
+
+###############
+# Plot data
+###############
+LABELS = {'mem': 'Memory usage', 'cpu': 'CPU usage', 'recv': 'Incoming net I/O', 'sent': 'Outgoing net I/O'}
+
+def plot_heatmaps(plt):
+    """Plots one heatmap per time series, with the phases of the run marked.
+
+    Returns:
+    Figure object (matplotlib.figure).
+    """
+
+    fig, axes = plt.subplots(len(data), 1, sharex=True, squeeze=False,
+                             figsize=(10, 1.0 + 2.5*len(data)), facecolor='w')
+    axes = axes[:,0]
+
+    for ax, series, (matrix, secs) in zip(axes, args.series, data):
+        # rows are machines 1 to N (top to bottom), in minutes since the run started
+        img = ax.imshow(np.ma.masked_invalid(matrix), aspect='auto', interpolation='nearest', cmap='viridis',
+                        extent=(0, matrix.shape[1]*secs/SEC_PER_MIN, machines + 0.5, 0.5))
+        fig.colorbar(img, ax=ax, pad=0.01).set_label(LABELS[series] + ' (' + SERIES_UNITS[series] + ')')
+        ax.set_ylabel('Machine')
+
+        # phase boundaries from the time log
+        if end > 0:
+            for t in (start, end):
+                ax.axvline(t/SEC_PER_MIN, color='w', linestyle='--', linewidth=1)
+
+    # label phases above the upper-most axis
+    if end > 0:
+        xmax = axes[0].get_xlim()[1]
+        for name, (t0, t1) in (('setup', (0, start/SEC_PER_MIN)),
+                               ('computation', (start/SEC_PER_MIN, end/SEC_PER_MIN)),
+                               ('shutdown', (end/SEC_PER_MIN, xmax))):
+            if t1 - t0 > 0.02*xmax:
+                axes[0].text((t0 + t1)/2.0, 1.02, name, transform=axes[0].get_xaxis_transform(),
+                             ha='center', va='bottom', fontsize=9)
+
+    axes[-1].set_xlabel('Time (mins)')
+    if not save_file:
+        fig.suptitle(logname)
+
+    return fig
+
+
+import matplotlib
+if save_file:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+fig = plot_heatmaps(plt)
+save_name = args.figs_dir + '/' + logname + '_heatmap'
+
+if args.save_eps:
+    plt.savefig(save_name + '.eps', format='eps', bbox_inches='tight', pad_inches=0.05)
+if args.save_png:
+    plt.savefig(save_name + '.png', format='png', dpi=200, bbox_inches='tight', pad_inches=0.05)
+
+if not save_file:
+    plt.show()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+"""Ingests log tarballs into the results store.
+
+Each tarball's log files are extracted into the <system>/<machines>/
+folder it is in (e.g., as fetched by ec2/uw-ec2.py get-logs), and every
+run in it is parsed and saved as one row of the "runs" table of an SQLite
+database, so results can be queried without regenerating the data files:
+
+  sqlite3 ../results.db "SELECT alg, graph, AVG(run) FROM runs WHERE system='gps' GROUP BY alg, graph"
+
+Tarballs are given as arguments, or read from stdin one path per line, in
+which case each is ingested as soon as its line arrives. Tarballs that
+were already ingested (same name and size) are skipped.
+"""
+
+import os, sys, glob, time
+import argparse, sqlite3, tarfile
+
+from constants import *
+from parsers import *
+
+SCRIPT_DIR=sys.path[0]
+
+###############
+# Parse args
+###############
+parser = argparse.ArgumentParser(description='Extracts log tarballs into their results folders and saves '
+                                             'the results of each run to an SQLite database.')
+parser.add_argument('tarball', type=str, nargs='*',
+                    help='tarball in a <system>/<machines>/ folder (default: read paths from stdin)')
+parser.add_argument('--store', type=str, default=SCRIPT_DIR + '/../results.db',
+                    help='SQLite database to save results to, default=' + SCRIPT_DIR + '/../results.db')
+parser.add_argument('--force', action='store_true', default=False,
+                    help='ingest tarballs even if they were already ingested')
+
+args = parser.parse_args()
+
+
+###############
+# Constants
+###############
+# per-run columns, after (system, sysmode, machines, alg, graph, log)
+RUN_STATS = (STATS[MODE_TIME] + STATS[MODE_MEM] + STATS[MODE_NET] +
+             ('master_mem', 'master_recv', 'master_sent'))
+
+SCHEMA = ("CREATE TABLE IF NOT EXISTS runs (system TEXT, sysmode TEXT, machines INTEGER, alg TEXT, graph TEXT, "
+          "log TEXT, " + ', '.join(stat + ' REAL' for stat in RUN_STATS) + ", tarball TEXT, "
+          "PRIMARY KEY (system, machines, log))",
+          "CREATE TABLE IF NOT EXISTS tarballs (system TEXT, machines INTEGER, name TEXT, bytes INTEGER, "
+          "runs INTEGER, ingested REAL, PRIMARY KEY (system, machines, name))")
+
+
+###############
+# Ingest
+###############
+def extract(tarball, target_dir):
+    """Extracts the log files of a tarball into a folder.
+
+    Arguments:
+    tarball -- path to the tarball (str)
+    target_dir -- folder to extract to (str)
+
+    Returns:
+    List of the extracted time logs, one per run.
+    """
+
+    time_logs = []
+
+    # logs may be in sub-folders (e.g., logs/), so flatten them
+    with tarfile.open(tarball) as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+
+            name = os.path.basename(member.name)
+            with open(target_dir + '/' + name, 'wb') as f:
+                f.write(tar.extractfile(member).read())
+
+            if name.endswith('_time.txt'):
+                time_logs.append(target_dir + '/' + name)
+
+    return sorted(time_logs)
+
+
+def run_parser(system, log):
+    """Parses the results of a single run.
+
+    Arguments:
+    system -- the system tested (str)
+    log -- the run's time log file (str)
+
+    Returns:
+    Tuple (sysmode, machines, alg, graph, logname) followed by the statistics
+    in RUN_STATS, which are 0 if the logs are missing.
+    """
+
+    # cut via range, in case somebody decides to put _time.txt in the path
+    logname = os.path.basename(log)[:-len('_time.txt')]
+    log_prefix = log[:-len('_time.txt')]
+    alg, graph, machines, sysmode, _ = logname.split('_')
+    machines = int(machines)
+
+    master_mem = mem_parser(log_prefix, machines, True)[2]
+    master_net = net_parser(log_prefix, machines, True)
+
+    return ((sysmode, machines, alg, graph.split('-')[0], logname) +
+            tuple(time_parser(log_prefix, system, alg)) +
+            tuple(mem_parser(log_prefix, machines)) +
+            tuple(net_parser(log_prefix, machines)) +
+            (master_mem, master_net[2], master_net[5]))
+
+
+def ingest(db, tarball):
+    """Ingests one tarball into the results store.
+
+    Arguments:
+    db -- results store (sqlite3.Connection)
+    tarball -- path to the tarball (str)
+
+    Returns:
+    Number of runs ingested, or None if the tarball was skipped.
+    """
+
+    target_dir = os.path.dirname(os.path.abspath(tarball))
+    machines = os.path.basename(target_dir)
+    system = os.path.basename(os.path.dirname(target_dir))
+    name = os.path.basename(tarball)
+
+    if system not in SYSTEMS or not machines.isdigit():
+        raise ValueError('not in a <system>/<machines>/ folder')
+
+    size = os.path.getsize(tarball)
+    if not args.force and db.execute("SELECT 1 FROM tarballs WHERE system=? AND machines=? AND name=? AND bytes=?",
+                                     (system, int(machines), name, size)).fetchone():
+        return None
+
+    runs = [(system,) + run_parser(system, log) + (name,) for log in extract(tarball, target_dir)]
+
+    # one transaction per tarball, so it is either fully ingested or not at all
+    with db:
+        if runs:
+            db.executemany("INSERT OR REPLACE INTO runs VALUES (" + ', '.join(['?']*len(runs[0])) + ")", runs)
+        db.execute("INSERT OR REPLACE INTO tarballs VALUES (?, ?, ?, ?, ?, ?)",
+                   (system, int(machines), name, size, len(runs), time.time()))
+
+    return len(runs)
+
+
+def tarballs():
+    """Gets the tarballs to ingest, from the arguments or (as they arrive) from stdin."""
+
+    if args.tarball:
+        for tarball in args.tarball:
+            yield tarball
+    else:
+        # not "for line in sys.stdin", which reads ahead in Python 2
+        for line in iter(sys.stdin.readline, ''):
+            if line.strip():
+                yield line.strip()
+
+
+db = sqlite3.connect(args.store)
+for statement in SCHEMA:
+    db.execute(statement)
+
+failed = 0
+for tarball in tarballs():
+    try:
+        runs = ingest(db, tarball)
+    except (IOError, OSError, ValueError, tarfile.TarError) as e:
+        print("%s: failed (%s)" % (tarball, e))
+        failed += 1
+    else:
+        if runs is None:
+            print("%s: already ingested" % tarball)
+        else:
+            print("%s: %i runs" % (tarball, runs))
+    sys.stdout.flush()
+
+db.close()
+sys.exit(1 if failed else 0)
@@ -0,0 +1,512 @@
+#!/usr/bin/env python
+
+"""Parsers for the log files of experiment runs, as used by gen-data.py.
+
+All times are in minutes and all memory/network values are in GB, except
+for throughputs, which are per graph edge (see tput_parser()).
+Results are indexed according to STATS in constants.py.
+"""
+
+import os, sys, glob
+import numpy as np
+
+import profiler
+from constants import *
+
+# workers may send a summary of their logs instead (see bench-finish.sh)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmark', 'common'))
+from logsummary import SUMMARY_LOG, CLOCK_LOG, read_summary, read_clock
+
+###############
+# Main parsers
+###############
+def time_parser(log_prefix, system, alg):
+    """Parses running (computation), IO (setup), and total times for a single run.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    system -- the system tested (str)
+    alg -- the algorithm tested (str)
+
+    Returns:
+    A tuple (computation time, IO time, total time) or (0,0,0) if log files are missing.
+    """
+
+    with profiler.stage('index'):
+        log_files = glob.glob(log_prefix + '_time.txt')
+    if len(log_files) != 1:
+        return (0,0,0)
+
+    def parse(log):
+        """Parses a single log file for times.
+
+        Returns: tuple (computation time, IO time, total time).
+        """
+
+        # failed runs can leave truncated time logs
+        io = run = total = 0
+
+        if system == SYS_GIRAPH:
+            for line in open(log):
+                if "Setup " in line:
+                    io = io + float(line.split()[5].split('=')[1])
+                elif "Input superstep " in line:
+                    io = io + float(line.split()[6].split('=')[1])
+                elif "Shutdown " in line:
+                    io = io + float(line.split()[5].split('=')[1])
+                elif "Total (mil" in line:
+                    total = float(line.split()[5].split('=')[1])
+
+            return ((total - io)/(MS_PER_SEC*SEC_PER_MIN),
+                    io/(MS_PER_SEC*SEC_PER_MIN),
+                    total/(MS_PER_SEC*SEC_PER_MIN))
+
+        elif system == SYS_GPS:
+            start = computestart = end = 0
+            for line in open(log):
+                if "SYSTEM_START_TIME " in line:
+                    start = float(line.split()[1])
+                elif "START_TIME " in line:
+                    computestart = float(line.split()[1])
+                elif "-1-LATEST_STATUS_TIMESTAMP " in line:
+                    end = float(line.split()[1])
+
+            return ((end - computestart)/(MS_PER_SEC*SEC_PER_MIN),
+                    (computestart - start)/(MS_PER_SEC*SEC_PER_MIN),
+                    (end - start)/(MS_PER_SEC*SEC_PER_MIN))
+
+        elif system == SYS_GRAPHLAB:
+            for line in open(log):
+                if "TOTAL TIME (sec)" in line:
+                    total = float(line.split()[3])
+                elif "Finished Running engine" in line:
+                    run = float(line.split()[4])
+
+            return (run/SEC_PER_MIN, (total - run)/SEC_PER_MIN, total/SEC_PER_MIN)
+
+        elif system == SYS_MIZAN:
+            if alg == ALG_PREMIZAN:
+                for line in open(log):
+                    if "TOTAL TIME (sec)" in line:
+                        io = float(line.split()[3])
+
+                return (0.0, io/SEC_PER_MIN, io/SEC_PER_MIN)
+            else:
+                for line in open(log):
+                    if "TIME: Total Running Time without IO =" in line:
+                        run = float(line.split()[7])
+                    elif "TIME: Total Running Time =" in line:
+                        total = float(line.split()[5])
+
+                return (run/SEC_PER_MIN, (total - run)/SEC_PER_MIN, total/SEC_PER_MIN)
+
+    return profiler.parse_file(parse, log_files[0])
+
+
+def machine_logs(log_prefix, suffix, do_master=False):
+    """Finds the log files of one kind for the workers or master of a single run.
+
+    Machines whose raw log is missing contribute their log summary instead,
+    if there is one (see benchmark/common/logsummary.py).
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    suffix -- the kind of log file, e.g. '_mem.txt' (str)
+    do_master -- True to find the master's log instead of the workers' (bool)
+
+    Returns:
+    List of log files and log summaries.
+    """
+
+    with profiler.stage('index'):
+        if do_master:
+            logs = glob.glob(log_prefix + '_0' + suffix)
+            summaries = glob.glob(log_prefix + '_0' + SUMMARY_LOG)
+        else:
+            logs = [f for f in glob.glob(log_prefix + '_*' + suffix) if '_0' + suffix not in f]
+            summaries = [f for f in glob.glob(log_prefix + '_*' + SUMMARY_LOG) if '_0' + SUMMARY_LOG not in f]
+
+    have = set(f[:-len(suffix)] for f in logs)
+    return logs + [f for f in summaries if f[:-len(SUMMARY_LOG)] not in have]
+
+
+def machine_log(machine_prefix, suffix):
+    """Gets one machine's log file of one kind, or its log summary if only that exists.
+
+    Arguments:
+    machine_prefix -- the prefix of one machine's log files, e.g. <log_prefix>_3 (str)
+    suffix -- the kind of log file, e.g. '_mem.txt' (str)
+
+    Returns:
+    Path to the log file or log summary, or None if neither exists.
+    """
+
+    for log in (machine_prefix + suffix, machine_prefix + SUMMARY_LOG):
+        if os.path.isfile(log):
+            return log
+    return None
+
+
+def machine_mem_parser(log):
+    """Parses a single machine's mem log file (or log summary).
+
+    Returns: the max memory usage in GB.
+    """
+
+    if log.endswith(SUMMARY_LOG):
+        mem = read_summary(log)['mem']
+        return (mem['max'] - mem['min'])/KB_PER_GB
+
+    # note that this "mems" is the memory usage (per second) of a SINGLE machine
+    mems = [float(line.split()[2]) for line in open(log).readlines()]
+    return (max(mems) - min(mems))/KB_PER_GB
+
+
+def machine_net_parser(log):
+    """Parses a single machine's nbt (network bytes total) log file (or log summary).
+
+    Returns: (recv, sent) tuple in GB.
+    """
+
+    if log.endswith(SUMMARY_LOG):
+        (recv, sent) = read_summary(log)['nbt']
+        return (recv/BYTE_PER_GB, sent/BYTE_PER_GB)
+
+    # bash equivalent:
+    # recv=$((-$(cat "$log" | grep "eth0" | awk '{print $2}' | tr '\n' '+')0))
+    # sent=$((-$(cat "$log" | grep "eth0" | awk '{print $10}' | tr '\n' '+')0))
+    recv = 0
+    sent = 0
+
+    for line in open(log).readlines():
+        # lines appear as initial followed by final, so this does the correct computation
+        if "eth0" in line:
+            recv = float(line.split()[1]) - recv
+            sent = float(line.split()[9]) - sent
+
+    return (recv/BYTE_PER_GB, sent/BYTE_PER_GB)
+
+
+def mem_parser(log_prefix, machines, do_master=False):
+    """Parses memory usage of a single run.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    machines -- number of machines tested (int)
+    do_master -- True to parse the master's logs instead of the workers' (bool)
+
+    Returns:
+    A tuple (minimum mem, maximum mem, avg mem), where "mem" corresponds to
+    the max memory used at each machine (GB), or (0,0,0) if logs are missing.
+    """
+
+    log_files = machine_logs(log_prefix, '_mem.txt', do_master)
+
+    if len(log_files) < (1 if do_master else machines):
+        return (0,0,0)
+
+    # list of each machine's maximum memory usage
+    mems = np.array([profiler.parse_file(machine_mem_parser, log) for log in log_files])
+
+    return (np.min(mems), np.max(mems), np.mean(mems))
+
+
+def net_parser(log_prefix, machines, do_master=False):
+    """Parses network usage of a single run.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    machines -- number of machines tested (int)
+    do_master -- True to parse the master's logs instead of the workers' (bool)
+
+    Returns:
+    A tuple (min recv, max recv, avg recv, min sent, max sent, avg sent),
+    where recv/sent is the network data received/sent across worker machines (GB),
+    or (0,0,0,0,0,0) if logs are missing.
+    """
+
+    log_files = machine_logs(log_prefix, '_nbt.txt', do_master)
+
+    if len(log_files) < (1 if do_master else machines):
+        return (0,0,0,0,0,0)
+
+    eth = [profiler.parse_file(machine_net_parser, log) for log in log_files]
+    eth = np.array(zip(*eth))
+    return (np.min(eth[0]), np.max(eth[0]), np.mean(eth[0]),
+            np.min(eth[1]), np.max(eth[1]), np.mean(eth[1]))
+
+
+def tput_parser(log_prefix, system, alg, machines, do_master, edges):
+    """Parses the throughput of a single run, normalized by the graph's size.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    system -- the system tested (str)
+    alg -- the algorithm tested (str)
+    machines -- number of machines tested (int)
+    do_master -- True to parse the master's logs instead of the workers' (bool)
+    edges -- number of edges in the input graph, from dataset_parser() (int)
+
+    Returns:
+    A tuple (edges per sec, mem bytes per edge, recv bytes per edge, sent bytes per edge).
+    Edges per sec is over the computation time. Bytes per edge are the totals across
+    worker machines, i.e., the average machine's usage per edge that it holds.
+    Values are 0 if their log files are missing.
+    """
+
+    # averages are per machine, so scale them up to the totals
+    scale = (1 if do_master else machines)*BYTE_PER_GB/edges
+
+    run = time_parser(log_prefix, system, alg)[0]
+    mem = mem_parser(log_prefix, machines, do_master)[2]
+    net = net_parser(log_prefix, machines, do_master)
+
+    return (0.0 if run == 0 else edges/(run*SEC_PER_MIN),
+            mem*scale, net[2]*scale, net[5]*scale)
+
+
+def experiment_parser(exp_prefix, machines, system, alg, mode, do_master=False, dataset=None):
+    """Parses multiple runs of a single experiment.
+
+    Arguments:
+    exp_prefix -- the prefix of the experiment's log files (str)
+    machines -- number of machines tested (str)
+    system -- the system tested (str)
+    alg -- the algorithm tested (str)
+    mode -- MODE_TIME, MODE_MEM, or MODE_NET (int)
+    do_master -- True to parse the master's mem/net logs instead of the workers' (bool)
+    dataset -- (vertices, edges, bytes) of the input graph, needed for MODE_TPUT (tuple)
+
+    Returns:
+    List of tuples, with each tuple indexed according to STATS[mode].
+    Each tuple gives the individual results for one experiment run
+    (so, e.g., 5 runs per experiment gives a list of 5 tuples).
+    Missing logs will result in tuples of 0s.
+    """
+
+    # NOTE: the difference between "experiment" and "run"
+    # is whether or not the prefix name has a timestamp.
+    #
+    # E.g., pagerank_orkut-adj.txt_16_0 is an experiment, while
+    # pagerank_orkut-adj.txt_16_0_20140101-123050 is one run of
+    # that experiment.
+
+    parser_funcs = (time_parser, mem_parser, net_parser, tput_parser)
+    other_args = ([system, alg], [int(machines), do_master], [int(machines), do_master],
+                  [system, alg, int(machines), do_master, dataset[1] if dataset else 0])
+
+    # match all runs of this experiment
+    # NOTE: use sorted(glob.glob(...)) to get runs in order of their log names
+    with profiler.stage('index'):
+        exp_logs = glob.glob(exp_prefix + '_*_time.txt')
+
+    if len(exp_logs) == 0:
+        return [(0,)*len(STATS[mode])];
+
+    # stripping _time.txt gives prefix for a single run
+    with profiler.stage('parse_' + MODE_NAMES[mode]):
+        return [parser_funcs[mode](run_prefix[:-len('_time.txt')], *other_args[mode])
+                for run_prefix in exp_logs]
+
+
+###############
+# Time series
+###############
+# per-machine log files and units of each time series
+SERIES_LOGS = {'mem': '_mem.txt', 'cpu': '_cpu.txt', 'recv': '_net.txt', 'sent': '_net.txt'}
+SERIES_UNITS = {'mem': 'GB', 'cpu': '%', 'recv': 'MB/s', 'sent': 'MB/s'}
+
+def series_parser(log, series):
+    """Parses the per-second samples of one machine's mem, cpu, or net log.
+
+    Arguments:
+    log -- path to the machine's log file, or its log summary (str)
+    series -- 'mem' (used memory), 'cpu' (busy %), 'recv' or 'sent' (eth0 rate) (str)
+
+    Returns:
+    Numpy array of samples, one per second since monitoring started.
+    """
+
+    if log.endswith(SUMMARY_LOG):
+        samples = np.array(read_summary(log, True)[series]['samples'])
+        return samples/{'mem': KB_PER_GB, 'cpu': 1.0}.get(series, MB_PER_GB)
+
+    elif series == 'mem':
+        # each line is "-/+ buffers/cache: used free", so take every 4th token
+        tokens = open(log).read().split()
+        return np.array(tokens[2:len(tokens) - len(tokens) % 4:4], dtype=float)/KB_PER_GB
+
+    elif series == 'cpu':
+        # sar's last column is %idle (Average lines are printed if sar exits cleanly)
+        return 100.0 - np.array([line.rsplit(None, 1)[1] for line in open(log)
+                                 if ' all ' in line and not line.startswith('Average')], dtype=float)
+
+    else:
+        lines = [line for line in open(log) if ' eth0 ' in line and not line.startswith('Average')]
+        if len(lines) == 0:
+            return np.zeros(0)
+
+        # eth0 is followed by rxpck/s, txpck/s, rxkB/s, txkB/s, ...
+        # (the time can be split in two by AM/PM, but it's the same for all lines)
+        col = lines[0].split().index('eth0') + (3 if series == 'recv' else 4)
+        return np.array([line.split(None, col + 1)[col] for line in lines], dtype=float)/MB_PER_GB
+
+
+def hostname_parser(log):
+    """Gets a machine's hostname from the header of its cpu (sar) log (or log summary).
+
+    Returns: the hostname (str), or None if the header is missing.
+    """
+
+    if log.endswith(SUMMARY_LOG):
+        return read_summary(log)['host']
+
+    # e.g., "Linux 3.2.0-58-virtual (cw1) \t01/01/2014 \t_x86_64_\t(4 CPU)"
+    line = open(log).readline()
+    if line.startswith('Linux') and '(' in line:
+        return line.split('(', 1)[1].split(')', 1)[0]
+    return None
+
+
+def clock_parser(machine_prefix):
+    """Parses one machine's clock log (or log summary), as written by bench-init.sh.
+
+    Arguments:
+    machine_prefix -- the prefix of one machine's log files, e.g. <log_prefix>_3 (str)
+
+    Returns:
+    Dictionary as in logsummary.read_clock(), but with 'start' (when the
+    machine's monitoring started) by the master's clock, or {} if the log
+    or the machine's clock offset is missing.
+    """
+
+    log = machine_log(machine_prefix, CLOCK_LOG)
+    if log is None:
+        return {}
+
+    clock = read_summary(log)['clock'] if log.endswith(SUMMARY_LOG) else read_clock(log)
+    if 'start' not in clock or 'offset' not in clock:
+        return {}
+
+    clock = dict(clock)
+    clock['start'] -= clock['offset']
+    return clock
+
+
+def machine_series(log_prefix, machines, series):
+    """Parses a time series of every worker machine of a single run.
+
+    If the run has clock logs (see clock_parser()), every machine's samples
+    are put on the master's timeline: seconds are since the master's
+    monitoring started, and samples are interpolated to whole seconds.
+    Otherwise, each machine's seconds are since its own monitoring started.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    machines -- number of machines tested (int)
+    series -- 'mem', 'cpu', 'recv' or 'sent' (see series_parser()) (str)
+
+    Returns:
+    Numpy array indexed by [machine - 1, second], where seconds outside
+    a machine's log (or all, if the log is missing) are NaN.
+    """
+
+    t0 = clock_parser(log_prefix + '_0').get('start')
+
+    samples = []
+    shifts = []
+    for i in range(1, machines + 1):
+        log = machine_log(log_prefix + '_' + str(i), SERIES_LOGS[series])
+        samples.append(profiler.parse_file(lambda l: series_parser(l, series), log)
+                       if log else np.zeros(0))
+
+        start = clock_parser(log_prefix + '_' + str(i)).get('start') if t0 is not None else None
+        shifts.append(start - t0 if start is not None else 0.0)
+
+    seconds = int(np.ceil(max([0] + [shift + len(s) for shift, s in zip(shifts, samples)])))
+    matrix = np.full((machines, seconds), np.nan)
+    for i, (shift, s) in enumerate(zip(shifts, samples)):
+        if shift == 0:
+            matrix[i,:len(s)] = s
+        elif len(s) > 0:
+            # sample k was taken shift + k seconds into the master's timeline
+            matrix[i] = np.interp(np.arange(seconds), shift + np.arange(len(s)), s,
+                                  left=np.nan, right=np.nan)
+    return matrix
+
+
+def phase_parser(log_prefix, system, alg):
+    """Parses when the computation phase of a single run starts and ends.
+
+    Arguments:
+    log_prefix -- the prefix of one experiment run's log files (str)
+    system -- the system tested (str)
+    alg -- the algorithm tested (str)
+
+    Returns:
+    A tuple (start, end) in seconds since the run started, or (0,0) if
+    the time log is missing. Setup is before start, and Giraph's shutdown
+    is after end. If the run has clock logs, seconds are instead on the
+    same timeline as machine_series().
+    """
+
+    (run, io, total) = time_parser(log_prefix, system, alg)
+
+    # Giraph's I/O time also includes shutdown
+    shutdown = 0
+    if system == SYS_GIRAPH and os.path.isfile(log_prefix + '_time.txt'):
+        for line in open(log_prefix + '_time.txt'):
+            if "Shutdown " in line:
+                shutdown = float(line.split()[5].split('=')[1])/MS_PER_SEC
+
+    end = total*SEC_PER_MIN - shutdown
+    (start, end) = (end - run*SEC_PER_MIN, end)
+
+    clock = clock_parser(log_prefix + '_0')
+    if end <= 0 or 'start' not in clock:
+        return (start, end)
+
+    if system == SYS_GPS:
+        # GPS logs when computation starts and ends by the master's clock (ms)
+        for line in open(log_prefix + '_time.txt'):
+            if "SYSTEM_START_TIME " in line:
+                pass
+            elif "START_TIME " in line:
+                start = float(line.split()[1])/MS_PER_SEC - clock['start']
+            elif "-1-LATEST_STATUS_TIMESTAMP " in line:
+                end = float(line.split()[1])/MS_PER_SEC - clock['start']
+        return (start, end)
+
+    # other systems' times are relative to when the run started
+    shift = clock['run'] - clock['start'] if 'run' in clock else 0
+    return (start + shift, end + shift)
+
+
+###############
+# Dataset index
+###############
+def graph_file(alg, graph):
+    """Gets the name of an experiment's input graph file (e.g., orkut-adj.txt).
+
+    Note that premizan partitions the SNAP graph (e.g., orkut.txt),
+    which has the same edges as the adjacency list.
+    """
+    return graph + ('-mst-adj.txt' if alg == ALG_MST else '-adj.txt')
+
+
+def dataset_parser(index_file):
+    """Parses the dataset index written by benchmark/datasets/dataset-stats.sh.
+
+    Arguments:
+    index_file -- path to the index, with "file vertices edges bytes" lines (str)
+
+    Returns:
+    Dictionary of graph file names to tuples (vertices, edges, bytes).
+    """
+
+    datasets = {}
+    for line in open(index_file):
+        if line.strip() and not line.startswith('#'):
+            name, vertices, edges, size = line.split()
+            datasets[name] = (int(vertices), int(edges), int(size))
+    return datasets
@@ -1,20 +1,23 @@
 #!/bin/bash -e
 
-./plot.py 0 --save-eps
-./plot.py 0 --save-eps --total-time
-./plot.py 1 --save-eps
-./plot.py 1 --save-eps --plot-sum
-./plot.py 2 --save-eps --plot-sum
-./plot.py 2 --save-eps
+# one process renders every variant, loading each data file only once
+./plot.py --batch - <<VARIANTS
+0 --save-eps
+0 --save-eps --total-time
+1 --save-eps
+1 --save-eps --plot-sum
+2 --save-eps --plot-sum
+2 --save-eps
 
-./plot-with-cuts.py 0 --save-eps
-./plot-with-cuts.py 2 --save-eps
+0 --cut --save-eps
+2 --cut --save-eps
 
-./plot.py 1 --master --save-eps
-./plot.py 2 --master --save-eps
+1 --master --save-eps
+2 --master --save-eps
 
-./plot.py 1 --premizan --save-eps
-./plot.py 2 --premizan --save-eps --plot-sum
-./plot.py 2 --premizan --save-eps
-./plot.py 1 --premizan --master --save-eps
-./plot.py 2 --premizan --master --save-eps
\ No newline at end of file
+1 --premizan --save-eps
+2 --premizan --save-eps --plot-sum
+2 --premizan --save-eps
+1 --premizan --master --save-eps
+2 --premizan --master --save-eps
+VARIANTS
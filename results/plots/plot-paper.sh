@@ -1,8 +1,10 @@
 #!/bin/bash -e
 
-./plot.py 0 --save-paper
-./plot.py 1 --save-paper --plot-max
-./plot.py 2 --save-paper --plot-sum
+./plot.py --batch - <<VARIANTS
+0 --save-paper
+1 --save-paper --plot-max
+2 --save-paper --plot-sum
 
-./plot-with-cuts.py 0 --save-paper
-./plot-with-cuts.py 2 --save-paper
\ No newline at end of file
+0 --cut --save-paper
+2 --cut --save-paper
+VARIANTS
@@ -0,0 +1,1462 @@
+#!/usr/bin/env python
+
+"""Plotting engine for plot.py.
+
+Each figure is rendered by render_figure(), which only depends on the
+plot options, the figure's spec, and the figure's slice of the data.
+This lets figures be rendered in parallel by separate processes.
+"""
+
+import os, collections, itertools, hashlib, json
+import numpy as np
+
+import profiler
+from constants import *
+
+###############
+# Options
+###############
+# Options given to plot.py (see its help). Note that save_eps is
+# also True if save_paper is True, and plot_sum is True if cut is True.
+PlotOptions = collections.namedtuple('PlotOptions',
+                                     ('mode', 'master', 'premizan', 'total_time',
+                                      'plot_sum', 'plot_avg', 'plot_max', 'cut',
+                                      'save_png', 'save_eps', 'save_paper', 'figs_dir'))
+
+# One figure to render, for one algorithm (ai), graph (gi), and plot type.
+# si and mi are the system and machine indices to plot (see figure_specs()).
+# cut is the figure's entry in CUTS if it has a broken y-axis, or None.
+FigureSpec = collections.namedtuple('FigureSpec',
+                                    ('plt_type', 'save_name', 'title', 'ai', 'gi', 'si', 'mi', 'width', 'cut'))
+
+
+def saving(opts):
+    """Returns True if plots are saved rather than displayed."""
+    return opts.save_png or opts.save_eps or opts.save_paper
+
+
+###############
+# Load data
+###############
+# data file generated by gen-data.py for each mode, as (workers, master)
+DATA_FILES = (('data_time.py', 'data_time.py'),
+              ('data_mem.py', 'data_mem_master.py'),
+              ('data_net.py', 'data_net_master.py'),
+              ('data_tput.py', 'data_tput_master.py'))
+
+def load_data(mode, do_master, data_dir, keep=None):
+    """Loads a data file generated by gen-data.py.
+
+    Arguments:
+    mode -- MODE_TIME, MODE_MEM, or MODE_NET (int)
+    do_master -- True to load the master's mem/net data (bool)
+    data_dir -- folder with the data files (str)
+    keep -- only load variables containing one of these strings, or None for all (tuple)
+
+    Returns:
+    Dictionary of variable names to values.
+    """
+
+    # faster than importing a few thousand globals, and doesn't
+    # clash when loading both the master's and workers' data
+    data = {}
+    for line in open(data_dir + '/' + DATA_FILES[mode][do_master]):
+        if ' = ' in line and (keep is None or any(k in line for k in keep)):
+            name, val = line.split(' = ')
+            data[name] = float(val)
+    return data
+
+
+###############
+# Format data
+###############
+# Genneral conventions:
+#
+# For each plot, bars represent a particular system in a partciular mode.
+# Bars are clustered/grouped by the number of machines used in the experiment.
+# Finally, plots are separated into different figures based on algorithm + graph.
+#
+# Additionally, each "mode" (time, mem, or net) can have multiple different
+# "plot types". These are just extra figures that display more data.
+#
+# E.g., using gen-data's output variable names:
+#
+# <giraph_0>_<16>_<pagerank_livejournal>_<run_avg>
+# single bar   ^         figure            value
+#          bar group
+
+
+## Matrix for one alg and one graph, with rows indexed by system + system mode
+## and columns indexed by number of machines
+#alg_graph_run_avg = [[system + '_' + sysmode + '_' + machines + '_alg_graph_run_avg'
+#                      for machines in MACHINES]
+#                     for (system,sysmode) in ALL_SYS]
+#
+## Tuple of matrices for a particular algorithm
+#alg_run_avg = [[[system + '_' sysmode + '_' + machines + '_alg_' + graph + '_run_avg'
+#                 for machines in MACHINES]
+#                for (system,sysmode) in ALL_SYS]
+#               for graph in GRAPHS]
+#
+## Tuple of tuples of matrics for one particular statistic
+#run_avg = = [[[[system + '_' + sysmode + '_' + machines + '_' + alg + '_' + graph + '_run_avg'
+#                for (system,sysmode) in ALL_SYS]
+#               for machines in MACHINES]
+#              for graph in GRAPHS]
+#             for alg in ALGS]
+
+def stat_matrix(data, alg, graph, stat):
+    """Gets a statistic of one alg and graph, as a matrix indexed by [system, machines]."""
+    return [[data[system + '_' + sysmode + '_' + machines + '_' + alg + '_' + graph + '_' + stat]
+             for machines in MACHINES]
+            for (system,sysmode) in ALL_SYS]
+
+
+def premizan_matrix(data, graph, stat):
+    """Gets a statistic of premizan for one graph, as a matrix indexed by [system, machines].
+
+    All rows are 0s, except for Mizan's row, which holds the premizan stats.
+    """
+
+    # "+" between matrices joins Mizan row (premizan data) with the 0s matrix.
+    # TODO: constants hacked in..
+    return ([[0]*len(MACHINES)]*(len(ALL_SYS)-3)      # Giraph, GPS
+            + [[data[SYS_MIZAN + '_' + SYSMODE_HASH + '_' + machines + '_' + ALG_PREMIZAN + '_' + graph + '_' + stat]
+                for machines in MACHINES]]
+            + [[0]*len(MACHINES)]*2)                  # GraphLab
+
+
+def build_stats(data, mode, do_premizan):
+    """Builds the stats matrices used for plotting.
+
+    Arguments:
+    data -- dictionary from load_data() (dict)
+    mode -- MODE_TIME, MODE_MEM, or MODE_NET (int)
+    do_premizan -- True to plot premizan instead of the algorithms (bool)
+
+    Returns:
+    Tuple (stats_dict, premizan_dict, algs). stats_dict maps each statistic
+    to an array indexed by [alg, graph, system, machines], premizan_dict
+    maps them to an array indexed by [graph, system, machines], and algs
+    are the algorithms in stats_dict.
+    """
+
+    stats_dict = {stat + suffix: np.array([[stat_matrix(data, alg, graph, stat + suffix)
+                                            for graph in GRAPHS]
+                                           for alg in ALGS])
+                  for (stat,suffix) in itertools.product(STATS[mode],('_avg', '_ci'))}
+
+    # Premizan is special case. Each entry is a tuple of matrices,
+    # whose rows are all 0s except for the Mizan row. This Mizan row
+    # holds premizan stats.
+    #
+    # This setup is only relevant for plotting time (which needs permizan
+    # as an extra I/O add-on for Mizan).
+    premizan_dict = {stat + suffix: np.array([premizan_matrix(data, graph, stat + suffix)
+                                              for graph in GRAPHS])
+                     for (stat,suffix) in itertools.product(STATS[mode],('_avg', '_ci'))}
+
+    # Simple way to handle premizan: just plot 0s for all the other systems.
+    if do_premizan:
+        stats_dict = {key: np.array([val]) for key, val in premizan_dict.items()}
+        premizan_dict = {key: np.array([[[0]*len(MACHINES)]*len(ALL_SYS)]*len(GRAPHS)) for key in premizan_dict}
+        return (stats_dict, premizan_dict, (ALG_PREMIZAN,))
+
+    return (stats_dict, premizan_dict, ALGS)
+
+
+def data_slice(stats_dict, premizan_dict, ai, gi):
+    """Gets the data needed to render one figure.
+
+    Returns:
+    Dictionary mapping each statistic (and 'premizan_' + statistic)
+    to a matrix indexed by [system, machines].
+    """
+
+    data = {key: val[ai,gi] for key, val in stats_dict.items()}
+    data.update(('premizan_' + key, val[gi]) for key, val in premizan_dict.items())
+    return data
+
+
+def load_slice(mode, do_master, do_premizan, data_dir, alg, graph):
+    """Loads only the data needed to render one alg and graph's figures.
+
+    This is a faster equivalent of load_data(), build_stats(), and
+    data_slice(), as only this alg and graph's variables are parsed.
+
+    Arguments:
+    mode -- MODE_TIME, MODE_MEM, or MODE_NET (int)
+    do_master -- True to load the master's mem/net data (bool)
+    do_premizan -- True to plot premizan instead of the algorithms (bool)
+    data_dir -- folder with the data files (str)
+    alg -- algorithm, ignored if do_premizan is True (str)
+    graph -- graph (str)
+
+    Returns:
+    Same as data_slice().
+    """
+
+    data = load_data(mode, do_master, data_dir,
+                     ('_' + alg + '_' + graph + '_', '_' + ALG_PREMIZAN + '_' + graph + '_'))
+    stats = [stat + suffix for (stat,suffix) in itertools.product(STATS[mode],('_avg', '_ci'))]
+
+    premizan = {stat: np.array(premizan_matrix(data, graph, stat)) for stat in stats}
+
+    # same as build_stats()
+    if do_premizan:
+        data = dict(premizan)
+        data.update(('premizan_' + stat, np.array([[0]*len(MACHINES)]*len(ALL_SYS))) for stat in stats)
+        return data
+
+    data = {stat: np.array(stat_matrix(data, alg, graph, stat)) for stat in stats}
+    data.update(('premizan_' + stat, val) for stat, val in premizan.items())
+    return data
+
+
+####################
+# Plot constants
+####################
+def plot_types(opts):
+    """Gets the plot types for the mode, as their save-file suffixes."""
+
+    # defaults
+    TIME_TYPE = ('time',)
+    MEM_TYPE = ('mem',)
+    NET_TYPE = ('recv', 'sent')
+    TPUT_TYPE = ('eps', 'mem_bpe', 'recv_bpe', 'sent_bpe')
+
+    # options
+    if opts.total_time:
+        TIME_TYPE = ('time_tot',)
+
+    # master is single machine, so min = max = avg = sum
+    if not opts.master:
+        if opts.plot_sum:
+            MEM_TYPE = ('mem_sum',)
+            NET_TYPE = ('recv_sum','sent_sum')
+        elif opts.plot_avg:
+            MEM_TYPE = ('mem_avg',)
+            NET_TYPE = ('recv_avg','sent_avg')
+        elif opts.plot_max:
+            MEM_TYPE = ('mem_max',)
+            NET_TYPE = ('recv_max','sent_max')
+
+    return (TIME_TYPE, MEM_TYPE, NET_TYPE, TPUT_TYPE)[opts.mode]
+
+
+## decoration (np.array needed for advanced indexing)
+# more chars = denser patterns; can also mix and match different ones
+PATTERNS = np.array(('..','*',             # Giraph
+                     '///','o','\\\\\\',   # GPS
+                     'xx',                 # Mizan
+                     '++', 'O'))           # GraphLab
+
+# old: #ff7f00 (orange), #1f78b4 (blue), #7ac36a (darker green)
+COLORS = np.array(('#faa75b','#faa75b',            # Giraph
+                   '#5a9bd4','#5a9bd4','#5a9bd4',  # GPS
+                   '#b2df8a',                      # Mizan
+                   '#eb65aa','#eb65aa'))           # GraphLab
+
+COLOR_PREMIZAN = '#737373'
+COLOR_IO = (0.9, 0.9, 0.9)
+COLOR_ERR = (0.3, 0.3, 0.3)
+
+## labels
+LEGEND_LABELS = ('Giraph (byte array)', 'Giraph (hash map)',
+                 'GPS (none)', 'GPS (LALP)', 'GPS (dynamic)',
+                 'Mizan (static)',
+                 'Graphlab (sync)', 'GraphLab (async)')
+
+# all possible graph labels
+# must be an array, b/c we use np's list slicing
+GRAPH_LABELS = np.array((('LJ (16)', 'LJ (32)', 'LJ (64)', 'LJ (128)'),
+                         ('OR (16)', 'OR (32)', 'OR (64)', 'OR (128)'),
+                         ('AR (16)', 'AR (32)', 'AR (64)', 'AR (128)'),
+                         ('TW (16)', 'TW (32)', 'TW (64)', 'TW (128)'),
+                         ('UK (16)', 'UK (32)', 'UK (64)', 'UK (128)')))
+
+def font_sizes(opts):
+    """Gets the font sizes for axes, text values on top of bars, and the "F" of failed bars.
+
+    Returns: tuple (FONTSIZE, VAL_FONTSIZE, F_FONTSIZE).
+    """
+
+    if opts.save_paper:
+        return (20, 4, 12)
+    elif saving(opts):
+        return (12, 3, 11)
+    else:
+        return (12, 8, 12)    # 12 is default
+
+## misc values
+# left/right margins of each bar group
+BAR_MARGIN = 0.05
+
+# how much extra space to leave at the top of each plot
+YMAX_FACTOR = 1.05
+
+# location of bar groups (changes depending on # of machines)
+IND = np.array([np.arange(len(g))+BAR_MARGIN for g in GRAPH_LABELS])
+
+# Figures with a broken (cut) y-axis, keyed by plot type, alg and graph.
+# Each is a tuple of the y-limits of the top and bottom axes, as (ymin, ymax),
+# followed by their y-ticks, as (start, end, spacing).
+CUTS = {('time', ALG_PR, GRAPH_TW):      ((105, 120), (0, 35), (110, 121, 10), (0, 32, 10)),
+        ('time', ALG_WCC, GRAPH_TW):     ((80, 95), (0, 9), (85, 96, 10), (0, 9, 2)),
+
+        ('recv_sum', ALG_PR, GRAPH_LJ):  ((680, 1200), (0, 165), (800, 1201, 200), (0, 151, 30)),
+        ('recv_sum', ALG_PR, GRAPH_OR):  ((5800, 7000), (0, 540), (6000, 7001, 500), (0, 501, 100)),
+        ('recv_sum', ALG_PR, GRAPH_AR):  ((4300, 4800), (0, 1700), (4400, 4801, 200), (0, 1601, 400)),
+        ('recv_sum', ALG_PR, GRAPH_UK):  ((12050, 12300), (0, 6400), (12100, 12301, 100), (0, 6001, 1000)),
+        ('recv_sum', ALG_SSSP, GRAPH_LJ): ((850, 1100), (0, 110), (900, 1101, 100), (0, 101, 20)),
+        ('recv_sum', ALG_SSSP, GRAPH_OR): ((290, 350), (0, 130), (300, 351, 25), (0, 121, 30)),
+        ('recv_sum', ALG_SSSP, GRAPH_AR): ((1500, 2500), (0, 860), (1700, 2501, 400), (0, 801, 200)),
+        ('recv_sum', ALG_SSSP, GRAPH_TW): ((3100, 3500), (0, 1800), (3200, 3501, 150), (0, 2000, 400)),
+
+        ('sent_sum', ALG_PR, GRAPH_LJ):  ((700, 1100), (0, 160), (800, 1101, 150), (0, 151, 30)),
+        ('sent_sum', ALG_PR, GRAPH_OR):  ((5800, 7000), (0, 540), (6000, 7001, 500), (0, 501, 100)),
+        ('sent_sum', ALG_PR, GRAPH_AR):  ((4300, 4800), (0, 1650), (4400, 4801, 200), (0, 1651, 300)),
+        ('sent_sum', ALG_PR, GRAPH_UK):  ((11950, 12200), (0, 6400), (12000, 12201, 100), (0, 6001, 1000)),
+        ('sent_sum', ALG_SSSP, GRAPH_LJ): ((850, 1100), (0, 110), (900, 1101, 100), (0, 101, 20)),
+        ('sent_sum', ALG_SSSP, GRAPH_OR): ((280, 350), (0, 130), (300, 351, 25), (0, 130, 30)),
+        ('sent_sum', ALG_SSSP, GRAPH_AR): ((1500, 2500), (0, 850), (1700, 2501, 400), (0, 801, 200)),
+        ('sent_sum', ALG_SSSP, GRAPH_TW): ((3100, 3400), (0, 1800), (3200, 3401, 100), (0, 2000, 400))}
+
+
+####################
+# Plot functions
+####################
+# label formats indexed by mode
+LABEL_FORMAT = ('%0.2f', '%0.2f', '%0.1f', '%0.1f')
+
+def autolabel(plt, opts, bar, yshift=0):
+    """Labels a bar with text values.
+
+       yshift - shifts label's y-location by +yshift
+    """
+    (FONTSIZE, VAL_FONTSIZE, F_FONTSIZE) = font_sizes(opts)
+
+    # get_y() needed to output proper total time
+    height = bar.get_height() + bar.get_y()
+
+    # values will never be small enough to cause issues w/ this comparison
+    if height == 0:
+        plt.text(bar.get_x()+bar.get_width()/2, 0, 'F',
+                 ha='center', va='bottom', fontsize=F_FONTSIZE)
+    else:
+        if not opts.save_paper:
+            plt.text(bar.get_x()+bar.get_width()/2.0, height*1.005 + yshift, LABEL_FORMAT[opts.mode]%float(height),
+                     ha='center', va='bottom', fontsize=VAL_FONTSIZE)
+
+
+def premizan_stats(data, si):
+    """Gets premizan's setup time avg and CI, with 0s where the computation time is 0 (i.e., failed run).
+
+    Returns: tuple (avg, ci) of matrices indexed by [system, machines].
+    """
+
+    premizan_avg = np.array([[0.0 if data['run_avg'][si][i,j] == 0 else val
+                              for j,val in enumerate(arr)]
+                             for i,arr in enumerate(data['premizan_io_avg'][si])])
+
+    premizan_ci = np.array([[0.0 if data['run_avg'][si][i,j] == 0 else val
+                             for j,val in enumerate(arr)]
+                            for i,arr in enumerate(data['premizan_io_ci'][si])])
+
+    return (premizan_avg, premizan_ci)
+
+
+def plot_time_tot(plt, fig, opts, spec, data, ind):
+    """Plots total computation time (separated into I/O, premizan, and computation time).
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    # TODO: strings are hard coded...
+    (si, mi, width) = (spec.si, spec.mi, spec.width)
+
+    # this is generated implicitly by default, but we need to return it
+    ax = plt.subplot()
+
+    # don't show premizan bar if comuptation time is 0 (i.e., failed run)
+    (premizan_avg, premizan_ci) = premizan_stats(data, si)
+
+    # add premizan's CI in quadrature, since they're independent variables
+    tot_ci = np.sqrt(np.power(data['tot_ci'][si], 2) + np.power(premizan_ci, 2))
+
+
+    # Each (implicit) iteration plots one system+sysmode in different groups (= # of machines).
+    # "+" does element-wise add as everything is an np.array.
+    plt_tot = [plt.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+                       ecolor=COLOR_ERR, yerr=ci[mi], align='edge', bottom=pm[mi])
+               for i,(avg,ci,pm,col,pat) in enumerate(zip(data['tot_avg'][si],
+                                                          tot_ci,
+                                                          premizan_avg,
+                                                          COLORS[si],
+                                                          PATTERNS[si]))]
+
+    plt_io = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_IO,
+                      ecolor=COLOR_ERR, align='edge')
+              for i,(avg) in enumerate(data['io_avg'][si])]
+
+    # we slice everything explicitly, b/c si need not start at 0
+    plt_pm = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_PREMIZAN,
+                      ecolor=COLOR_ERR, align='edge', bottom=io[mi])
+              for i,(avg,io) in enumerate(zip(premizan_avg,
+                                              data['io_avg'][si]))]
+
+    # label with total time (if not for paper.. otherwise it clutters things)
+    for bars in plt_tot:
+        for bar in bars:
+            autolabel(plt, opts, bar)
+
+    #plt.ylim(ymax=np.max(data['run_avg'][si] + data['run_ci'][si]
+    #                     + data['premizan_io_avg'][si]
+    #                     + data['io_avg'][si])*YMAX_FACTOR)
+
+    plt.ylabel('Total time (mins)')
+
+    return (ax,)
+
+
+#def plot_time_run(plt, fig, opts, spec, data, ind):
+#    """Plots computation time only.
+#
+#    Arguments:
+#    plt -- matplotlib.pyplot being used
+#    fig -- figure object (matplotlib.figure)
+#    opts -- plot options (PlotOptions)
+#    spec -- figure being plotted (FigureSpec)
+#    data -- figure's data, from data_slice() (dict)
+#    ind -- left x-location of each bar group (list)
+#
+#    Returns:
+#    Tuple of axes.
+#    """
+#
+#    (si, mi, width) = (spec.si, spec.mi, spec.width)
+#    ax = plt.subplot()
+#
+#    plt_run = [plt.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+#                       ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+#               for i,(avg,ci,col,pat) in enumerate(zip(data['run_avg'][si],
+#                                                       data['run_ci'],
+#                                                       COLORS,
+#                                                       PATTERNS))]
+#
+#    # label bars with computation times
+#    for bars in plt_run:
+#        for bar in bars:
+#            autolabel(plt, opts, bar)
+#
+#    #plt.ylim(ymax=np.max(data['run_avg'][si] + data['run_ci'][si])*YMAX_FACTOR)
+#
+#    plt.ylabel('Computation time (mins)')
+#    return (ax,)
+
+
+def plot_time_split(plt, fig, opts, spec, data, ind):
+    """Plots I/O + premizan time and computation times in vertically separated subplots.
+
+    This is basically a variant of plot_time_tot, where we don't stack the computation
+    time on top of the I/O bars.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    from matplotlib.ticker import MaxNLocator
+
+    (si, mi, width) = (spec.si, spec.mi, spec.width)
+
+    ax_run = plt.subplot(211)
+    plt_run = [plt.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+                       ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+               for i,(avg,ci,col,pat) in enumerate(zip(data['run_avg'][si],
+                                                       data['run_ci'][si],
+                                                       COLORS[si],
+                                                       PATTERNS[si]))]
+
+    # label bars with their values
+    for bars in plt_run:
+        for bar in bars:
+            autolabel(plt, opts, bar)
+
+    # using sharey ensures both y-axis are of same scale... but it can waste a lot of space
+    #ax_io = plt.subplot(2, 1, 2, sharey=ax_run)
+    ax_io = plt.subplot(212)
+
+    plt_io = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_IO, hatch=pat,
+                      ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+              for i,(avg,ci,pat) in enumerate(zip(data['io_avg'][si],
+                                                  data['io_ci'][si],
+                                                  PATTERNS[si]))]
+
+    # don't show premizan bar if comuptation time is 0 (i.e., failed run)
+    (premizan_avg, premizan_ci) = premizan_stats(data, si)
+
+    plt_pm = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_PREMIZAN, hatch=pat,
+                      ecolor=COLOR_ERR, yerr=ci[mi], align='edge', bottom=io[mi])
+              for i,(avg,ci,io,pat) in enumerate(zip(premizan_avg,
+                                                     premizan_ci,
+                                                     data['io_avg'][si],
+                                                     PATTERNS[si]))]
+
+    # label bars with their values
+    for bars in plt_pm:
+        for bar in bars:
+            autolabel(plt, opts, bar)
+
+
+    # set proper ymax
+    #ax_run.set_ylim(ymax=np.max(data['run_avg'][si] + data['run_ci'][si])*YMAX_FACTOR)
+    #ax_io.set_ylim(ymax=np.max(data['premizan_io_avg'][si] + data['premizan_io_ci'][si]
+    #                           + data['io_avg'][si])*YMAX_FACTOR)
+
+    ax_run.set_ylabel('Computation (mins)')
+    ax_io.set_ylabel('Setup (mins)')
+
+    # remove upper y-label to avoid overlap
+    nbins = len(ax_run.get_yticklabels())
+    ax_io.yaxis.set_major_locator(MaxNLocator(nbins=nbins, prune='upper'))
+
+    return (ax_run, ax_io)
+
+
+def plot_mem_net(plt, fig, opts, spec, data, ind, is_mem, is_recv=True):
+    """Plots memory usage or network usage.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+    is_mem -- True for memory usage, False for network usage (boolean)
+    is_recv -- True for incoming network I/O, False for outgoing (boolean)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    (si, mi, width) = (spec.si, spec.mi, spec.width)
+
+    if is_mem:
+        STAT_NAME = 'mem'
+        LABEL_STR = 'memory usage'
+    else:
+        if is_recv:
+            STAT_NAME = 'recv'
+            LABEL_STR = 'incoming network I/O'
+        else:
+            STAT_NAME = 'sent'
+            LABEL_STR = 'outgoing network I/O'
+
+
+    ax = plt.subplot()
+
+    if opts.master:
+        # master is a single machine, so min/max/sum = avg
+        plt_avg = [plt.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+                           ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+                   for i,(avg,ci,col,pat) in enumerate(zip(data[STAT_NAME + '_avg_avg'][si]*MB_PER_GB,
+                                                           data[STAT_NAME + '_avg_ci'][si]*MB_PER_GB,
+                                                           COLORS[si],
+                                                           PATTERNS[si]))]
+
+        # label all bars
+        for bars in plt_avg:
+            for bar in bars:
+                autolabel(plt, opts, bar)
+
+    else:
+        def plot_helper(name, colors, alpha=1.0, is_sum=False):
+            """Helper function to plot min, max, avg, or sum, depending on arguments.
+
+            Arguments:
+            name -- name of the statistic: min, max, or avg (string)
+            colors -- list of colors, must have length = len(COLORS) (np.array)
+            alpha -- level of transparency, none by default (float)
+            is_sum -- True to compute the sum/total, False otherwise (boolean)
+            """
+
+            # If sum/total memory/netwok is requested, then we set number of machines correctly.
+            # Otherwise, num_machines is set to all 1s, so that element-wise multiplication of
+            # whichever statistic and num_machines just yields the original statistic.
+            #
+            # CI is also multiplied, b/c # of machines is a constant and has no error.
+            if is_sum:
+                num_machines = np.array([int(m) for m in MACHINES])
+            else:
+                num_machines = np.ones(len(MACHINES))
+
+            # NOTE: alpha not supported in ps/eps
+            p = [plt.bar(ind + width*i, np.multiply(avg[mi],num_machines[mi]), width,
+                         color=col, hatch=pat, alpha=alpha,
+                         ecolor=COLOR_ERR, yerr=np.multiply(ci[mi],num_machines[mi]), align='edge')
+                 for i,(avg,ci,col,pat) in enumerate(zip(data[STAT_NAME + '_' + name + '_avg'][si],
+                                                         data[STAT_NAME + '_' + name + '_ci'][si],
+                                                         colors[si],
+                                                         PATTERNS[si]))]
+
+            # label all bars
+            for bars in p:
+                for bar in bars:
+                    autolabel(plt, opts, bar)
+
+
+        if opts.plot_sum:
+            plot_helper('avg', COLORS, 1.0, True)
+        elif opts.plot_avg:
+            plot_helper('avg', COLORS)
+        elif opts.plot_max:
+            plot_helper('max', COLORS)
+        else:
+            # order is important: min should overlay avg, etc.
+            # NOTE: used to use 0.6 alpha for min/max, but with patterns it doesn't look as good
+            plot_helper('max', np.array(['#e74c3c']*len(COLORS)))
+            plot_helper('avg', COLORS)
+            plot_helper('min', np.array(['#27ae60']*len(COLORS)))
+
+
+    # for worker's memory usage, plot the larger graphs to have same ymax
+    if is_mem and not (opts.plot_sum or opts.master or opts.premizan) and not GRAPHS[spec.gi] in [GRAPH_LJ, GRAPH_OR]:
+        plt.ylim(ymax=14.0)
+
+    #plt.ylim(ymax=np.max(data[STAT_NAME + '_max_avg'][si] + data[STAT_NAME + '_max_ci'][si])*YMAX_FACTOR)
+
+    if opts.master:
+        plt.ylabel('Total ' + LABEL_STR + ' (MB)')
+    else:
+        if opts.plot_sum:
+            plt.ylabel('Total ' + LABEL_STR + ' (GB)')
+        elif opts.plot_avg:
+            plt.ylabel('Average ' + LABEL_STR + ' (GB)')
+        elif opts.plot_max:
+            plt.ylabel('Maximum ' + LABEL_STR + ' (GB)')
+        else:
+            plt.ylabel('Min/avg/max ' + LABEL_STR + ' (GB)')
+
+    return (ax,)
+
+
+def plot_mem(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_mem_net"""
+    return plot_mem_net(plt, fig, opts, spec, data, ind, True)
+
+def plot_net_recv(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_mem_net"""
+    return plot_mem_net(plt, fig, opts, spec, data, ind, False, True)
+
+def plot_net_sent(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_mem_net"""
+    return plot_mem_net(plt, fig, opts, spec, data, ind, False, False)
+
+
+# throughput statistics, as (value multiplier, y-label)
+TPUT_STATS = {'eps': (1e-6, 'Throughput (M edges/sec)'),
+              'mem_bpe': (1.0, 'Memory usage per edge (bytes)'),
+              'recv_bpe': (1.0, 'Incoming network I/O per edge (bytes)'),
+              'sent_bpe': (1.0, 'Outgoing network I/O per edge (bytes)')}
+
+def plot_tput(plt, fig, opts, spec, data, ind, stat):
+    """Plots a throughput, i.e., edges processed per second or bytes used per graph edge.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+    stat -- key of the statistic in TPUT_STATS (str)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    (si, mi, width) = (spec.si, spec.mi, spec.width)
+    (MULTIPLIER, LABEL_STR) = TPUT_STATS[stat]
+
+    ax = plt.subplot()
+    plt_avg = [plt.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+                       ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+               for i,(avg,ci,col,pat) in enumerate(zip(data[stat + '_avg'][si]*MULTIPLIER,
+                                                       data[stat + '_ci'][si]*MULTIPLIER,
+                                                       COLORS[si],
+                                                       PATTERNS[si]))]
+
+    # label all bars
+    for bars in plt_avg:
+        for bar in bars:
+            autolabel(plt, opts, bar)
+
+    plt.ylabel(LABEL_STR)
+    return (ax,)
+
+
+def plot_eps(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_tput"""
+    return plot_tput(plt, fig, opts, spec, data, ind, 'eps')
+
+def plot_mem_bpe(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_tput"""
+    return plot_tput(plt, fig, opts, spec, data, ind, 'mem_bpe')
+
+def plot_recv_bpe(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_tput"""
+    return plot_tput(plt, fig, opts, spec, data, ind, 'recv_bpe')
+
+def plot_sent_bpe(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_tput"""
+    return plot_tput(plt, fig, opts, spec, data, ind, 'sent_bpe')
+
+
+def draw_cut(axs, cut):
+    """Cuts the y-axis between two axes, with diagonal lines at the cut.
+
+    Arguments:
+    axs -- top and bottom axes, with the same bars (list)
+    cut -- the figure's broken y-axis, from CUTS (tuple)
+    """
+
+    # cut y-axis and add diagonal cut lines
+    # (from http://matplotlib.org/examples/pylab_examples/broken_axis.html)
+    axs[0].set_ylim(*(cut[0]))
+    axs[1].set_ylim(*(cut[1]))
+
+    # hide spines between axs[0] and axs[1]
+    axs[0].spines['bottom'].set_visible(False)
+    axs[1].spines['top'].set_visible(False)
+    axs[0].xaxis.tick_top()
+    axs[0].tick_params(labeltop='off')
+    axs[1].xaxis.tick_bottom()
+
+    d = .015 # how big to make the diagonal lines in axes coordinates
+
+    # arguments to pass plot, just so we don't keep repeating them
+    kwargs = dict(transform=axs[0].transAxes, color='k', clip_on=False)
+    axs[0].plot((-d,+d),(-d,+d), **kwargs)      # top-left diagonal
+    axs[0].plot((1-d,1+d),(-d,+d), **kwargs)    # top-right diagonal
+
+    kwargs.update(transform=axs[1].transAxes)  # switch to the bottom axes
+    # mathematically this should just be d/4.0, but for whatever reason
+    # it doesn't give a parallel line, so need d/2.2 for the bottom y coord
+    axs[1].plot((-d,+d),(1-d/2.2,1+d/4.0), **kwargs)   # bottom-left diagonal
+    axs[1].plot((1-d,1+d),(1-d/2.2,1+d/4.0), **kwargs) # bottom-right diagonal
+
+
+def format_cut_axes(axs, spec):
+    """Formats the axes of a figure with a broken y-axis.
+
+    Figures without cuts are formatted by render_figure() instead.
+
+    Arguments:
+    axs -- axes with bars (list)
+    spec -- figure being plotted (FigureSpec)
+    """
+
+    (mi, gi) = (spec.mi, spec.gi)
+
+    # enable minor ticks for all subplots
+    for ax in axs:
+        ax.minorticks_on()
+
+        # turn off major and minor x-axis ticks (leaves minor y-ticks on)
+        ax.tick_params(axis='x', which='both', bottom='off', top='off')
+
+        # add grid lines
+        ax.grid(True, which='major', axis='y')
+
+        # draw vertical lines to separate bar groups
+        vlines_mi = np.array(mi)[np.arange(1,len(mi))]
+        ax.vlines(IND[gi,vlines_mi]-BAR_MARGIN, 0, ax.get_ylim()[1], colors='k', linestyles='dotted')
+
+
+def set_fontsize(opts, axs):
+    """Sets the font size of the titles, axis labels, and tick labels of axes."""
+    (FONTSIZE, VAL_FONTSIZE, F_FONTSIZE) = font_sizes(opts)
+
+    for ax in axs:
+        for item in ([ax.title, ax.xaxis.label, ax.yaxis.label] +
+                     ax.get_xticklabels() + ax.get_yticklabels()):
+            item.set_fontsize(FONTSIZE)
+
+
+def plot_time_split_cut(plt, fig, opts, spec, data, ind):
+    """Plots the same as plot_time_split, but with a broken y-axis for computation times.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted, with a cut (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    import matplotlib.gridspec as gridspec
+    from matplotlib.ticker import MaxNLocator
+
+    (si, mi, gi, width, cut) = (spec.si, spec.mi, spec.gi, spec.width, spec.cut)
+    ycut_bot_max = cut[1][1]
+
+    ## plot setup times first, so we can apply xlabels
+    ax_io = plt.subplot(212)
+
+    plt_io = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_IO, hatch=pat,
+                      ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+              for i,(avg,ci,pat) in enumerate(zip(data['io_avg'][si],
+                                                  data['io_ci'][si],
+                                                  PATTERNS[si]))]
+
+    # don't show premizan bar if comuptation time is 0 (i.e., failed run)
+    (premizan_avg, premizan_ci) = premizan_stats(data, si)
+
+    plt_pm = [plt.bar(ind + width*i, avg[mi], width, color=COLOR_PREMIZAN, hatch=pat,
+                      ecolor=COLOR_ERR, yerr=ci[mi], align='edge', bottom=io[mi])
+              for i,(avg,ci,io,pat) in enumerate(zip(premizan_avg,
+                                                     premizan_ci,
+                                                     data['io_avg'][si],
+                                                     PATTERNS[si]))]
+
+    # label bars with their values
+    for bars in plt_pm:
+        for bar in bars:
+            autolabel(plt, opts, bar)
+
+    ax_io.set_ylim(ymin=0)
+
+    # ha controls where labels are aligned to (left, center, or right)
+    plt.xticks(IND[gi,mi]+width*len(si)/2, GRAPH_LABELS[gi,mi], rotation=30, ha='center')
+
+    ## Plot running time with y-ais cuts
+    # large subplot, with no visible spines
+    ax_run = plt.subplot(211)
+    ax_run.spines['bottom'].set_visible(False)
+    ax_run.spines['top'].set_visible(False)
+    ax_run.spines['left'].set_visible(False)
+    ax_run.spines['right'].set_visible(False)
+
+    # label x & y-axis so we can do tight_layout right away
+    ax_run.set_ylabel('Computation (mins)')
+    ax_io.set_ylabel('Setup (mins)')
+
+    plt.tight_layout()
+
+
+    # broken y-axis sub-plots within large subplot
+    gs = gridspec.GridSpec(8,1)
+    axs = [fig.add_subplot(gs[0,:]), fig.add_subplot(gs[1:4,:])]
+
+    for ax in axs:
+        p = [ax.bar(ind + width*i, avg[mi], width, color=col, hatch=pat,
+                    ecolor=COLOR_ERR, yerr=ci[mi], align='edge')
+             for i,(avg,ci,col,pat) in enumerate(zip(data['run_avg'][si],
+                                                     data['run_ci'][si],
+                                                     COLORS[si],
+                                                     PATTERNS[si]))]
+
+        for bars in p:
+            for bar in bars:
+                # Super hacky way to get labels to show up in roughly the correct place...
+                #
+                # If bar value exceeds bottom subplot's ymax, then it's in the upper subplot, so:
+                # - use an offset that zeros the height (i.e., label appears at y = 0)
+                # - then add on where it should roughly be
+                #   (4/3 of bottom subplot's max-y is top of the plot)
+                if (bar.get_height() + bar.get_y()) > ycut_bot_max:
+                    autolabel(plt, opts, bar, ycut_bot_max/0.81-(bar.get_height()+bar.get_y())*1.005)
+                else:
+                    autolabel(plt, opts, bar)
+
+    draw_cut(axs, cut)
+
+    # HACK: get the topmost subplot's y ticks, so that ylabels are properly
+    # spaced away from the axes. Multiply by 10 to get at least one digit's
+    # worth of spacing. Hide tick labels by setting them to "white"
+    # (b/c we only use white bg).
+    ax_run.set_xticks([])
+    ax_run.set_yticks([0, max(axs[1].get_yticks())*5])
+    ax_run.tick_params(axis='both', colors='white')
+
+    # hide bottom subplot's tick labels using this trick
+    # this avoids misalignments with top subplot
+    axs[1].set_xticklabels(['']*len(axs[1].get_xticks()))
+
+    # fix y-tick intervals
+    axs[0].yaxis.set_ticks(np.arange(*cut[2]))
+    axs[1].yaxis.set_ticks(np.arange(*cut[3]))
+
+    format_cut_axes(axs + [ax_io], spec)
+    set_fontsize(opts, axs + [ax_io, ax_run])
+
+    plt.subplots_adjust(hspace = 0.1)
+
+    # shift setup times's subplot up (we can't use subplots_adjust again)
+    bbox = ax_io.get_position()
+    ax_io.set_position([bbox.x0, bbox.y0 + 0.024, bbox.x1-bbox.x0, bbox.y1-bbox.y0])
+
+    # remove upper y-label to avoid overlap
+    nbins = len(axs[1].get_yticklabels())
+    ax_io.yaxis.set_major_locator(MaxNLocator(nbins=nbins, prune='upper'))
+
+    return (ax_run, ax_io)
+
+
+def plot_net_cut(plt, fig, opts, spec, data, ind, is_recv=True):
+    """Plots total network usage with a broken y-axis.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    fig -- figure object (matplotlib.figure)
+    opts -- plot options (PlotOptions)
+    spec -- figure being plotted, with a cut (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    ind -- left x-location of each bar group (list)
+    is_recv -- True for incoming network I/O, False for outgoing (boolean)
+
+    Returns:
+    Tuple of axes.
+    """
+
+    import matplotlib.gridspec as gridspec
+
+    (si, mi, gi, width, cut) = (spec.si, spec.mi, spec.gi, spec.width, spec.cut)
+    ycut_bot_max = cut[1][1]
+
+    if is_recv:
+        STAT_NAME = 'recv'
+        LABEL_STR = 'incoming network I/O'
+    else:
+        STAT_NAME = 'sent'
+        LABEL_STR = 'outgoing network I/O'
+
+
+    # to get shared x/ylabels for multiple subplots, first create a big subplot,
+    # then add each smaller subplot... catch is that big subplot must have no axes
+    ax_ret = fig.add_subplot(111)
+    ax_ret.spines['bottom'].set_visible(False)
+    ax_ret.spines['top'].set_visible(False)
+    ax_ret.spines['left'].set_visible(False)
+    ax_ret.spines['right'].set_visible(False)
+
+    gs = gridspec.GridSpec(4,1)
+    axs = [fig.add_subplot(gs[0,:]), fig.add_subplot(gs[1:,:])]
+
+    # cuts are only used for sum/total usage, so multiply by number of machines
+    # (CI is also multiplied, b/c # of machines is a constant and has no error)
+    num_machines = np.array([int(m) for m in MACHINES])
+
+    # plot data on both axes
+    for ax in axs:
+        p = [ax.bar(ind + width*i, np.multiply(avg[mi],num_machines[mi]), width,
+                    color=col, hatch=pat, alpha=1.0,
+                    ecolor=COLOR_ERR, yerr=np.multiply(ci[mi],num_machines[mi]), align='edge')
+             for i,(avg,ci,col,pat) in enumerate(zip(data[STAT_NAME + '_avg_avg'][si],
+                                                     data[STAT_NAME + '_avg_ci'][si],
+                                                     COLORS[si],
+                                                     PATTERNS[si]))]
+
+        # label all bars
+        for bars in p:
+            for bar in bars:
+                if (bar.get_height() + bar.get_y()) > ycut_bot_max:
+                    autolabel(plt, opts, bar, ycut_bot_max/0.82-(bar.get_height()+bar.get_y()))
+                else:
+                    autolabel(plt, opts, bar)
+
+    draw_cut(axs, cut)
+
+    # HACK: get the topmost subplot's y ticks, so that ylabels will be properly
+    # spaced away from the axes. Use exp/log to get enough digits for spacing.
+    # Hide tick labels by setting them to "white" (b/c we only use white bg).
+    ax_ret.set_xticks([])
+    if GRAPHS[gi] == GRAPH_LJ:
+        ax_ret.set_yticks([0,10**(np.around(np.log10(max(axs[1].get_yticks())))+1)])
+    else:
+        ax_ret.set_yticks([0,10**(np.around(np.log10(max(axs[1].get_yticks()))))+0.1])
+    ax_ret.tick_params(axis='both', colors='white')
+
+    # fix y-tick intervals
+    axs[0].yaxis.set_ticks(np.arange(*cut[2]))
+    axs[1].yaxis.set_ticks(np.arange(*cut[3]))
+
+    format_cut_axes(axs, spec)
+
+    # ha controls where labels are aligned to (left, center, or right)
+    plt.xticks(IND[gi,mi]+width*len(si)/2, GRAPH_LABELS[gi,mi], rotation=30, ha='center')
+
+    plt.tight_layout()
+    plt.subplots_adjust(hspace = 0.05)
+
+    ax_ret.set_ylabel('Total ' + LABEL_STR + ' (GB)')
+    set_fontsize(opts, axs + [ax_ret])
+
+    return (ax_ret,)
+
+
+def plot_net_recv_cut(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_net_cut"""
+    return plot_net_cut(plt, fig, opts, spec, data, ind, True)
+
+def plot_net_sent_cut(plt, fig, opts, spec, data, ind):
+    """Wrapper function for plot_net_cut"""
+    return plot_net_cut(plt, fig, opts, spec, data, ind, False)
+
+
+def plot_funcs(opts):
+    """Gets the plot function of each plot type (see plot_types())."""
+    if opts.cut:
+        return ((plot_time_split_cut,),                       # time
+                (),                                           # memory (no cuts)
+                (plot_net_recv_cut, plot_net_sent_cut))[opts.mode]  # net
+
+    return ((plot_time_tot if opts.total_time else plot_time_split,),  # time
+            (plot_mem,),                                                # memory
+            (plot_net_recv, plot_net_sent),                             # net
+            (plot_eps, plot_mem_bpe, plot_recv_bpe, plot_sent_bpe))[opts.mode]  # throughput
+
+
+####################
+# Generate plots
+####################
+def select(value, selected):
+    """Returns True if selected is None or value, or if value is a variant of selected (e.g., recv_sum of recv)."""
+    return selected is None or value == selected or value.startswith(selected + '_')
+
+
+def figure_specs(opts, algs, only=(None, None, None)):
+    """Gets the figures to render for every plot type, algorithm and graph.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    algs -- algorithms, as returned by build_stats() (tuple)
+    only -- (alg, graph, plot type) of the figures to get, where None selects all (tuple)
+
+    Returns:
+    List of FigureSpecs.
+    """
+
+    specs = []
+
+    for plt_type,save_suffix in enumerate(plot_types(opts)):
+        if not select(save_suffix, only[2]):
+            continue
+
+        # iterate over all algs (ai = algorithm index)
+        for ai,alg in enumerate(algs):
+            if not select(alg, only[0]):
+                continue
+
+            # Not all systems do WCC or DMST, so we have to handle it separately.
+            # This removes bars from each group of bars, so change bar width
+            # to compensate for # of systems as well.
+            # (si = system indices, which slices rows of the matrix)
+            si = np.arange(len(ALL_SYS))         # all systems by default
+            if (alg == ALG_MST):
+                si = np.arange(3)                # only Giraph (hashmap, byte array) and GPS (none)
+            elif (alg == ALG_WCC):
+                si = np.arange(len(ALL_SYS)-1)   # all except GraphLab async
+            elif (alg == ALG_PREMIZAN):
+                si = np.arange(5,6)              # only Mizan
+
+            width = (1.0 - 2.0*BAR_MARGIN)/len(si)
+
+            # iterate over all graphs (gi = graph index)
+            for gi,graph in enumerate(GRAPHS):
+                if not select(graph, only[1]):
+                    continue
+
+                # Not all machine setups can run uk0705, so we remove 16/32's empty bars.
+                # This will make the plot thinner (removes 2 groups of bars).
+                # (mi = machine indices, which silces columns of the matrix)
+                if opts.save_paper:
+                    mi = np.arange(1,4)             # for paper, only plot 32, 64, 128
+                else:
+                    mi = np.arange(len(MACHINES))   # all machines by default
+
+                if (alg == ALG_PREMIZAN):
+                    if (graph == GRAPH_UK):
+                        continue                    # no UK results
+                    elif (graph == GRAPH_TW):
+                        mi = np.arange(3,4)         # only 128 machines
+                elif (alg == ALG_MST):
+                    if (graph == GRAPH_UK):
+                        # NOTE: using 3,4 causes divide by zero warning in ticker.py
+                        mi = np.arange(3,4)         # only 128 machines
+                    elif (graph == GRAPH_TW):
+                        mi = np.arange(2,4)         # only 64 and 128 machines
+                else:
+                    if (graph == GRAPH_UK):
+                        mi = np.arange(2,4)         # only 64 and 128 machines
+
+                # only figures with cuts are plotted with cuts
+                cut = CUTS.get((save_suffix, alg, graph)) if opts.cut else None
+                if opts.cut and cut is None:
+                    continue
+
+                save_name = alg + '_' + graph + '_' + save_suffix
+                if opts.master:
+                    save_name = save_name + '_master'
+                if opts.cut:
+                    save_name = save_name + '_cut'
+
+                specs.append(FigureSpec(plt_type, save_name, alg + ' ' + graph, ai, gi, si, mi, width, cut))
+
+    return specs
+
+
+def pyplot(opts):
+    """Imports matplotlib.pyplot, using the Agg backend if saving plots."""
+
+    # we have to import matplotlib.pyplot here, as its backend
+    # will get reset if we don't import matplotlib first
+    #
+    # NOTE: figures are closed once saved, and view_figures() reuses a single
+    # figure, so there's no need to raise figure.max_open_warning
+    import matplotlib
+
+    if saving(opts):
+        # using tight_layout requires Agg, so we can't use PS
+        matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def save_figure(plt, opts, save_name, pad_inches=0.05):
+    """Saves the current figure as EPS and/or PNG."""
+
+    if opts.save_eps:
+        plt.savefig(opts.figs_dir + '/' + save_name + '.eps', format='eps',
+                    bbox_inches='tight', pad_inches=pad_inches)
+
+    # TODO: save_png causes error on exit (purely cosmetic: trying to close a non-existent canvas)
+    if opts.save_png:
+        plt.savefig(opts.figs_dir + '/' + save_name + '.png', format='png',
+                    dpi=200, bbox_inches='tight', pad_inches=pad_inches)
+
+
+###############
+# Render cache
+###############
+# Saved figures are tracked in <figs_dir>/MANIFEST_FILE, which maps each
+# file to the hash of everything used to render it. Files rendered by the
+# last (saving) run of plot.py are listed in <figs_dir>/CHANGED_FILE.
+MANIFEST_FILE = 'manifest.json'
+CHANGED_FILE = 'changed.txt'
+
+def output_files(opts, save_name):
+    """Gets the names of the files a figure is saved to (in opts.figs_dir)."""
+    return ([save_name + '.eps'] if opts.save_eps else []) + ([save_name + '.png'] if opts.save_png else [])
+
+
+def render_hash(opts, name, data):
+    """Hashes all inputs of a figure: its data, options, and style.
+
+    The plotting code and matplotlib's version are also hashed, as both
+    change the output.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    name -- the figure's spec (FigureSpec), or name of a legend (str)
+    data -- figure's data, from data_slice() (dict)
+
+    Returns:
+    Hex digest (str).
+    """
+
+    import matplotlib
+
+    h = hashlib.sha1()
+
+    # output folder and formats don't change what is rendered
+    h.update(repr((opts._replace(save_png=False, save_eps=False, figs_dir=None), name)).encode())
+
+    for key in sorted(data):
+        h.update(repr((key, data[key].shape, str(data[key].dtype))).encode())
+        h.update(np.ascontiguousarray(data[key]).tobytes())
+
+    h.update(repr((PATTERNS.tolist(), COLORS.tolist(), COLOR_PREMIZAN, COLOR_IO, COLOR_ERR,
+                   LEGEND_LABELS, GRAPH_LABELS.tolist(), font_sizes(opts), LABEL_FORMAT,
+                   BAR_MARGIN, YMAX_FACTOR, matplotlib.__version__)).encode())
+
+    with open(os.path.splitext(__file__)[0] + '.py', 'rb') as f:
+        h.update(f.read())
+
+    return h.hexdigest()
+
+
+def load_manifest(figs_dir):
+    """Loads a folder's render cache manifest.
+
+    Returns:
+    Dictionary of file names to hashes (empty if there's no manifest).
+    """
+
+    try:
+        with open(figs_dir + '/' + MANIFEST_FILE) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+
+def up_to_date(opts, manifest, files, digest):
+    """Returns True if all of a figure's files exist and were rendered from the same inputs."""
+    return all(manifest.get(f) == digest and os.path.isfile(opts.figs_dir + '/' + f) for f in files)
+
+
+def save_manifest(figs_dir, manifest, changed):
+    """Saves a folder's manifest, along with the list of changed files.
+
+    Arguments:
+    figs_dir -- folder of the figures (str)
+    manifest -- file names to hashes (dict)
+    changed -- names of the files that were (re-)rendered (list)
+    """
+
+    with open(figs_dir + '/' + MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    # paths are relative to all-plots.tex, e.g. for make or latexmk
+    with open(figs_dir + '/' + CHANGED_FILE, 'w') as f:
+        for name in sorted(changed):
+            f.write(os.path.basename(os.path.normpath(figs_dir)) + '/' + name + '\n')
+
+
+def new_figure(plt, fignum, figsize):
+    """Creates a figure, or clears and resizes it if it is being reused (see view_figures())."""
+
+    fig = plt.figure(fignum, figsize=figsize, facecolor='w')
+    if fignum is not None and fig.get_axes():
+        fig.clf()
+        fig.set_size_inches(figsize, forward=True)
+    return fig
+
+
+def render_figure(opts, spec, data, fignum=None):
+    """Renders, and saves, one figure.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    spec -- figure to render (FigureSpec)
+    data -- figure's data, from data_slice() (dict)
+    fignum -- figure number, if the figure is to be displayed (int)
+
+    Returns:
+    The figure's save name (str).
+    """
+
+    plt = pyplot(opts)
+    (FONTSIZE, VAL_FONTSIZE, F_FONTSIZE) = font_sizes(opts)
+    (si, mi, gi, width) = (spec.si, spec.mi, spec.gi, spec.width)
+
+    profiler.start('render')
+    profiler.start(spec.save_name)
+
+    # shrink width down if there are bars or groups of bars missing
+    width_ratio = (7.0-len(GRAPH_LABELS[gi]))/(7.0-len(mi))
+    if opts.save_paper:
+        fig = new_figure(plt, fignum, (6.5*width_ratio,7))
+    else:
+        fig = new_figure(plt, fignum, (6.0*width_ratio,6))
+
+    # mode specific plot function
+    axes = plot_funcs(opts)[spec.plt_type](plt, fig, opts, spec, data, IND[gi,mi])
+
+    # title only for the first (upper-most) axis
+    if not saving(opts):
+        axes[0].set_title(spec.title)
+
+    # figures with cuts are formatted by their plot functions
+    if spec.cut is None:
+        # If there's only one axis, we can just use plt.stuff()...
+        # But with mutliple axes we need to go through each one using axis.set_stuff()
+        for ax in axes:
+            ax.set_ylim(ymin=0)                 # zero y-axis
+            ax.minorticks_on()                  # enable all minor ticks
+
+            for item in ([ax.title, ax.xaxis.label, ax.yaxis.label] +
+                         ax.get_xticklabels() + ax.get_yticklabels()):
+                item.set_fontsize(FONTSIZE)
+
+            # turn off major and minor x-axis ticks (leaves minor y-ticks on)
+            ax.tick_params(axis='x', which='both', bottom='off', top='off')
+
+            ax.grid(True, which='major', axis='y')
+
+            # draw vertical lines to separate bar groups
+            vlines_mi = np.array(mi)[np.arange(1,len(mi))]
+            ax.vlines(IND[gi,vlines_mi]-BAR_MARGIN, 0, ax.get_ylim()[1], colors='k', linestyles='dotted')
+
+        # only label x-axis of last (bottom-most) axis
+        for ax in axes[:-1]:
+            ax.tick_params(labelbottom='off')
+
+        # ha controls where labels are aligned to (left, center, or right)
+        plt.xticks(IND[gi,mi]+width*len(si)/2, GRAPH_LABELS[gi,mi], rotation=30, ha='center')
+
+
+        #ml = MultipleLocator(5)
+        #plt.axes().yaxis.set_minor_locator(ml)
+
+        plt.tight_layout()
+        plt.subplots_adjust(hspace = 0.001)
+    profiler.stop()
+    profiler.stop()
+
+    if saving(opts):
+        profiler.start('save')
+        profiler.start(spec.save_name)
+        save_figure(plt, opts, spec.save_name)
+
+        # figures are kept only if they're to be displayed
+        plt.close(fig)
+        profiler.stop()
+        profiler.stop()
+
+    return spec.save_name
+
+
+# separate legend figures, as (save name, figure size)
+LEGENDS = (('legend', (4,3.6)), ('legend-horiz', (10.9,1.4)))
+
+def render_legend(opts, data, li, fignum=None):
+    """Renders, and saves, one of the separate legend figures.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    data -- data of any one figure, from data_slice() (dict)
+    li -- index of the legend in LEGENDS (int)
+    fignum -- figure number, if the legend is to be displayed (int)
+
+    Returns:
+    The legend's save name (str).
+    """
+
+    from matplotlib.patches import Rectangle
+
+    plt = pyplot(opts)
+    (save_name, figsize) = LEGENDS[li]
+
+    profiler.start('render')
+    profiler.start(save_name)
+
+    # values are tuned to give perfect size output for fontsize of 20
+    fig = new_figure(plt, fignum, figsize)
+    ax = plt.subplot()
+    width = (1.0-2.0*BAR_MARGIN)/3
+    plt_legend = [plt.bar(0 + width*i, avg[0], width, color=col, hatch=pat)
+                  for i,(avg,col,pat) in enumerate(zip(data[STATS[opts.mode][0] + '_avg'],
+                                                       COLORS,
+                                                       PATTERNS))]
+
+    if save_name == 'legend':
+        ax.legend(plt_legend[0:len(plt_legend)], LEGEND_LABELS, fontsize=20,
+                  loc=3, bbox_to_anchor=[-0.1,-0.1], borderaxespad=0.0).draw_frame(False)
+    else:
+        # collapsed legend:
+        # create empty rectangle so we have Giraph in one column, GPS in another, etc.
+        blank = Rectangle((0, 0), 1, 1, fc="w", fill=False, edgecolor='none', linewidth=0)
+        ax.legend(plt_legend[0:2] + [blank] + plt_legend[2:len(plt_legend)],
+                  list(LEGEND_LABELS[0:2]) + [""] + list(LEGEND_LABELS[2:]),
+                  fontsize=20, ncol=3,
+                  loc=3, bbox_to_anchor=[-0.03, -0.5], borderaxespad=0.0).draw_frame(False)
+
+    for bars in plt_legend:
+        for bar in bars:
+            bar.set_visible(False)
+
+    plt.axis('off')
+    plt.tight_layout()
+    profiler.stop()
+    profiler.stop()
+
+    if saving(opts):
+        profiler.start('save')
+        profiler.start(save_name)
+        save_figure(plt, opts, save_name, pad_inches=0)
+        plt.close(fig)
+        profiler.stop()
+        profiler.stop()
+
+    return save_name
+
+
+def render_legends(opts, data, fignum=None):
+    """Renders, and saves, all of the separate legend figures.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    data -- data of any one figure, from data_slice() (dict)
+    fignum -- figure number of the first legend, if they are to be displayed (int)
+
+    Returns:
+    List of the legends' save names.
+    """
+
+    return [render_legend(opts, data, li, None if fignum is None else fignum + li)
+            for li in range(len(LEGENDS))]
+
+
+###############
+# Viewer
+###############
+def view_figures(opts, pages):
+    """Shows figures one at a time, rendering each only when it is viewed.
+
+    The right and left arrow keys go to the next and previous figure. As
+    all figures are drawn on the same canvas, only one is ever kept open.
+
+    Arguments:
+    opts -- plot options (PlotOptions)
+    pages -- tuples of (name, function to render the figure given its figure number) (list)
+    """
+
+    import matplotlib
+
+    # arrow keys would otherwise go back/forward in the toolbar's view history
+    for keymap in ('keymap.back', 'keymap.forward'):
+        matplotlib.rcParams[keymap] = [k for k in matplotlib.rcParams[keymap] if not k in ('left', 'right')]
+
+    plt = pyplot(opts)
+    current = [0]   # index of the page being shown
+
+    def show_page():
+        (name, render) = pages[current[0]]
+        render(1)
+
+        fig = plt.figure(1)
+        fig.canvas.set_window_title('%s (%i of %i)' % (name, current[0] + 1, len(pages)))
+        fig.canvas.draw_idle()
+        return fig
+
+    def on_key(event):
+        if event.key in ('right', 'left'):
+            current[0] = (current[0] + (1 if event.key == 'right' else -1)) % len(pages)
+            show_page()
+
+    show_page().canvas.mpl_connect('key_press_event', on_key)
+    plt.show()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+"""Stage-level profiling for gen-data.py and plot.py (see --profile).
+
+Stages are nested, either with stage() or start()/stop():
+
+    with profiler.stage('parse'):
+        with profiler.file_stage(log):
+            ...
+
+Each stage records its wall time and CPU time. Stages with the same path
+are summed.
+Nothing is recorded until enable() is called, so stages can be left in.
+"""
+
+import os, sys, time, json, resource
+from contextlib import contextmanager
+
+###############
+# State
+###############
+_stack = None     # open stages as (name, wall, cpu), or None if disabled
+_stages = {}      # stage path -> [calls, wall, cpu]
+_files = []       # (file, stage path, wall) for each parsed file
+_worker_rss = 0   # peak RSS of the other processes that ran isolated() (KB)
+
+
+def _cpu():
+    t = os.times()
+    return t[0] + t[1]
+
+
+def enable():
+    """Starts recording stages."""
+    global _stack
+    if _stack is None:
+        _stack = []
+
+def enabled():
+    return _stack is not None
+
+
+###############
+# Stages
+###############
+def _path():
+    return ';'.join(s[0] for s in _stack)
+
+
+def start(name):
+    """Opens a stage (must be closed by stop())."""
+    if _stack is not None:
+        _stack.append((name, time.time(), _cpu()))
+
+
+def stop():
+    """Closes the most recently opened stage.
+
+    Returns: wall time of the stage (sec), or 0 if disabled.
+    """
+
+    if _stack is None:
+        return 0
+
+    path = _path()
+    (name, wall, cpu) = _stack.pop()
+    wall = time.time() - wall
+
+    s = _stages.setdefault(path, [0, 0.0, 0.0])
+    s[0] += 1
+    s[1] += wall
+    s[2] += _cpu() - cpu
+    return wall
+
+
+@contextmanager
+def stage(name):
+    """Context manager for a stage."""
+    start(name)
+    try:
+        yield
+    finally:
+        stop()
+
+
+@contextmanager
+def file_stage(path):
+    """Context manager for parsing a single file.
+
+    Files are summed up in a 'file' stage, but their individual wall
+    times are also kept, to find pathological logs.
+    """
+
+    start('file')
+    try:
+        yield
+    finally:
+        if _stack is not None:
+            parent = ';'.join(s[0] for s in _stack[:-1])
+            _files.append((path, parent, stop()))
+
+
+def parse_file(parse, path):
+    """Calls parse(path) in a file_stage()."""
+    with file_stage(path):
+        return parse(path)
+
+
+###############
+# Subprocesses
+###############
+def isolated(func, *args):
+    """Runs a function with its own profile, e.g. in a joblib worker.
+
+    Returns: tuple (func's return value, profile), which should be
+    passed to merge() in the main process.
+    """
+
+    global _stack, _stages, _files
+    saved = (_stack, _stages, _files)
+    _stack, _stages, _files = [], {}, []
+
+    try:
+        ret = func(*args)
+
+        # (joblib workers are reused, so they are not finished children yet)
+        return (ret, (_stages, _files, os.getpid(), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    finally:
+        (_stack, _stages, _files) = saved
+
+
+def merge(result):
+    """Adds a profile from isolated() to the currently open stage.
+
+    Arguments:
+    result -- tuple (return value, profile), where profile can be None (tuple)
+
+    Returns: the return value of the function given to isolated().
+    """
+
+    global _worker_rss
+    (ret, profile) = result
+
+    if _stack is not None and profile is not None:
+        (stages, files, pid, rss) = profile
+        prefix = _path()
+        prefix = prefix + ';' if prefix else ''
+
+        for path, (calls, wall, cpu) in stages.items():
+            s = _stages.setdefault(prefix + path, [0, 0.0, 0.0])
+            s[0] += calls
+            s[1] += wall
+            s[2] += cpu
+
+        _files.extend((f, prefix + parent, wall) for (f, parent, wall) in files)
+        if pid != os.getpid():
+            _worker_rss = max(_worker_rss, rss)
+
+    return ret
+
+
+###############
+# Output
+###############
+def write(out_prefix):
+    """Writes the profile to <out_prefix>.json and <out_prefix>.folded.
+
+    The .folded file has one "stage;substage self-time" line per stage,
+    with self-times in microseconds, as used by flamegraph.pl and
+    speedscope. Note that self-times of stages run by parallel workers
+    are clamped to 0, as their children's times add up to more than
+    their own.
+
+    Peak RSS is reported for this process ('max_rss_mb') and for its
+    largest child process ('max_child_rss_mb'), e.g. a joblib worker
+    running isolated(), as parsing and rendering are mostly done there.
+    """
+
+    if _stack is None:
+        return
+
+    stages = [{'stage': path, 'calls': calls, 'wall': wall, 'cpu': cpu}
+              for path, (calls, wall, cpu) in sorted(_stages.items())]
+
+    report = {'command': ' '.join(sys.argv),
+              'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.0,
+              'max_child_rss_mb': max(_worker_rss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)/1024.0,
+              'stages': stages,
+              'files': [{'file': f, 'stage': parent, 'wall': wall}
+                        for (f, parent, wall) in sorted(_files, key=lambda f: -f[2])]}
+
+    with open(out_prefix + '.json', 'w') as f:
+        json.dump(report, f, indent=1)
+
+    # self-time = time not spent in a direct child stage
+    self_times = dict((path, s[1]) for path, s in _stages.items())
+    for path, s in _stages.items():
+        parent = path.rsplit(';', 1)[0]
+        if ';' in path and parent in self_times:
+            self_times[parent] -= s[1]
+
+    with open(out_prefix + '.folded', 'w') as f:
+        for path in sorted(self_times):
+            f.write('%s %i\n' % (path, max(0, self_times[path])*1e6))
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+import os, sys
+import argparse, itertools, functools
+import numpy as np
+
+from constants import *
+from plotting import load_data, build_stats, new_figure, view_figures, COLORS, LEGEND_LABELS
+
+SCRIPT_DIR=sys.path[0]
+
+###############
+# Parse args
+###############
+def check_machines(machines):
+    try:
+        m = int(machines)
+        if m < int(MACHINES[-1]):
+            raise argparse.ArgumentTypeError('Invalid machine count')
+        return m
+    except:
+        raise argparse.ArgumentTypeError('Invalid machine count')
+
+def check_fraction(frac):
+    try:
+        f = float(frac)
+        if (f < 0) or (f > 1):
+            raise argparse.ArgumentTypeError('Invalid fraction')
+        return f
+    except:
+        raise argparse.ArgumentTypeError('Invalid fraction')
+
+parser = argparse.ArgumentParser(description='Computes the speedup and parallel efficiency of each experiment across '
+                                             'cluster sizes, fits Amdahl\'s law and the Universal Scalability Law (USL), '
+                                             'and predicts the optimal cluster size.')
+parser.add_argument('--stat', type=str, choices=('run', 'tot'), default='run',
+                    help='time to analyze: computation time (run) or total time (tot), default=run')
+parser.add_argument('--alg', type=str, choices=ALGS, default=None,
+                    help='analyze only this algorithm')
+parser.add_argument('--graph', type=str, choices=GRAPHS, default=None,
+                    help='analyze only this graph')
+parser.add_argument('--max-machines', type=check_machines, dest='max_machines', default=1024,
+                    help='largest cluster size to consider for the optimal cluster size (>= ' + MACHINES[-1] + '), default=1024')
+parser.add_argument('--tolerance', type=check_fraction, default=0.05,
+                    help='best cluster size is the smallest one within this fraction of the peak predicted '
+                         'speedup (0 to 1), default=0.05')
+
+# plotting
+parser.add_argument('--plot', action='store_true', default=False,
+                    help='plot log-log speedup curves, with the fitted USL, for each algorithm and graph')
+parser.add_argument('--save-png', action='store_true', default=False,
+                    help='save plots as PNG files (200 DPI) instead of displaying them (implies --plot)')
+parser.add_argument('--save-eps', action='store_true', default=False,
+                    help='save plots as EPS files instead of displaying them (implies --plot)')
+
+# input/output folders
+parser.add_argument('--data-dir', type=str, dest='data_dir', default=SCRIPT_DIR,
+                    help='folder with the data_time.py file generated by gen-data.py, default=' + SCRIPT_DIR)
+parser.add_argument('--figs-dir', type=str, dest='figs_dir', default=SCRIPT_DIR + '/figs',
+                    help='folder to save plots to, default=' + SCRIPT_DIR + '/figs')
+
+args = parser.parse_args()
+stat = args.stat
+max_machines = args.max_machines
+tolerance = args.tolerance
+save_png = args.save_png
+save_eps = args.save_eps
+save_file = save_png or save_eps
+do_plot = args.plot or save_file
+
+
+###############
+# Constants
+###############
+MACHINE_COUNTS = np.array([int(m) for m in MACHINES])
+
+# markers to tell apart modes of the same system (see COLORS)
+MARKERS = ('o', 's',        # Giraph
+           'o', 's', '^',   # GPS
+           'o',             # Mizan
+           'o', 's')        # GraphLab
+
+
+###############
+# Fit models
+###############
+def fit_scaling(times, machines, max_machines, tolerance):
+    """Fits Amdahl's law and the USL to the times of many experiments at once.
+
+    Speedups are relative to each experiment's smallest successful cluster
+    size N0. For a relative cluster size p = N/N0, the models are:
+
+      Amdahl: S(p) = p/(1 + sigma*(p-1))
+      USL:    S(p) = p/(1 + sigma*(p-1) + kappa*p*(p-1))
+
+    where sigma is contention (serial fraction) and kappa is coherency
+    (crosstalk) cost. Rearranged as p/S - 1 = sigma*(p-1) + kappa*p*(p-1),
+    both are linear least squares problems, so every experiment is fit at
+    once by solving their normal equations as arrays. Parameters are kept
+    non-negative, by refitting only the other parameter if one is negative,
+    and sigma is at most 1 (fully serial), refitting kappa if it is clipped.
+
+    Arguments:
+    times -- average times, indexed by [experiment, machines], with 0s for failed runs (np.array)
+    machines -- cluster sizes of the columns of times (np.array)
+    max_machines -- largest cluster size to predict speedups for (int)
+    tolerance -- fraction of the peak speedup that the best cluster size can give up (float)
+
+    Returns:
+    Dictionary of arrays indexed by experiment (and machines, for 'speedup'
+    and 'efficiency'), which are NaN for experiments that can't be fit.
+    """
+
+    rows = np.arange(len(times))
+    valid = times > 0
+
+    # baseline is the smallest cluster size that succeeded
+    base = np.argmax(valid, axis=1)
+    n0 = machines[base].astype(float)
+    t0 = times[rows, base]
+    p = machines[np.newaxis,:]/n0[:,np.newaxis]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speedup = np.where(valid, t0[:,np.newaxis]/times, np.nan)
+        efficiency = speedup/p
+
+        # only points past the baseline tell us anything
+        w = valid & (p > 1)
+        y = np.where(w, p/speedup - 1, 0)
+        a = np.where(w, p - 1, 0)
+        b = np.where(w, p*(p - 1), 0)
+
+        (saa, sab, sbb) = ((a*a).sum(axis=1), (a*b).sum(axis=1), (b*b).sum(axis=1))
+        (say, sby) = ((a*y).sum(axis=1), (b*y).sum(axis=1))
+
+        # one parameter fits: Amdahl (sigma only) and USL with sigma = 0
+        amdahl_sigma = np.maximum(say/saa, 0)
+        kappa_only = np.maximum(sby/sbb, 0)
+
+        # two parameter fit, which needs two points past the baseline
+        det = saa*sbb - sab**2
+        usl_sigma = (sbb*say - sab*sby)/det
+        usl_kappa = (saa*sby - sab*say)/det
+
+    n_points = w.sum(axis=1)
+
+    with np.errstate(invalid='ignore'):
+        two_params = (n_points >= 2) & (np.abs(det) > 1e-12*saa*sbb)
+        neg_sigma = two_params & (usl_sigma < 0)
+        neg_kappa = two_params & ~neg_sigma & (usl_kappa < 0)
+
+    usl_sigma = np.where(~two_params | neg_kappa, amdahl_sigma, np.where(neg_sigma, 0.0, usl_sigma))
+    usl_kappa = np.where(~two_params | neg_kappa, 0.0, np.where(neg_sigma, kappa_only, usl_kappa))
+
+    # sigma > 1 means speedups are retrograde, which is kappa's job (Amdahl's law can't fit them)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        serial = usl_sigma > 1
+        usl_kappa = np.where(serial, np.maximum((sby - sab)/sbb, 0), usl_kappa)
+        usl_sigma = np.where(serial, 1.0, usl_sigma)
+        amdahl_sigma = np.minimum(amdahl_sigma, 1.0)
+
+    # experiments with no successful run past the baseline can't be fit
+    fitted = n_points >= 1
+    for arr in (amdahl_sigma, usl_sigma, usl_kappa):
+        arr[~fitted] = np.nan
+
+    # goodness of fit of the USL, on the observed speedups
+    predicted = usl_speedup(p, usl_sigma[:,np.newaxis], usl_kappa[:,np.newaxis])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, speedup, 0).sum(axis=1)/valid.sum(axis=1)
+        ss_res = np.where(valid, (speedup - predicted)**2, 0).sum(axis=1)
+        ss_tot = np.where(valid, (speedup - mean[:,np.newaxis])**2, 0).sum(axis=1)
+        r2 = np.where(ss_tot > 0, 1 - ss_res/ss_tot, np.nan)
+
+    r2[~fitted] = np.nan
+
+    # The USL peaks at p = sqrt((1 - sigma)/kappa), but speedups are often
+    # nearly flat well before then, so find both the peak and the smallest
+    # cluster size that's within tolerance of it (from every cluster size).
+    sizes = np.arange(1, max_machines + 1)
+    with np.errstate(invalid='ignore'):
+        predicted = usl_speedup(sizes[np.newaxis,:]/n0[:,np.newaxis],
+                                usl_sigma[:,np.newaxis], usl_kappa[:,np.newaxis])
+        predicted[(sizes[np.newaxis,:] < n0[:,np.newaxis]) | ~fitted[:,np.newaxis]] = -np.inf
+
+        peak = np.argmax(predicted, axis=1)
+        s_peak = predicted[rows, peak]
+        best = np.argmax(predicted >= (1 - tolerance)*s_peak[:,np.newaxis], axis=1)
+
+    return {'n0': n0, 'speedup': speedup, 'efficiency': efficiency,
+            'amdahl_sigma': amdahl_sigma, 'usl_sigma': usl_sigma, 'usl_kappa': usl_kappa, 'r2': r2,
+            'n_peak': sizes[peak], 's_peak': s_peak, 'n_best': sizes[best], 's_best': predicted[rows, best]}
+
+
+def usl_speedup(p, sigma, kappa):
+    """Gets the USL's speedup at relative cluster size(s) p (also Amdahl's if kappa is 0)."""
+    return p/(1 + sigma*(p - 1) + kappa*p*(p - 1))
+
+
+###############
+# Load data
+###############
+data = load_data(MODE_TIME, False, args.data_dir)
+(stats_dict, premizan_dict, algs) = build_stats(data, MODE_TIME, False)
+
+# experiments are indexed by [alg, graph, system], as in the stats matrices
+times = stats_dict[stat + '_avg'].reshape(-1, len(MACHINES))
+experiments = list(itertools.product(enumerate(ALGS), enumerate(GRAPHS), enumerate(ALL_SYS)))
+
+fit = fit_scaling(times, MACHINE_COUNTS, max_machines, tolerance)
+
+selected = [i for i,((ai,alg), (gi,graph), (si,(system,sysmode))) in enumerate(experiments)
+            if (args.alg is None or alg == args.alg) and (args.graph is None or graph == args.graph)
+            and not np.isnan(fit['usl_sigma'][i])]
+
+
+###############
+# Output data
+###############
+def format_values(vals):
+    """Formats one value per cluster size, with - for failed runs."""
+    return ' '.join('    -' if np.isnan(v) else '%5.2f' % v for v in vals)
+
+header = (" %-32s | %-23s | %-23s | %-6s | %-6s | %-7s | %-5s | %-13s | %s"
+          % ('Experiment', 'Speedup', 'Efficiency', 'Amdahl', 'USL', 'USL', 'USL', 'Peak', 'Best'))
+subheader = (" %-32s | %-23s | %-23s | %-6s | %-6s | %-7s | %-5s | %-13s | %s"
+             % ('', ' '.join('%5s' % m for m in MACHINES), ' '.join('%5s' % m for m in MACHINES),
+                'sigma', 'sigma', 'kappa', 'R^2', '    N Speedup', '    N Speedup'))
+separator = "=" * len(header)
+
+print("")
+print("Scalability of %s time (speedup relative to the smallest successful cluster)" % ('computation' if stat == 'run' else 'total'))
+print(separator)
+print(header)
+print(subheader)
+print(separator)
+
+for i in selected:
+    ((ai,alg), (gi,graph), (si,(system,sysmode))) = experiments[i]
+    print(" %-32s | %s | %s | %6.3f | %6.3f | %7.5f | %5.2f | %5i%s %6.2f | %5i %6.2f"
+          % (system + '_' + sysmode + '_' + alg + '_' + graph,
+             format_values(fit['speedup'][i]), format_values(fit['efficiency'][i]),
+             fit['amdahl_sigma'][i], fit['usl_sigma'][i], fit['usl_kappa'][i], fit['r2'][i],
+             fit['n_peak'][i], '+' if fit['n_peak'][i] == max_machines else ' ', fit['s_peak'][i],
+             fit['n_best'][i], fit['s_best'][i]))
+
+print("")
+print("Peak is the cluster size with the highest predicted (USL) speedup, + if limited by --max-machines=%i." % max_machines)
+print("Best is the smallest cluster size within %.0f%% of the peak speedup." % (tolerance*100))
+print("Sigma is at most 1 (fully serial); retrograde speedups beyond that are fit by the USL's kappa.")
+print("")
+
+
+###############
+# Plot data
+###############
+def plot_scaling(plt, alg, graph, rows, fignum=None):
+    """Plots the speedups and fitted USL of one alg and graph's systems on log-log axes.
+
+    Arguments:
+    plt -- matplotlib.pyplot being used
+    alg -- algorithm (str)
+    graph -- graph (str)
+    rows -- experiment indices of the systems to plot (list)
+    fignum -- figure number to draw on, reusing it if it exists (int)
+
+    Returns:
+    Figure object (matplotlib.figure).
+    """
+
+    fig = new_figure(plt, fignum, (7,6))
+    ax = plt.subplot()
+
+    n_max = max(MACHINE_COUNTS[-1], np.max(fit['n_peak'][rows]))
+    n = np.logspace(np.log2(MACHINE_COUNTS[0]), np.log2(n_max), 100, base=2)
+
+    for i in rows:
+        si = experiments[i][2][0]
+        n0 = fit['n0'][i]
+        curve = n >= n0
+
+        ax.plot(MACHINE_COUNTS, fit['speedup'][i], MARKERS[si], color=COLORS[si], markeredgecolor='k',
+                label=LEGEND_LABELS[si])
+        ax.plot(n[curve], usl_speedup(n[curve]/n0, fit['usl_sigma'][i], fit['usl_kappa'][i]),
+                '-', color=COLORS[si])
+
+    # linear speedup from each experiment's baseline (speedups are relative to it)
+    for k, n0 in enumerate(sorted(set(fit['n0'][rows]))):
+        ax.plot(n[n >= n0], n[n >= n0]/n0, 'k:', label='Linear' if k == 0 else '_nolegend_')
+
+    ax.set_xscale('log', basex=2)
+    ax.set_yscale('log', basey=2)
+    ax.set_xticks(MACHINE_COUNTS)
+    ax.set_xticklabels(MACHINES)
+    ax.set_xlabel('Machines')
+    ax.set_ylabel('Speedup (' + ('computation' if stat == 'run' else 'total') + ' time)')
+    ax.grid(True, which='major')
+    ax.legend(loc='upper left', fontsize=9, numpoints=1)
+
+    if not save_file:
+        ax.set_title(alg + ' ' + graph)
+
+    plt.tight_layout()
+    return fig
+
+
+if do_plot:
+    # each alg & graph is a separate figure
+    pages = []
+    for (ai,alg), (gi,graph) in itertools.product(enumerate(ALGS), enumerate(GRAPHS)):
+        rows = [i for i in selected if experiments[i][0][0] == ai and experiments[i][1][0] == gi]
+        if len(rows) > 0:
+            pages.append((alg + '_' + graph + '_scaling_' + stat, alg, graph, rows))
+
+    if save_file:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        for (save_name, alg, graph, rows) in pages:
+            fig = plot_scaling(plt, alg, graph, rows)
+            save_name = args.figs_dir + '/' + save_name
+
+            if save_eps:
+                plt.savefig(save_name + '.eps', format='eps', bbox_inches='tight', pad_inches=0.05)
+            if save_png:
+                plt.savefig(save_name + '.png', format='png', dpi=200, bbox_inches='tight', pad_inches=0.05)
+            plt.close(fig)
+
+    elif len(pages) > 0:
+        import matplotlib.pyplot as plt
+
+        # (figures are only rendered when viewed, see view_figures())
+        opts = argparse.Namespace(save_png=False, save_eps=False, save_paper=False)
+        view_figures(opts, [(save_name, functools.partial(plot_scaling, plt, alg, graph, rows))
+                            for (save_name, alg, graph, rows) in pages])